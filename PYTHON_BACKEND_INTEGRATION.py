@@ -1,25 +1,61 @@
 # 🤖 Python Backend Integration for AI Interview Agent
-# Install required packages: pip install fastapi uvicorn livekit livekit-agents
+# Install required packages: pip install -r requirements.txt
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 import asyncio
+import base64
+import bisect
+import contextlib
+import hashlib
+import hmac
+import itertools
 import json
+import math
+import mmap
+import multiprocessing
+import os
+import random
+import re
+import struct
+import threading
 import time
-from typing import Dict, Any
-from pydantic import BaseModel
-from livekit import rtc, agents
-from livekit.agents import AutoSubscribe
+import weakref
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Callable, Dict, Any, List, NamedTuple, Optional
+from pydantic import BaseModel, Field
+import httpx
+import numpy as np
+
+# livekit is imported on first use (see livekit_rtc) so the HTTP app boots and
+# answers /health without paying for it
+_rtc = None
+
+
+def livekit_rtc():
+    """Return the livekit.rtc module, importing it on first call"""
+    global _rtc
+    if _rtc is None:
+        from livekit import rtc
+        _rtc = rtc
+    return _rtc
 
 # Request Models
 class InterviewRequest(BaseModel):
     roomName: str
-    agentToken: str
     candidateId: str
     jobId: str
-    livekitUrl: str
-    livekitApiKey: str
-    livekitApiSecret: str
+    # Optional: the backend mints agent tokens from LIVEKIT_* config when omitted
+    agentToken: str = ""
+    livekitUrl: str = ""
+    # Deprecated and ignored - keep API secrets server-side
+    livekitApiKey: str = Field("", json_schema_extra={"deprecated": True})
+    livekitApiSecret: str = Field("", json_schema_extra={"deprecated": True})
 
 class AgentJoinRequest(BaseModel):
     # Room & Session Info
@@ -34,211 +70,3731 @@ class AgentJoinRequest(BaseModel):
     candidateExperience: str = ""
     candidateProjects: str = ""
     
-    # Job Details
-    jobId: str
-    jobTitle: str = ""
-    jobDepartment: str = ""
-    jobDescription: str = ""
-    employmentType: str = ""
-    experienceLevel: str = ""
-    location: str = ""
-    salaryMin: int = None
-    salaryMax: int = None
-    currency: str = "USD"
-    isRemote: bool = False
+    # Job Details
+    jobId: str
+    jobTitle: str = ""
+    jobDepartment: str = ""
+    jobDescription: str = ""
+    employmentType: str = ""
+    experienceLevel: str = ""
+    location: str = ""
+    salaryMin: int = None
+    salaryMax: int = None
+    currency: str = "USD"
+    isRemote: bool = False
+    
+    # Interview Settings
+    interviewMode: str = "video"
+    interviewLanguage: str = "en"
+    interviewDuration: int = 30
+    questionsCount: int = 5
+    difficultyLevel: str = "medium"
+    interviewDate: str = None
+    interviewTime: str = None
+    wireFormat: str = "json"  # "binary" for frontends that decode compact frames
+    
+    # Agent/Prompt Template Details
+    agentId: str = None
+    agentPrompt: dict = {}
+    promptTemplateName: str = ""
+    promptTemplateDescription: str = ""
+    promptTemplateCategory: str = "technical"
+    promptTemplateLevel: str = "mid"
+    promptTemplateDuration: int = 45
+    promptTemplateVersion: str = ""
+    promptText: dict = {}
+
+# FastAPI App
+@contextlib.asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Run the startup and shutdown steps in order.
+
+    Each step is defined next to the component it starts or stops.
+    """
+    await start_event_loop_monitor()
+    # Recovered sessions may be placed on pool workers, so those start first
+    await start_worker_pool()
+    await recover_sessions()
+    await prewarm_tts_cache()
+    await prewarm_agent_shells()
+    try:
+        yield
+    finally:
+        # Agents stop first so their last events reach the writer and journal
+        await stop_agents()
+        await stop_worker_pool()
+        await close_result_writer()
+        await close_session_journal()
+
+
+app = FastAPI(title="AI Interview Agent Backend", lifespan=lifespan)
+
+# CORS middleware for frontend communication
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["http://localhost:3000"],  # Your frontend URL
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+# Metrics
+# Histograms and gauges kept in-process and rendered in the Prometheus text
+# format on /metrics. Worker processes keep their own and are merged at scrape.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+EVENT_LOOP_LAG_INTERVAL = float(os.getenv("EVENT_LOOP_LAG_INTERVAL", "0.5"))
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        # One slot per bucket plus the +Inf overflow
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class PhaseTimer:
+    """Context manager that records its elapsed time into a histogram"""
+    __slots__ = ("histogram", "started")
+
+    def __init__(self, histogram: Histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.started)
+        return False
+
+
+class Metrics:
+    """Labelled latency histograms and gauges for one process"""
+
+    def __init__(self):
+        self.histograms: Dict[str, Dict[tuple, Histogram]] = {}
+        self.gauges: Dict[str, Dict[tuple, Any]] = {}
+        self.help: Dict[str, str] = {}
+
+    def describe(self, name: str, help_text: str):
+        self.help[name] = help_text
+
+    def histogram(self, name: str, **labels) -> Histogram:
+        series = self.histograms.setdefault(name, {})
+        key = tuple(sorted(labels.items()))
+        histogram = series.get(key)
+        if histogram is None:
+            histogram = series[key] = Histogram()
+        return histogram
+
+    def timer(self, name: str, **labels) -> PhaseTimer:
+        return PhaseTimer(self.histogram(name, **labels))
+
+    def set_gauge(self, name: str, value, **labels):
+        """Set a gauge to a number, or to a zero-argument callable read at scrape time"""
+        self.gauges.setdefault(name, {})[tuple(sorted(labels.items()))] = value
+
+    def snapshot(self) -> dict:
+        """Picklable histogram state, for merging worker metrics"""
+        return {
+            name: [(key, h.counts, h.sum, h.count) for key, h in series.items()]
+            for name, series in self.histograms.items()
+        }
+
+    def render(self, extra_snapshots: List[dict] = ()) -> str:
+        merged: Dict[str, Dict[tuple, Histogram]] = {}
+        for snapshot in [self.snapshot(), *extra_snapshots]:
+            for name, series in snapshot.items():
+                for key, counts, total, count in series:
+                    h = merged.setdefault(name, {}).setdefault(tuple(tuple(kv) for kv in key), Histogram())
+                    h.counts = [a + b for a, b in zip(h.counts, counts)]
+                    h.sum += total
+                    h.count += count
+
+        lines = []
+        for name, series in sorted(merged.items()):
+            lines.append(f"# HELP {name} {self.help.get(name, name)}")
+            lines.append(f"# TYPE {name} histogram")
+            for key, h in sorted(series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip([*h.buckets, "+Inf"], h.counts):
+                    cumulative += bucket_count
+                    lines.append(f"{name}_bucket{_render_labels(key, le=bound)} {cumulative}")
+                lines.append(f"{name}_sum{_render_labels(key)} {h.sum}")
+                lines.append(f"{name}_count{_render_labels(key)} {h.count}")
+        for name, series in sorted(self.gauges.items()):
+            lines.append(f"# HELP {name} {self.help.get(name, name)}")
+            lines.append(f"# TYPE {name} gauge")
+            for key, value in sorted(series.items()):
+                lines.append(f"{name}{_render_labels(key)} {value() if callable(value) else value}")
+        return "\n".join(lines) + "\n"
+
+
+def _render_labels(key: tuple, **extra) -> str:
+    pairs = [*key, *extra.items()]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+
+metrics = Metrics()
+metrics.describe("agent_phase_seconds", "Time spent in each AIInterviewAgent phase")
+metrics.describe("http_request_seconds", "HTTP endpoint latency")
+metrics.describe("event_loop_lag_observed_seconds", "How late a periodic timer fired on the event loop")
+metrics.describe("event_loop_lag_seconds", "Most recent event-loop lag sample")
+metrics.describe("interview_sessions_live", "Interview sessions with a running agent")
+metrics.describe("interview_sessions_finished", "Finished sessions still held by the registry")
+metrics.describe("interview_joins_pending", "Join/start requests accepted but not yet launched")
+
+# Requests inside /agent/join or /start-interview that have not launched an agent yet
+pending_joins = 0
+
+
+class RequestTimingMiddleware:
+    """Plain ASGI middleware timing each HTTP request by route template"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            # Route template keeps label cardinality bounded (no candidate ids)
+            route = scope.get("route")
+            path = route.path if route is not None else "unmatched"
+            metrics.histogram("http_request_seconds", method=scope["method"], route=path).observe(time.perf_counter() - started)
+
+
+app.add_middleware(RequestTimingMiddleware)
+
+
+async def monitor_event_loop_lag(interval: float = EVENT_LOOP_LAG_INTERVAL):
+    loop = asyncio.get_running_loop()
+    histogram = metrics.histogram("event_loop_lag_observed_seconds")
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - expected)
+        histogram.observe(lag)
+        metrics.set_gauge("event_loop_lag_seconds", lag)
+
+
+async def start_event_loop_monitor():
+    asyncio.create_task(monitor_event_loop_lag())
+
+# LiveKit agent tokens
+# Agents get their access tokens from server-side config instead of the request.
+# Signed tokens are cached per (room, identity, grants) and re-minted once they
+# are within AGENT_TOKEN_REFRESH_MARGIN seconds of expiry.
+LIVEKIT_URL = os.getenv("LIVEKIT_URL", "")
+LIVEKIT_API_KEY = os.getenv("LIVEKIT_API_KEY", "")
+LIVEKIT_API_SECRET = os.getenv("LIVEKIT_API_SECRET", "")
+AGENT_IDENTITY = os.getenv("AGENT_IDENTITY", "ai-interviewer")
+AGENT_TOKEN_TTL = int(os.getenv("AGENT_TOKEN_TTL", "7200"))
+AGENT_TOKEN_REFRESH_MARGIN = int(os.getenv("AGENT_TOKEN_REFRESH_MARGIN", "600"))
+
+AGENT_GRANTS = (("canPublish", True), ("canPublishData", True), ("canSubscribe", True), ("roomJoin", True))
+
+
+def _b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+class AgentTokenMinter:
+    """Mints and caches HS256 LiveKit access tokens"""
+
+    # The JWT header never changes
+    _HEADER = _b64url(b'{"alg":"HS256","typ":"JWT"}')
+
+    def __init__(self, api_key: str = LIVEKIT_API_KEY, api_secret: str = LIVEKIT_API_SECRET,
+                 ttl: int = AGENT_TOKEN_TTL, refresh_margin: int = AGENT_TOKEN_REFRESH_MARGIN, max_entries: int = 4096):
+        self.api_key = api_key
+        self._secret = api_secret.encode()
+        self.ttl = ttl
+        self.refresh_margin = min(refresh_margin, ttl // 2)
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self.minted = 0
+        self.hits = 0
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.api_key and self._secret)
+
+    def token_for(self, room_name: str, identity: str = AGENT_IDENTITY, grants: tuple = AGENT_GRANTS) -> str:
+        key = (room_name, identity, grants)
+        now = time.time()
+        cached = self._cache.get(key)
+        if cached is not None and cached[1] - now > self.refresh_margin:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return cached[0]
+
+        expires_at = int(now) + self.ttl
+        token = self._mint(room_name, identity, grants, int(now), expires_at)
+        self._cache[key] = (token, expires_at)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        self.minted += 1
+        return token
+
+    def _mint(self, room_name: str, identity: str, grants: tuple, issued_at: int, expires_at: int) -> str:
+        claims = {
+            "iss": self.api_key,
+            "sub": identity,
+            "jti": identity,
+            "name": identity,
+            "nbf": issued_at,
+            "exp": expires_at,
+            "video": {"room": room_name, **dict(grants)}
+        }
+        signing_input = f"{self._HEADER}.{_b64url(json.dumps(claims, separators=(',', ':')).encode())}"
+        signature = hmac.new(self._secret, signing_input.encode(), hashlib.sha256).digest()
+        return f"{signing_input}.{_b64url(signature)}"
+
+
+livekit_tokens = AgentTokenMinter()
+
+
+# Session registry
+class SessionEntry:
+    """One tracked interview session and the agent serving it"""
+    __slots__ = ("key", "agent", "candidate_id", "session_id", "room_name",
+                 "job_id", "status", "created_at", "finished_at", "last_access",
+                 "worker_id", "snapshot")
+
+    def __init__(self, key: str, agent, candidate_id: str, session_id: Optional[str], room_name: str, job_id: str = ""):
+        now = time.monotonic()
+        self.key = key
+        self.agent = agent
+        self.candidate_id = candidate_id
+        self.session_id = session_id
+        self.room_name = room_name
+        self.job_id = job_id
+        self.status = "active"
+        self.created_at = now
+        self.finished_at = None
+        self.last_access = now
+        # Set when the agent runs in a pool worker process instead of in-process
+        self.worker_id = None
+        # Last status of a finished session, kept instead of its agent
+        self.snapshot = None
+
+    @property
+    def is_finished(self) -> bool:
+        return self.finished_at is not None
+
+
+class SessionRegistry:
+    """Interview sessions indexed by candidateId, sessionId and roomName.
+
+    Every lookup is a dict hit. Finished sessions stay queryable for
+    ``finished_ttl`` seconds after their last access and at most
+    ``max_finished`` of them are kept; the least recently used go first.
+    A finished entry keeps only its agent's final status snapshot, not the
+    agent. Live sessions are never evicted.
+    """
+
+    def __init__(self, finished_ttl: float = 900.0, max_finished: int = 1000):
+        self.finished_ttl = finished_ttl
+        self.max_finished = max_finished
+        self._sessions: Dict[str, SessionEntry] = {}
+        self._by_candidate: Dict[str, str] = {}
+        self._by_session: Dict[str, str] = {}
+        self._by_room: Dict[str, str] = {}
+        self._by_job: Dict[str, set] = {}
+        # Finished session keys in least-recently-used order
+        self._finished: "OrderedDict[str, None]" = OrderedDict()
+        self._active_count = 0
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    @property
+    def active_count(self) -> int:
+        return self._active_count
+
+    @property
+    def finished_count(self) -> int:
+        return len(self._finished)
+
+    @staticmethod
+    def session_key(session_id: Optional[str], room_name: str) -> str:
+        return session_id or f"session_{room_name}"
+
+    def register(self, agent, candidate_id: str, room_name: str, session_id: Optional[str] = None, job_id: str = "") -> SessionEntry:
+        """Track a new session, replacing any previous one with the same key"""
+        self.evict_expired()
+        key = self.session_key(session_id, room_name)
+        if key in self._sessions:
+            self._drop(key)
+
+        entry = SessionEntry(key, agent, candidate_id, session_id, room_name, job_id)
+        self._sessions[key] = entry
+        self._by_candidate[candidate_id] = key
+        self._by_room[room_name] = key
+        if session_id:
+            self._by_session[session_id] = key
+        if job_id:
+            self._by_job.setdefault(job_id, set()).add(key)
+        self._active_count += 1
+        return entry
+
+    def mark_finished(self, key: str, status: str = "completed", snapshot: Optional[dict] = None):
+        """Move a session to the finished set so it becomes evictable.
+
+        ``snapshot`` is the final status of a worker-hosted session; for an
+        in-process one it is taken from the agent, which is then let go.
+        """
+        entry = self._sessions.get(key)
+        if entry is None or entry.is_finished:
+            return
+        if entry.agent is not None:
+            snapshot = entry.agent.status_snapshot()
+            entry.agent = None
+        entry.snapshot = snapshot
+        entry.status = status
+        entry.finished_at = entry.last_access = time.monotonic()
+        self._finished[key] = None
+        self._active_count -= 1
+        self.evict_expired()
+
+    def remove(self, key: str) -> Optional[SessionEntry]:
+        if key not in self._sessions:
+            return None
+        return self._drop(key)
+
+    def get(self, key: str) -> Optional[SessionEntry]:
+        return self._sessions.get(key)
+
+    def get_by_candidate(self, candidate_id: str) -> Optional[SessionEntry]:
+        return self._get(self._by_candidate.get(candidate_id))
+
+    def get_by_session(self, session_id: str) -> Optional[SessionEntry]:
+        return self._get(self._by_session.get(session_id))
+
+    def get_by_room(self, room_name: str) -> Optional[SessionEntry]:
+        return self._get(self._by_room.get(room_name))
+
+    def lookup(self, identifier: str) -> Optional[SessionEntry]:
+        """Resolve a candidateId, sessionId or roomName to its session"""
+        return (self.get_by_candidate(identifier)
+                or self.get_by_session(identifier)
+                or self.get_by_room(identifier))
+
+    def entries(self):
+        return list(self._sessions.values())
+
+    def by_job(self, job_id: str) -> List[SessionEntry]:
+        """Every tracked session (live or finished) for a jobId"""
+        return [self._sessions[key] for key in self._by_job.get(job_id, ())]
+
+    def evict_expired(self) -> int:
+        """Drop finished sessions past their TTL or over the size cap"""
+        evicted = 0
+        cutoff = time.monotonic() - self.finished_ttl
+        while self._finished:
+            key = next(iter(self._finished))
+            entry = self._sessions[key]
+            if entry.last_access > cutoff and len(self._finished) <= self.max_finished:
+                break
+            self._drop(key)
+            evicted += 1
+        return evicted
+
+    def _get(self, key: Optional[str]) -> Optional[SessionEntry]:
+        if key is None:
+            return None
+        entry = self._sessions.get(key)
+        if entry is not None and entry.is_finished:
+            entry.last_access = time.monotonic()
+            self._finished.move_to_end(key)
+        return entry
+
+    def _drop(self, key: str) -> SessionEntry:
+        entry = self._sessions.pop(key)
+        if entry.is_finished:
+            self._finished.pop(key, None)
+        else:
+            self._active_count -= 1
+        # Only clear index slots that still point at this session
+        if self._by_candidate.get(entry.candidate_id) == key:
+            del self._by_candidate[entry.candidate_id]
+        if self._by_room.get(entry.room_name) == key:
+            del self._by_room[entry.room_name]
+        if entry.session_id and self._by_session.get(entry.session_id) == key:
+            del self._by_session[entry.session_id]
+        job_keys = self._by_job.get(entry.job_id)
+        if job_keys is not None:
+            job_keys.discard(key)
+            if not job_keys:
+                del self._by_job[entry.job_id]
+        return entry
+
+
+# Global registry of interview sessions
+active_interviews = SessionRegistry()
+metrics.set_gauge("interview_sessions_live", lambda: active_interviews.active_count)
+metrics.set_gauge("interview_sessions_finished", lambda: active_interviews.finished_count)
+metrics.set_gauge("interview_joins_pending", lambda: pending_joins)
+
+
+def task_exit_status(task: asyncio.Task) -> str:
+    if task.cancelled():
+        return "cancelled"
+    if task.exception() is not None:
+        return "failed"
+    # Supervised tasks return their exit status
+    return task.result() or "completed"
+
+
+def track_agent_task(entry: SessionEntry, task: asyncio.Task):
+    """Mark the session finished once its agent task exits"""
+    def _on_done(t: asyncio.Task):
+        status = task_exit_status(t)
+        active_interviews.mark_finished(entry.key, status)
+        status_feed.publish(entry.key, {"status": status})
+        admission.wake()
+        # Cancelled agents (process shutdown) stay in the journal for recovery
+        if session_journal is not None and status != "cancelled":
+            session_journal.record({"event": "finished", "key": entry.key, "status": status})
+    task.add_done_callback(_on_done)
+
+
+# Status push
+# Agents publish only the status fields that changed. Changes are merged per
+# session and fanned out once per STATUS_PUSH_INTERVAL tick, so push cost is
+# bounded by the number of sessions that changed rather than by how often.
+# Worker processes coalesce the same way and forward each tick's batch.
+STATUS_PUSH_INTERVAL = float(os.getenv("STATUS_PUSH_INTERVAL", "0.25"))
+STATUS_STREAM_KEEPALIVE = 15.0
+
+
+class StatusSubscriber:
+    """One push client: its filter and the changes it has not been sent yet"""
+
+    def __init__(self, ids: Optional[set] = None, job_id: str = ""):
+        self.ids = ids or set()
+        self.job_id = job_id
+        self.pending: Dict[str, dict] = {}
+        self.ready = asyncio.Event()
+
+    def wants(self, entry: Optional[SessionEntry], key: str, fields: Optional[dict] = None) -> bool:
+        if not self.ids and not self.job_id:
+            return True
+        if entry is None:
+            # Session already removed; its final change carries the ids
+            fields = fields or {}
+            return ((bool(self.job_id) and fields.get("jobId") == self.job_id)
+                    or bool(self.ids & {key, fields.get("candidateId")}))
+        if self.job_id and entry.job_id == self.job_id:
+            return True
+        return bool(self.ids & {key, entry.candidate_id, entry.session_id, entry.room_name})
+
+    def take(self) -> Dict[str, dict]:
+        changes, self.pending = self.pending, {}
+        self.ready.clear()
+        return changes
+
+
+class StatusFeed:
+    """Coalesces per-session status changes and delivers them once per tick.
+
+    A subscriber that reads slowly just accumulates merged changes, so it
+    holds at most one pending entry per session.
+    """
+
+    def __init__(self, interval: float = STATUS_PUSH_INTERVAL):
+        self.interval = interval
+        self.subscribers: List[StatusSubscriber] = []
+        self.forward: Optional[Callable[[Dict[str, dict]], None]] = None
+        self._pending: Dict[str, dict] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def publish(self, key: str, fields: dict):
+        if self.forward is None and not self.subscribers:
+            return
+        self._pending.setdefault(key, {}).update(fields)
+        if self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.interval, self.flush)
+
+    def publish_many(self, changes: Dict[str, dict]):
+        for key, fields in changes.items():
+            self.publish(key, fields)
+
+    def flush(self):
+        self._timer = None
+        changes, self._pending = self._pending, {}
+        if not changes:
+            return
+        if self.forward is not None:
+            self.forward(changes)
+            return
+        for key, fields in changes.items():
+            entry = active_interviews.get(key)
+            for subscriber in self.subscribers:
+                if subscriber.wants(entry, key, fields):
+                    subscriber.pending.setdefault(key, {}).update(fields)
+                    subscriber.ready.set()
+
+    def subscribe(self, subscriber: StatusSubscriber):
+        self.subscribers.append(subscriber)
+
+    def unsubscribe(self, subscriber: StatusSubscriber):
+        if subscriber in self.subscribers:
+            self.subscribers.remove(subscriber)
+
+
+status_feed = StatusFeed()
+
+
+# Session journal
+# Append-only log of session events plus a compact snapshot of live sessions.
+# Each record is: length (I) | crc32 (I) | JSON body with a sequence number.
+# After JOURNAL_COMPACT_RECORDS appends the live state is snapshotted and the
+# log truncated, so boot replays at most one snapshot and a bounded tail.
+SESSION_JOURNAL_DIR = os.getenv("SESSION_JOURNAL_DIR", "")
+JOURNAL_COMPACT_RECORDS = int(os.getenv("JOURNAL_COMPACT_RECORDS", "5000"))
+JOURNAL_RECORD = struct.Struct("!II")
+
+
+class SessionJournal:
+    """Crash-recovery journal for the sessions owned by one process"""
+
+    def __init__(self, directory: str, compact_every: int = JOURNAL_COMPACT_RECORDS):
+        self.directory = directory
+        self.compact_every = compact_every
+        self.log_path = os.path.join(directory, "journal.log")
+        self.snapshot_path = os.path.join(directory, "snapshot.bin")
+        # key -> state of every session that has not finished
+        self.live: Dict[str, dict] = {}
+        self._seq = 0
+        self._since_snapshot = 0
+        self._file = None
+
+    def open(self) -> Dict[str, dict]:
+        """Rebuild live sessions from disk and start a fresh log"""
+        os.makedirs(self.directory, exist_ok=True)
+        snapshot = next(self._read_records(self.snapshot_path), None)
+        if snapshot is not None:
+            self._seq = snapshot["seq"]
+            self.live = snapshot["live"]
+        for event in self._read_records(self.log_path):
+            # Records already folded into the snapshot are skipped
+            if event["seq"] > self._seq:
+                self._seq = event["seq"]
+                self._apply(event)
+        self.compact()
+        return dict(self.live)
+
+    def record(self, event: dict):
+        self._seq += 1
+        event["seq"] = self._seq
+        self._apply(event)
+        self._file.write(self._frame(event))
+        self._file.flush()
+        self._since_snapshot += 1
+        if self._since_snapshot >= self.compact_every:
+            self.compact()
+
+    def compact(self):
+        """Snapshot live sessions and truncate the log"""
+        tmp_path = f"{self.snapshot_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(self._frame({"seq": self._seq, "live": self.live}))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        if self._file is not None:
+            self._file.close()
+        self._file = open(self.log_path, "wb")
+        self._since_snapshot = 0
+
+    def close(self):
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            self._file = None
+
+    def _apply(self, event: dict):
+        kind = event["event"]
+        key = event["key"]
+        if kind == "start":
+            self.live[key] = {
+                "candidate_id": event["candidate_id"],
+                "room_name": event["room_name"],
+                "session_id": event["session_id"],
+                "job_id": event["job_id"],
+                "agent_kwargs": event["agent_kwargs"],
+                "responses": [],
+                # Plan indexes in the order asked; the scheduler may reorder them
+                "asked": [],
+                "in_flight": None
+            }
+        elif kind == "finished":
+            self.live.pop(key, None)
+        elif key in self.live:
+            state = self.live[key]
+            if kind == "question":
+                state.setdefault("asked", []).append(event["index"])
+                state["in_flight"] = event["index"]
+            elif kind == "response":
+                state["responses"].append(event["record"])
+                if state.get("in_flight") == event["index"]:
+                    state["in_flight"] = None
+
+    @staticmethod
+    def _frame(body: dict) -> bytes:
+        data = json.dumps(body, separators=(",", ":")).encode()
+        return JOURNAL_RECORD.pack(len(data), zlib.crc32(data)) + data
+
+    @staticmethod
+    def _read_records(path: str):
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return
+        offset = 0
+        while offset + JOURNAL_RECORD.size <= len(data):
+            length, crc = JOURNAL_RECORD.unpack_from(data, offset)
+            body = data[offset + JOURNAL_RECORD.size:offset + JOURNAL_RECORD.size + length]
+            # A torn or corrupt tail ends the replay
+            if len(body) < length or zlib.crc32(body) != crc:
+                return
+            yield json.loads(body)
+            offset += JOURNAL_RECORD.size + length
+
+
+def journal_start_event(key: str, agent_kwargs: dict, candidate_id: str, room_name: str, session_id: Optional[str], job_id: str) -> dict:
+    # Tokens are credentials and expire; a recovered agent mints a fresh one (connect_token)
+    agent_kwargs = {**agent_kwargs, "agent_token": ""} if agent_kwargs.get("agent_token") else agent_kwargs
+    return {
+        "event": "start",
+        "key": key,
+        "candidate_id": candidate_id,
+        "room_name": room_name,
+        "session_id": session_id,
+        "job_id": job_id,
+        "agent_kwargs": agent_kwargs
+    }
+
+
+# Session recording
+# With SESSION_RECORD_DIR set, every session's event stream is appended to
+# <dir>/<session key>.jsonl: the join payload, agent data messages (sent),
+# candidate data messages (received), participant and track events and phase
+# timings, each stamped with seconds since the join. replay-sessions.py feeds
+# these back through AIInterviewAgent against fake rooms. Audio frames are not
+# recorded, so replays drive the data channel only.
+SESSION_RECORD_DIR = os.getenv("SESSION_RECORD_DIR", "")
+RECORD_FLUSH_EVENTS = 64
+
+
+class SessionRecording:
+    """Timestamped event stream of one session.
+
+    Events are buffered and appended to ``path`` in batches; with no path
+    they are kept in ``events`` instead (used by replays).
+    """
+    __slots__ = ("path", "started", "events", "_pending")
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.started = time.monotonic()
+        self.events: List[dict] = []
+        self._pending: List[str] = []
+
+    def record(self, event: str, **fields):
+        entry = {"t": round(time.monotonic() - self.started, 4), "event": event, **fields}
+        if self.path is None:
+            self.events.append(entry)
+            return
+        self._pending.append(json.dumps(entry, separators=(",", ":"), default=str))
+        if len(self._pending) >= RECORD_FLUSH_EVENTS:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("\n".join(self._pending) + "\n")
+        except OSError as e:
+            print(f"⚠️ Could not write session recording {self.path}: {str(e)}")
+        self._pending.clear()
+
+
+class RecordedPhase:
+    """Phase timer that also adds the phase duration to a session recording"""
+    __slots__ = ("timer", "recording", "phase")
+
+    def __init__(self, timer: PhaseTimer, recording: SessionRecording, phase: str):
+        self.timer = timer
+        self.recording = recording
+        self.phase = phase
+
+    def __enter__(self):
+        self.timer.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        self.timer.__exit__(*exc)
+        self.recording.record("phase", phase=self.phase, seconds=round(time.perf_counter() - self.timer.started, 6))
+        return False
+
+
+def recorded_packet(data: bytes) -> dict:
+    """Data packet as recording fields: JSON text when possible, else base64"""
+    try:
+        return {"text": bytes(data).decode()}
+    except UnicodeDecodeError:
+        return {"b64": base64.b64encode(bytes(data)).decode()}
+
+
+def open_recording(key: str, agent_kwargs: dict, resumed: bool = False) -> Optional[SessionRecording]:
+    """Start recording a session (None unless SESSION_RECORD_DIR is set)"""
+    if not SESSION_RECORD_DIR:
+        return None
+    os.makedirs(SESSION_RECORD_DIR, exist_ok=True)
+    filename = re.sub(r"[^A-Za-z0-9_.-]", "_", key) + ".jsonl"
+    recording = SessionRecording(os.path.join(SESSION_RECORD_DIR, filename))
+    # Tokens are credentials; everything else is needed to rebuild the agent
+    join = {k: v for k, v in agent_kwargs.items() if k != "agent_token"}
+    recording.record("join", key=key, resumed=resumed, agent_kwargs=join)
+    return recording
+
+
+# Agent worker pool
+# AGENT_WORKERS=0 (default) runs every agent inside the API process.
+AGENT_WORKERS = int(os.getenv("AGENT_WORKERS", "0"))
+AGENT_WORKER_CAPACITY = int(os.getenv("AGENT_WORKER_CAPACITY", "50"))
+AGENT_WORKER_RPC_TIMEOUT = float(os.getenv("AGENT_WORKER_RPC_TIMEOUT", "5"))
+# How often the pool checks that its worker processes are still running
+AGENT_WORKER_WATCH_INTERVAL = float(os.getenv("AGENT_WORKER_WATCH_INTERVAL", "1"))
+
+
+class WorkerPoolFullError(Exception):
+    """Every worker is at capacity"""
+
+
+class AgentWorker:
+    """Front-end bookkeeping for one worker process"""
+    __slots__ = ("worker_id", "process", "commands", "sessions", "alive")
+
+    def __init__(self, worker_id: int, process, commands):
+        self.worker_id = worker_id
+        self.process = process
+        self.commands = commands
+        self.sessions = set()
+        self.alive = True
+
+    @property
+    def load(self) -> int:
+        return len(self.sessions)
+
+
+class AgentWorkerPool:
+    """Runs interview agents in N worker processes.
+
+    New sessions go to the least-loaded worker that is under ``capacity``.
+    Status and end requests are forwarded to the worker that owns the
+    session; worker replies and exit notices come back on one shared
+    event queue that a reader thread hands to the event loop. A worker
+    process that dies (crash, OOM kill) has its sessions marked failed and
+    released, and gets no new sessions.
+    """
+
+    def __init__(self, workers: int, capacity: int = AGENT_WORKER_CAPACITY):
+        self.size = workers
+        self.capacity = capacity
+        self._workers = []
+        self._owner: Dict[str, AgentWorker] = {}
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._request_ids = itertools.count(1)
+        self._events = None
+        self._reader = None
+        self._watcher = None
+        self._loop = None
+
+    @property
+    def total_load(self) -> int:
+        return len(self._owner)
+
+    def start(self):
+        ctx = multiprocessing.get_context("spawn")
+        self._loop = asyncio.get_running_loop()
+        self._events = ctx.Queue()
+        for worker_id in range(self.size):
+            commands = ctx.Queue()
+            process = ctx.Process(
+                target=_agent_worker_main,
+                args=(worker_id, commands, self._events),
+                name=f"agent-worker-{worker_id}",
+                daemon=True
+            )
+            process.start()
+            self._workers.append(AgentWorker(worker_id, process, commands))
+        self._reader = threading.Thread(target=self._read_events, name="agent-worker-events", daemon=True)
+        self._reader.start()
+        self._watcher = asyncio.create_task(self._watch())
+        print(f"🧵 Started {self.size} agent workers (capacity {self.capacity} each)")
+
+    async def stop(self):
+        if self._watcher is not None:
+            self._watcher.cancel()
+        for worker in self._workers:
+            worker.commands.put(("stop",))
+        for worker in self._workers:
+            await self._loop.run_in_executor(None, worker.process.join, 10)
+        self._events.put(None)
+        for future in self._pending.values():
+            if not future.done():
+                future.cancel()
+        self._pending.clear()
+        self._owner.clear()
+        self._workers.clear()
+
+    def place(self, key: str, agent_kwargs: dict, session_info: dict) -> int:
+        """Start an agent on the least-loaded worker, returning its worker id"""
+        workers = [w for w in self._workers if w.alive]
+        if not workers:
+            raise WorkerPoolFullError("No agent workers are running")
+        worker = min(workers, key=lambda w: w.load)
+        if worker.load >= self.capacity:
+            raise WorkerPoolFullError(f"All {self.size} agent workers are at capacity")
+        worker.sessions.add(key)
+        self._owner[key] = worker
+        worker.commands.put(("start", key, agent_kwargs, session_info))
+        return worker.worker_id
+
+    async def status(self, key: str) -> Optional[dict]:
+        try:
+            return await self._request("status", key)
+        except asyncio.TimeoutError:
+            return None
+
+    async def status_many(self, keys: List[str]) -> Dict[str, dict]:
+        """Snapshots for many sessions with one request per owning worker"""
+        by_worker: Dict[AgentWorker, List[str]] = {}
+        for key in keys:
+            worker = self._owner.get(key)
+            if worker is not None:
+                by_worker.setdefault(worker, []).append(key)
+        replies = await asyncio.gather(
+            *(self._request_worker(worker, "status_many", worker_keys) for worker, worker_keys in by_worker.items()),
+            return_exceptions=True
+        )
+        snapshots: Dict[str, dict] = {}
+        for reply in replies:
+            if isinstance(reply, dict):
+                snapshots.update(reply)
+        return snapshots
+
+    async def end(self, key: str) -> bool:
+        try:
+            return bool(await self._request("end", key))
+        except asyncio.TimeoutError:
+            return False
+
+    async def collect_metrics(self) -> List[dict]:
+        """Histogram snapshots from every worker that answers in time"""
+        replies = await asyncio.gather(
+            *(self._request_worker(worker, "metrics", None) for worker in self._workers if worker.alive),
+            return_exceptions=True
+        )
+        return [r for r in replies if isinstance(r, dict)]
+
+    async def _request(self, op: str, key: str):
+        worker = self._owner.get(key)
+        if worker is None:
+            return None
+        return await self._request_worker(worker, op, key)
+
+    async def _request_worker(self, worker: AgentWorker, op: str, key):
+        request_id = next(self._request_ids)
+        future = self._loop.create_future()
+        self._pending[request_id] = future
+        worker.commands.put((op, key, request_id))
+        try:
+            return await asyncio.wait_for(future, AGENT_WORKER_RPC_TIMEOUT)
+        finally:
+            self._pending.pop(request_id, None)
+
+    def _release(self, key: str):
+        worker = self._owner.pop(key, None)
+        if worker is not None:
+            worker.sessions.discard(key)
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(AGENT_WORKER_WATCH_INTERVAL)
+            for worker in self._workers:
+                if worker.alive and not worker.process.is_alive():
+                    self._worker_died(worker)
+
+    def _worker_died(self, worker: AgentWorker):
+        worker.alive = False
+        print(f"💥 Agent worker {worker.worker_id} exited (code {worker.process.exitcode}), "
+              f"failing its {worker.load} sessions")
+        for key in list(worker.sessions):
+            self._release(key)
+            active_interviews.mark_finished(key, "failed")
+            status_feed.publish(key, {"status": "failed"})
+        admission.wake()
+
+    def _read_events(self):
+        while True:
+            event = self._events.get()
+            if event is None:
+                break
+            self._loop.call_soon_threadsafe(self._dispatch, event)
+
+    def _dispatch(self, event):
+        kind = event[0]
+        if kind == "reply":
+            _, request_id, payload = event
+            future = self._pending.get(request_id)
+            if future is not None and not future.done():
+                future.set_result(payload)
+        elif kind == "finished":
+            _, key, status, snapshot = event
+            self._release(key)
+            active_interviews.mark_finished(key, status, snapshot)
+            status_feed.publish(key, {"status": status})
+            admission.wake()
+        elif kind == "status":
+            status_feed.publish_many(event[1])
+        elif kind == "score":
+            score_aggregator.apply(event[1])
+        elif kind == "recovered":
+            _, worker_id, key, candidate_id, room_name, session_id, job_id = event
+            worker = self._workers[worker_id]
+            worker.sessions.add(key)
+            self._owner[key] = worker
+            entry = active_interviews.register(None, candidate_id, room_name, session_id, job_id)
+            entry.worker_id = worker_id
+
+
+def _agent_worker_main(worker_id: int, commands, events):
+    """Worker process entry point"""
+    asyncio.run(_agent_worker_loop(worker_id, commands, events))
+
+
+async def _agent_worker_loop(worker_id: int, commands, events):
+    loop = asyncio.get_running_loop()
+    agents: Dict[str, "AIInterviewAgent"] = {}
+    tasks: Dict[str, asyncio.Task] = {}
+    # Each worker journals its own sessions; worker N recovers worker-N on restart
+    journal = SessionJournal(os.path.join(SESSION_JOURNAL_DIR, f"worker-{worker_id}")) if SESSION_JOURNAL_DIR else None
+
+    def _on_done(key: str, task: asyncio.Task):
+        agent = agents.pop(key, None)
+        tasks.pop(key, None)
+        status = task_exit_status(task)
+        if journal is not None and status != "cancelled":
+            journal.record({"event": "finished", "key": key, "status": status})
+        events.put(("finished", key, status, agent.status_snapshot() if agent is not None else None))
+
+    def _start(key: str, agent_kwargs: dict, restore_state: Optional[dict] = None):
+        agent = agent_shells.checkout()
+        agent.assign(**agent_kwargs)
+        agent.attach_journal(journal, key, restore_state)
+        agent.recorder = open_recording(key, agent_kwargs, resumed=restore_state is not None)
+        agents[key] = agent
+        tasks[key] = supervisor.start(key, agent)
+        tasks[key].add_done_callback(lambda t, key=key: _on_done(key, t))
+
+    async def _end(key: str, request_id: int):
+        ended = await supervisor.stop(key, "ended")
+        events.put(("reply", request_id, ended))
+
+    def _start_failed(key: str, e: Exception):
+        print(f"❌ Agent worker {worker_id} could not start {key}: {str(e)}")
+        # Once the supervisor owns the task, its exit reports the session
+        if key not in tasks:
+            agents.pop(key, None)
+            if journal is not None:
+                journal.record({"event": "finished", "key": key, "status": "failed"})
+            events.put(("finished", key, "failed", None))
+
+    if journal is not None:
+        for key, state in journal.open().items():
+            events.put(("recovered", worker_id, key, state["candidate_id"], state["room_name"], state["session_id"], state["job_id"]))
+            try:
+                _start(key, state["agent_kwargs"], state)
+            except Exception as e:
+                _start_failed(key, e)
+
+    # Scores are aggregated in the API process, which serves the leaderboards
+    score_aggregator.forward = lambda event: events.put(("score", event))
+    status_feed.forward = lambda changes: events.put(("status", changes))
+    asyncio.create_task(monitor_event_loop_lag())
+    agent_shells.start()
+    print(f"🧵 Agent worker {worker_id} ready (pid {os.getpid()})")
+    def _handle(command: tuple):
+        op = command[0]
+        if op == "start":
+            _, key, agent_kwargs, session_info = command
+            if journal is not None:
+                journal.record(journal_start_event(key, agent_kwargs, **session_info))
+            _start(key, agent_kwargs)
+        elif op == "status":
+            _, key, request_id = command
+            agent = agents.get(key)
+            events.put(("reply", request_id, agent.status_snapshot() if agent else None))
+        elif op == "status_many":
+            _, keys, request_id = command
+            events.put(("reply", request_id, {key: agents[key].status_snapshot() for key in keys if key in agents}))
+        elif op == "end":
+            _, key, request_id = command
+            asyncio.create_task(_end(key, request_id))
+        elif op == "metrics":
+            _, _, request_id = command
+            events.put(("reply", request_id, metrics.snapshot()))
+
+    while True:
+        command = await loop.run_in_executor(None, commands.get)
+        if command[0] == "stop":
+            break
+        # One bad command must not take the worker and all its sessions down
+        try:
+            _handle(command)
+        except Exception as e:
+            if command[0] == "start":
+                _start_failed(command[1], e)
+            else:
+                print(f"❌ Agent worker {worker_id} failed on {command[0]}: {str(e)}")
+                # Every other command carries its request id last
+                events.put(("reply", command[-1], None))
+
+    await supervisor.shutdown()
+    await result_writer.close()
+    if journal is not None:
+        journal.close()
+
+
+worker_pool: Optional[AgentWorkerPool] = AgentWorkerPool(AGENT_WORKERS) if AGENT_WORKERS > 0 else None
+if worker_pool is not None:
+    metrics.describe("agent_worker_sessions", "Sessions placed on agent worker processes")
+    metrics.set_gauge("agent_worker_sessions", lambda: worker_pool.total_load)
+
+
+# In worker mode the workers keep the journals, so the API process has none
+session_journal: Optional[SessionJournal] = SessionJournal(SESSION_JOURNAL_DIR) if SESSION_JOURNAL_DIR and worker_pool is None else None
+
+
+# Agent supervision
+# Every agent task in a process is owned by the supervisor. Each interview gets
+# a wall-clock budget of interviewDuration x AGENT_BUDGET_FACTOR (at least
+# AGENT_MIN_BUDGET seconds). However an agent exits (finished, failed, over
+# budget, ended or cancelled), its room is disconnected and the cleanup hooks
+# run. Process shutdown stops all agents in parallel.
+AGENT_BUDGET_FACTOR = float(os.getenv("AGENT_BUDGET_FACTOR", "1.5"))
+AGENT_MIN_BUDGET = float(os.getenv("AGENT_MIN_BUDGET", "120"))
+AGENT_CLEANUP_TIMEOUT = float(os.getenv("AGENT_CLEANUP_TIMEOUT", "10"))
+AGENT_SHUTDOWN_TIMEOUT = float(os.getenv("AGENT_SHUTDOWN_TIMEOUT", "15"))
+
+
+def agent_budget(agent: "AIInterviewAgent") -> float:
+    """Wall-clock seconds an agent may run before it is stopped"""
+    try:
+        minutes = float(agent.job.interview_duration)
+    except (TypeError, ValueError):
+        minutes = 30.0
+    return max(AGENT_MIN_BUDGET, minutes * 60 * AGENT_BUDGET_FACTOR)
+
+
+class AgentSupervisor:
+    """Runs agents under a time budget and always releases their resources.
+
+    A task's result is its exit status: "completed", "failed", "timed_out",
+    or the reason passed to ``stop``. Tasks cancelled any other way (process
+    shutdown) end cancelled, which keeps their sessions in the journal for
+    recovery. Cleanup hooks are called as ``hook(key, agent, status)`` and
+    may be coroutines.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._stop_reasons: Dict[str, str] = {}
+        self.cleanup_hooks: List[Callable] = []
+        self.exits: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def start(self, key: str, agent: "AIInterviewAgent") -> asyncio.Task:
+        task = asyncio.create_task(self._run(key, agent), name=f"agent-{key}")
+        self._tasks[key] = task
+        task.add_done_callback(lambda t, key=key: self._forget(key, t))
+        return task
+
+    def _forget(self, key: str, task: asyncio.Task):
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        status = task_exit_status(task)
+        self.exits[status] = self.exits.get(status, 0) + 1
+
+    async def _run(self, key: str, agent: "AIInterviewAgent") -> str:
+        budget = agent_budget(agent)
+        status = "completed"
+        try:
+            await asyncio.wait_for(agent.start_interview(), budget)
+        except asyncio.TimeoutError:
+            status = "timed_out"
+            print(f"⏱️ Interview {key} exceeded its {budget:.0f}s budget, stopping agent")
+        except asyncio.CancelledError:
+            status = self._stop_reasons.pop(key, "cancelled")
+            await self._release(key, agent, status)
+            if status == "cancelled":
+                raise
+            return status
+        except Exception as e:
+            status = "failed"
+            print(f"❌ Agent for {key} failed: {str(e)}")
+        await self._release(key, agent, status)
+        return status
+
+    async def _release(self, key: str, agent: "AIInterviewAgent", status: str):
+        try:
+            # Only an explicit end flushes results now; others go with the next batch
+            await asyncio.wait_for(agent.end_interview(status, flush_results=status == "ended"), AGENT_CLEANUP_TIMEOUT)
+        except Exception as e:
+            print(f"⚠️ Cleanup of agent {key} did not finish: {str(e) or type(e).__name__}")
+        for hook in self.cleanup_hooks:
+            try:
+                result = hook(key, agent, status)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                print(f"⚠️ Cleanup hook failed for {key}: {str(e)}")
+
+    async def stop(self, key: str, reason: str = "ended") -> bool:
+        """Stop one agent and wait for its cleanup"""
+        task = self._tasks.get(key)
+        if task is None:
+            return False
+        self._stop_reasons[key] = reason
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return True
+
+    async def shutdown(self, timeout: float = AGENT_SHUTDOWN_TIMEOUT):
+        """Cancel every agent at once and wait for their cleanup"""
+        tasks = list(self._tasks.values())
+        if not tasks:
+            return
+        print(f"🛑 Stopping {len(tasks)} agents")
+        for task in tasks:
+            task.cancel()
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+        if pending:
+            print(f"⚠️ {len(pending)} agents did not stop within {timeout:.0f}s")
+
+
+supervisor = AgentSupervisor()
+metrics.describe("agent_tasks_supervised", "Agent tasks currently owned by the supervisor")
+metrics.set_gauge("agent_tasks_supervised", lambda: len(supervisor))
+
+
+async def stop_agents():
+    await supervisor.shutdown()
+
+
+def launch_agent(agent_kwargs: dict, candidate_id: str, room_name: str, session_id: Optional[str] = None, job_id: str = "",
+                 restore_state: Optional[dict] = None) -> SessionEntry:
+    """Register a session and start its agent in-process or on a pool worker"""
+    key = SessionRegistry.session_key(session_id, room_name)
+    session_info = dict(candidate_id=candidate_id, room_name=room_name, session_id=session_id, job_id=job_id)
+    if worker_pool is not None:
+        worker_id = worker_pool.place(key, agent_kwargs, session_info)
+        entry = active_interviews.register(None, candidate_id, room_name, session_id, job_id)
+        entry.worker_id = worker_id
+        return entry
+
+    agent = agent_shells.checkout()
+    agent.assign(**agent_kwargs)
+    if session_journal is not None and restore_state is None:
+        session_journal.record(journal_start_event(key, agent_kwargs, **session_info))
+    agent.attach_journal(session_journal, key, restore_state)
+    agent.recorder = open_recording(key, agent_kwargs, resumed=restore_state is not None)
+    entry = active_interviews.register(agent, candidate_id, room_name, session_id, job_id)
+    track_agent_task(entry, supervisor.start(key, agent))
+    return entry
+
+
+async def start_worker_pool():
+    if worker_pool is not None:
+        worker_pool.start()
+
+
+async def stop_worker_pool():
+    if worker_pool is not None:
+        await worker_pool.stop()
+
+
+async def recover_sessions():
+    """Resume interviews that were in flight when the process last stopped"""
+    if session_journal is None:
+        return
+    recovered = session_journal.open()
+    for key, state in recovered.items():
+        launch_agent(
+            state["agent_kwargs"],
+            candidate_id=state["candidate_id"],
+            room_name=state["room_name"],
+            session_id=state["session_id"],
+            job_id=state["job_id"],
+            restore_state=state
+        )
+    if recovered:
+        print(f"♻️ Recovered {len(recovered)} interview sessions from journal")
+
+
+async def close_session_journal():
+    if session_journal is not None:
+        session_journal.close()
+
+# Admission control
+# New sessions need a free live-session slot (MAX_LIVE_SESSIONS) and a token
+# from the join rate bucket (JOIN_RATE per second, bursts of JOIN_BURST). When
+# neither is available the request waits in a bounded FIFO queue for up to
+# JOIN_QUEUE_TIMEOUT seconds; past that, or with the queue full, it is turned
+# away with a Retry-After hint. 0 disables a limit.
+MAX_LIVE_SESSIONS = int(os.getenv("MAX_LIVE_SESSIONS", "0"))
+JOIN_RATE = float(os.getenv("JOIN_RATE", "0"))
+JOIN_BURST = int(os.getenv("JOIN_BURST", "20"))
+JOIN_QUEUE_SIZE = int(os.getenv("JOIN_QUEUE_SIZE", "200"))
+JOIN_QUEUE_TIMEOUT = float(os.getenv("JOIN_QUEUE_TIMEOUT", "10"))
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, message: str, status_code: int, retry_after: float):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+    def http_exception(self) -> HTTPException:
+        return HTTPException(status_code=self.status_code, detail=str(self),
+                             headers={"Retry-After": str(max(1, math.ceil(self.retry_after)))})
+
+
+class TokenBucket:
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def available(self) -> bool:
+        if self.rate <= 0:
+            return True
+        self._refill()
+        return self.tokens >= 1
+
+    def take(self):
+        if self.rate > 0:
+            self.tokens -= 1
+
+    def wait_time(self, tokens: float = 1) -> float:
+        """Seconds until ``tokens`` more are available"""
+        if self.rate <= 0:
+            return 0.0
+        self._refill()
+        return max(0.0, (tokens - self.tokens) / self.rate)
+
+
+class AdmissionController:
+    """Gates session creation on a live-session cap and a join rate limit.
+
+    Admitted requests hold a reservation until their session is registered
+    (see ``slot``), so a burst cannot overshoot the cap while launching.
+    Waiters are admitted strictly in arrival order.
+    """
+
+    def __init__(self, max_live: int = MAX_LIVE_SESSIONS, rate: float = JOIN_RATE, burst: int = JOIN_BURST,
+                 queue_size: int = JOIN_QUEUE_SIZE, queue_timeout: float = JOIN_QUEUE_TIMEOUT):
+        self.max_live = max_live
+        self.bucket = TokenBucket(rate, burst)
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self._waiting: deque = deque()
+        self._reserved = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.rejected = 0
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiting)
+
+    def _has_capacity(self) -> bool:
+        return self.max_live <= 0 or active_interviews.active_count + self._reserved < self.max_live
+
+    def _admit_one(self):
+        self.bucket.take()
+        self._reserved += 1
+
+    def _retry_after(self, position: int) -> float:
+        if self.bucket.rate > 0:
+            return self.bucket.wait_time(position + 1)
+        return self.queue_timeout
+
+    def _reject(self, message: str, status_code: int, position: int) -> AdmissionRejected:
+        self.rejected += 1
+        return AdmissionRejected(message, status_code, self._retry_after(position))
+
+    def try_admit(self) -> bool:
+        """Admit without waiting if nobody is queued and a slot and token are free"""
+        if not self._waiting and self._has_capacity() and self.bucket.available():
+            self._admit_one()
+            return True
+        return False
+
+    async def admit(self):
+        if self.try_admit():
+            return
+        if len(self._waiting) >= self.queue_size:
+            status_code = 503 if not self._has_capacity() else 429
+            raise self._reject("Too many interviews are starting, retry later", status_code, len(self._waiting))
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiting.append(future)
+        self.wake()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self.queue_timeout)
+        except asyncio.TimeoutError:
+            if future.done() and not future.cancelled():
+                # Admitted just as the deadline passed
+                return
+            future.cancel()
+            self._waiting.remove(future)
+            status_code = 503 if not self._has_capacity() else 429
+            raise self._reject("Timed out waiting for interview capacity, retry later", status_code, len(self._waiting))
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.settle()
+            else:
+                future.cancel()
+                self._waiting.remove(future)
+            raise
+
+    def settle(self):
+        """The admitted request has registered its session (or failed)"""
+        self._reserved -= 1
+        self.wake()
+
+    def wake(self):
+        """Admit queued requests while capacity and tokens allow"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._waiting and self._has_capacity() and self.bucket.available():
+            future = self._waiting.popleft()
+            self._admit_one()
+            future.set_result(None)
+        if self._waiting and self._has_capacity():
+            # Rate limited: try again when the next token is due
+            self._timer = asyncio.get_running_loop().call_later(self.bucket.wait_time(), self.wake)
+
+    @contextlib.asynccontextmanager
+    async def slot(self):
+        await self.admit()
+        try:
+            yield
+        finally:
+            self.settle()
+
+
+admission = AdmissionController()
+metrics.describe("interview_joins_queued", "Join/start requests waiting for admission")
+metrics.set_gauge("interview_joins_queued", lambda: admission.queued)
+
+
+# Session creation
+# A room whose session is live or completed is never given a second agent.
+# Creations that have to wait for admission run as their own task (so a caller
+# disconnecting does not cancel it for the others) and retried or concurrent
+# calls for the same room await that same result. When admission is immediate
+# the agent is launched inline, with no await between the check and register.
+REUSABLE_SESSION_STATUSES = ("active", "completed")
+
+
+class SingleFlight:
+    """At most one in-flight call per key; concurrent callers share its outcome"""
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._calls
+
+    async def run(self, key: str, factory: Callable[[], Any]):
+        call = self._calls.get(key)
+        if call is None:
+            call = self._calls[key] = asyncio.ensure_future(factory())
+            call.add_done_callback(lambda _, key=key: self._calls.pop(key, None))
+        return await asyncio.shield(call)
+
+
+session_creations = SingleFlight()
+
+
+def reusable_session(room_name: str) -> Optional[SessionEntry]:
+    existing = active_interviews.get_by_room(room_name)
+    if existing is not None and existing.status in REUSABLE_SESSION_STATUSES:
+        print(f"♻️ Room {room_name} already has an agent ({existing.status}), reusing it")
+        return existing
+    return None
+
+
+async def create_session(room_name: str, start: Callable[[], SessionEntry]) -> SessionEntry:
+    """Admit and launch the room's agent once; duplicates get the existing session"""
+    if room_name not in session_creations:
+        existing = reusable_session(room_name)
+        if existing is not None:
+            return existing
+        if admission.try_admit():
+            try:
+                return start()
+            finally:
+                admission.settle()
+
+    async def _create() -> SessionEntry:
+        existing = reusable_session(room_name)
+        if existing is not None:
+            return existing
+        async with admission.slot():
+            return start()
+    return await session_creations.run(room_name, _create)
+
+
+def agent_status(entry: SessionEntry) -> str:
+    """agentStatus reported to callers: a live agent is still "connecting" from their side"""
+    return "connecting" if entry.status == "active" else entry.status
+
+
+@app.post("/agent/join")
+async def agent_join(request: AgentJoinRequest):
+    """Endpoint for agent to join interview with complete details"""
+    global pending_joins
+    pending_joins += 1
+    try:
+        print(f"🤖 Agent join request received")
+        print(f"📋 Room: {request.roomName}")
+        print(f"👤 Candidate: {request.candidateName} ({request.candidateId})")
+        print(f"💼 Job: {request.jobTitle} ({request.jobId})")
+        print(f"🤖 Agent ID: {request.agentId}")
+        
+        # Create and start AI agent with complete interview data
+        interview_data = {
+            'candidateName': request.candidateName,
+            'candidateEmail': request.candidateEmail,
+            'candidateSkills': request.candidateSkills,
+            'candidateExperience': request.candidateExperience,
+            'candidateProjects': request.candidateProjects,
+            'jobTitle': request.jobTitle,
+            'jobDescription': request.jobDescription,
+            'jobDepartment': request.jobDepartment,
+            'interviewMode': request.interviewMode,
+            'interviewLanguage': request.interviewLanguage,
+            'interviewDuration': request.interviewDuration,
+            'questionsCount': request.questionsCount,
+            'difficultyLevel': request.difficultyLevel,
+            'promptText': request.promptText,
+            'agentPrompt': request.agentPrompt,
+            'promptTemplateName': request.promptTemplateName,
+            'promptTemplateVersion': request.promptTemplateVersion,
+            'wireFormat': request.wireFormat,
+            'sessionId': request.sessionId
+        }
+        
+        # Agent token and LiveKit URL come from server config when the agent connects
+        entry = await create_session(request.roomName, lambda: launch_agent(
+            dict(
+                room_name=request.roomName,
+                agent_token="",
+                candidate_id=request.candidateId,
+                job_id=request.jobId,
+                livekit_url="",
+                interview_data=interview_data
+            ),
+            candidate_id=request.candidateId,
+            room_name=request.roomName,
+            session_id=request.sessionId,
+            job_id=request.jobId
+        ))
+        
+        # A duplicate request reports the room's existing session, not its own fields
+        return {
+            "success": True,
+            "message": "Agent join request received",
+            "sessionId": entry.session_id,
+            "sessionKey": entry.key,
+            "roomName": entry.room_name,
+            "candidateId": entry.candidate_id,
+            "agentStatus": agent_status(entry)
+        }
+        
+    except AdmissionRejected as e:
+        raise e.http_exception()
+    except WorkerPoolFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        print(f"❌ Error in agent join: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        pending_joins -= 1
+
+@app.post("/start-interview")
+async def start_interview(request: InterviewRequest):
+    """Main endpoint called by frontend to start AI interview"""
+    global pending_joins
+    pending_joins += 1
+    try:
+        print(f"🚀 Starting interview for candidate: {request.candidateId}")
+        if request.livekitApiKey or request.livekitApiSecret:
+            print("⚠️ livekitApiKey/livekitApiSecret are deprecated and ignored; stop sending API secrets")
+        print(f"📋 Job ID: {request.jobId}")
+        print(f"🏠 Room: {request.roomName}")
+        
+        # Create and start AI agent (once per room)
+        entry = await create_session(request.roomName, lambda: launch_agent(
+            dict(
+                room_name=request.roomName,
+                agent_token=request.agentToken,
+                candidate_id=request.candidateId,
+                job_id=request.jobId,
+                livekit_url=request.livekitUrl
+            ),
+            candidate_id=request.candidateId,
+            room_name=request.roomName,
+            job_id=request.jobId
+        ))
+        
+        return {
+            "success": True,
+            "message": "AI agent started successfully",
+            "sessionKey": entry.key,
+            "roomName": entry.room_name,
+            "candidateId": entry.candidate_id,
+            "jobId": entry.job_id,
+            "agentStatus": agent_status(entry)
+        }
+        
+    except AdmissionRejected as e:
+        raise e.http_exception()
+    except WorkerPoolFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        print(f"❌ Error starting interview: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        pending_joins -= 1
+
+# Snapshot reported when a worker-hosted agent does not answer in time
+UNAVAILABLE_SNAPSHOT = {"agentConnected": False, "currentQuestion": None, "interviewProgress": 0}
+MAX_STATUS_BATCH = 1000
+
+
+def session_status(entry: SessionEntry, snapshot: Optional[dict]) -> dict:
+    return {
+        "status": entry.status,
+        "candidateId": entry.candidate_id,
+        "sessionId": entry.session_id,
+        "roomName": entry.room_name,
+        "jobId": entry.job_id,
+        **(snapshot or UNAVAILABLE_SNAPSHOT)
+    }
+
+
+def on_worker(entry: SessionEntry) -> bool:
+    """Live session whose status has to be asked from its pool worker"""
+    return entry.worker_id is not None and not entry.is_finished
+
+
+def local_snapshot(entry: SessionEntry) -> Optional[dict]:
+    """Live status of an in-process agent, else the finished session's last one"""
+    return entry.agent.status_snapshot() if entry.agent is not None else entry.snapshot
+
+
+async def session_statuses(entries: List[SessionEntry]) -> List[dict]:
+    """Status for many sessions; live worker-hosted ones cost one request per worker"""
+    remote = [entry.key for entry in entries if on_worker(entry)]
+    snapshots = await worker_pool.status_many(remote) if remote else {}
+    return [
+        session_status(entry, snapshots.get(entry.key) if on_worker(entry) else local_snapshot(entry))
+        for entry in entries
+    ]
+
+
+@app.get("/interview-status/{candidate_id}")
+async def get_interview_status(candidate_id: str):
+    """Get current interview status (accepts candidateId, sessionId or roomName)"""
+    entry = active_interviews.lookup(candidate_id)
+    if entry is not None:
+        if on_worker(entry):
+            snapshot = await worker_pool.status(entry.key)
+        else:
+            snapshot = local_snapshot(entry)
+        return session_status(entry, snapshot)
+    return {"status": "not_found"}
+
+
+class InterviewStatusBatchRequest(BaseModel):
+    ids: List[str] = []  # candidateIds, sessionIds or roomNames
+    jobId: str = ""      # every tracked session for this job
+
+
+@app.post("/interview-status/batch")
+async def get_interview_statuses(request: InterviewStatusBatchRequest):
+    """Status for many sessions in one call"""
+    if len(request.ids) > MAX_STATUS_BATCH:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_STATUS_BATCH} ids per request")
+    entries = active_interviews.by_job(request.jobId) if request.jobId else []
+    seen = {entry.key for entry in entries}
+    not_found = []
+    for identifier in request.ids:
+        entry = active_interviews.lookup(identifier)
+        if entry is None:
+            not_found.append(identifier)
+        elif entry.key not in seen:
+            seen.add(entry.key)
+            entries.append(entry)
+    return {"sessions": await session_statuses(entries), "notFound": not_found}
+
+
+@app.get("/interview-events")
+async def stream_interview_events(ids: str = "", jobId: str = ""):
+    """Server-sent events with coalesced status changes.
+
+    ``ids`` is a comma-separated list of candidateIds, sessionIds or
+    roomNames; with neither filter every session is streamed. The first
+    event is a full snapshot, then each event maps session keys to the
+    fields that changed since the previous one.
+    """
+    wanted = {i for i in ids.split(",") if i}
+    subscriber = StatusSubscriber(wanted, jobId)
+    status_feed.subscribe(subscriber)
+    entries = [e for e in active_interviews.entries() if subscriber.wants(e, e.key)]
+    initial = {entry.key: status for entry, status in zip(entries, await session_statuses(entries))}
+
+    async def _events():
+        try:
+            yield f"event: snapshot\ndata: {json.dumps(initial)}\n\n"
+            while True:
+                try:
+                    await asyncio.wait_for(subscriber.ready.wait(), STATUS_STREAM_KEEPALIVE)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: status\ndata: {json.dumps(subscriber.take())}\n\n"
+        finally:
+            status_feed.unsubscribe(subscriber)
+
+    return StreamingResponse(_events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+@app.delete("/end-interview/{candidate_id}")
+async def end_interview(candidate_id: str):
+    """End interview session (accepts candidateId, sessionId or roomName)"""
+    entry = active_interviews.lookup(candidate_id)
+    if entry is not None:
+        if entry.worker_id is not None:
+            await worker_pool.end(entry.key)
+        else:
+            # No-op if the agent already exited; the supervisor released it then
+            await supervisor.stop(entry.key, "ended")
+        active_interviews.remove(entry.key)
+        status_feed.publish(entry.key, {"status": "ended", "jobId": entry.job_id, "candidateId": entry.candidate_id})
+        admission.wake()
+        return {"success": True, "message": "Interview ended"}
+    return {"success": False, "message": "Interview not found"}
+
+# Response capture
+# Candidate answers arrive as audio frames from the subscribed track and/or
+# text on the data channel. ResponseCapture endpoints on whichever comes first:
+# a final text message, or speech followed by enough trailing silence.
+CANDIDATE_TEXT_TYPES = ("response", "answer", "transcript")
+
+# How long conduct_interview waits for the candidate after the greeting
+CANDIDATE_READY_TIMEOUT = float(os.getenv("CANDIDATE_READY_TIMEOUT", "5"))
+
+
+class SpeechToText(ABC):
+    """Pluggable speech-to-text backend used by ResponseCapture"""
+
+    @abstractmethod
+    async def transcribe(self, pcm: bytes, sample_rate: int, num_channels: int = 1) -> str:
+        ...
+
+
+class LocalSTTStandIn(SpeechToText):
+    """Offline stand-in that describes the captured speech instead of transcribing it"""
+
+    async def transcribe(self, pcm: bytes, sample_rate: int, num_channels: int = 1) -> str:
+        seconds = len(pcm) / (2 * sample_rate * num_channels) if sample_rate else 0
+        return f"[{seconds:.1f}s of candidate speech]"
+
+
+# Candidate audio
+# Frames from the candidate's track are copied once into a ring of mono int16
+# samples (no per-frame bytes objects, no per-sample Python). The ring starts
+# at AUDIO_RING_INITIAL_SECONDS and doubles as an answer grows, up to that
+# answer's timeout, so a full answer always reaches STT. Every
+# AUDIO_FEATURE_BATCH_MS of new audio, the unanalyzed samples are cut into
+# 10 ms blocks and their RMS computed in one vectorized pass; speech/silence
+# runs over those blocks give the features used for endpointing and scoring.
+AUDIO_RING_INITIAL_SECONDS = float(os.getenv("AUDIO_RING_INITIAL_SECONDS", "10"))
+AUDIO_FEATURE_BATCH_MS = int(os.getenv("AUDIO_FEATURE_BATCH_MS", "100"))
+AUDIO_BLOCK_MS = 10
+# Silences shorter than this count as part of the surrounding speech burst
+AUDIO_MIN_GAP_MS = 150
+
+
+class AudioFeatures(NamedTuple):
+    speech_ms: float
+    total_ms: float
+    speech_ratio: float
+    speech_rms: float            # mean block RMS while speaking
+    speaking_rate: float         # speech bursts per second of speech
+    silence_gaps: int            # pauses of AUDIO_MIN_GAP_MS or more between bursts
+    longest_gap_ms: float
+    trailing_silence_ms: float
+
+    def to_dict(self) -> dict:
+        return {k: round(v, 3) if isinstance(v, float) else v for k, v in self._asdict().items()}
+
+
+class AudioRingBuffer:
+    """Ring of the current answer's audio with incrementally computed features.
+
+    The sample array is allocated on the first frame (``seconds`` at that
+    frame's rate), grows up to ``max_seconds`` as the answer needs it and is
+    reused for every later answer until ``release``. Only audio beyond
+    ``max_seconds`` overwrites the start of the answer.
+    """
+
+    def __init__(self, seconds: float = AUDIO_RING_INITIAL_SECONDS, energy_threshold: float = 500.0):
+        self.seconds = seconds
+        self.max_seconds = seconds
+        self.energy_threshold = energy_threshold
+        self.samples = None
+        self.sample_rate = 0
+        self.reset()
+
+    def reset(self, max_seconds: Optional[float] = None):
+        """Start a new answer of up to ``max_seconds`` (keeps the allocation)"""
+        if max_seconds is not None:
+            self.max_seconds = max_seconds
+        self.written = 0
+        self._analyzed = 0
+        self._speech_blocks = 0
+        self._total_blocks = 0
+        self._speech_rms_sum = 0.0
+        self._bursts = 0
+        self._gaps = 0
+        self._longest_gap = 0
+        self._silence_run = 0
+        self._first_speech = None
+
+    @property
+    def capacity(self) -> int:
+        return len(self.samples) if self.samples is not None else 0
+
+    @property
+    def pending(self) -> int:
+        """Samples written but not yet analyzed"""
+        return self.written - self._analyzed
+
+    def write(self, pcm, sample_rate: int, num_channels: int = 1):
+        """Append one frame of signed 16-bit PCM (any buffer-protocol object)"""
+        frame = np.frombuffer(pcm, dtype=np.int16)
+        if num_channels > 1:
+            frame = frame[:len(frame) - len(frame) % num_channels].reshape(-1, num_channels).mean(axis=1).astype(np.int16)
+        if sample_rate != self.sample_rate:
+            self.samples = np.zeros(max(1, int(min(self.seconds, self.max_seconds) * sample_rate)), dtype=np.int16)
+            self.sample_rate = sample_rate
+            self.reset()
+        if self.written + len(frame) > self.capacity:
+            self._grow(self.written + len(frame))
+        capacity = self.capacity
+        if len(frame) > capacity:
+            frame = frame[-capacity:]
+        self._place(self.written, frame)
+        self.written += len(frame)
+
+    def _place(self, position: int, data):
+        """Store samples starting at absolute ``position``, wrapping at the end"""
+        capacity = self.capacity
+        start = position % capacity
+        head = min(len(data), capacity - start)
+        self.samples[start:start + head] = data[:head]
+        self.samples[:len(data) - head] = data[head:]
+
+    def _grow(self, needed: int):
+        """Double the ring toward ``needed`` samples, never past ``max_seconds``"""
+        limit = int(self.max_seconds * self.sample_rate)
+        capacity = min(limit, max(needed, 2 * self.capacity))
+        if capacity <= self.capacity:
+            return
+        start = max(0, self.written - self.capacity)
+        kept = self._span(start, self.written) if self.written else None
+        self.samples = np.zeros(capacity, dtype=np.int16)
+        if kept is not None:
+            self._place(start, kept)
+
+    def _span(self, start: int, end: int):
+        """Samples [start, end) by absolute position; a copy only when wrapping"""
+        capacity = self.capacity
+        a, b = start % capacity, end % capacity
+        if end - start == capacity or a >= b:
+            return np.concatenate((self.samples[a:], self.samples[:b]))
+        return self.samples[a:b]
+
+    def analyze(self) -> AudioFeatures:
+        """Fold every complete unanalyzed block into the running features"""
+        if self.sample_rate:
+            block = self.sample_rate * AUDIO_BLOCK_MS // 1000
+            # Audio overwritten before it was analyzed is skipped
+            self._analyzed = max(self._analyzed, self.written - self.capacity)
+            count = (self.written - self._analyzed) // block
+            if count:
+                blocks = self._span(self._analyzed, self._analyzed + count * block).reshape(count, block).astype(np.float32)
+                rms = np.sqrt(np.mean(blocks * blocks, axis=1))
+                self._fold(rms, rms >= self.energy_threshold, block)
+                self._analyzed += count * block
+        return self.features()
+
+    def _fold(self, rms, speech, block: int):
+        self._total_blocks += len(speech)
+        self._speech_blocks += int(speech.sum())
+        self._speech_rms_sum += float(rms[speech].sum())
+        # Walk speech/silence runs, not blocks: a batch holds only a handful
+        starts = np.concatenate(([0], np.flatnonzero(speech[1:] != speech[:-1]) + 1))
+        lengths = np.diff(np.append(starts, len(speech)))
+        min_gap = AUDIO_MIN_GAP_MS // AUDIO_BLOCK_MS
+        for start, length, is_speech in zip(starts.tolist(), lengths.tolist(), speech[starts].tolist()):
+            if not is_speech:
+                self._silence_run += length
+                continue
+            if self._first_speech is None:
+                self._first_speech = self._analyzed + start * block
+                self._bursts += 1
+            elif self._silence_run >= min_gap:
+                self._bursts += 1
+                self._gaps += 1
+                self._longest_gap = max(self._longest_gap, self._silence_run)
+            self._silence_run = 0
+
+    def features(self) -> AudioFeatures:
+        speech_ms = self._speech_blocks * AUDIO_BLOCK_MS
+        total_ms = self._total_blocks * AUDIO_BLOCK_MS
+        return AudioFeatures(
+            speech_ms=float(speech_ms),
+            total_ms=float(total_ms),
+            speech_ratio=speech_ms / total_ms if total_ms else 0.0,
+            speech_rms=self._speech_rms_sum / self._speech_blocks if self._speech_blocks else 0.0,
+            speaking_rate=self._bursts * 1000.0 / speech_ms if speech_ms else 0.0,
+            silence_gaps=self._gaps,
+            longest_gap_ms=float(self._longest_gap * AUDIO_BLOCK_MS),
+            trailing_silence_ms=float(self._silence_run * AUDIO_BLOCK_MS if self._first_speech is not None else 0)
+        )
+
+    def speech_pcm(self) -> bytes:
+        """PCM from the first speech block to the end of what was written"""
+        if self._first_speech is None:
+            return b""
+        start = max(self._first_speech, self.written - self.capacity)
+        return self._span(start, self.written).tobytes()
+
+    def release(self):
+        """Free the sample array; the next frame allocates a new one"""
+        self.samples = None
+        self.sample_rate = 0
+        self.reset()
+
+
+class ResponseCapture:
+    """Collects one candidate answer at a time and decides when it is finished"""
+
+    def __init__(self, stt: Optional[SpeechToText] = None, energy_threshold: float = 500.0,
+                 end_silence_ms: int = 800, min_speech_ms: int = 250, max_pending: int = 1000):
+        self.stt = stt or LocalSTTStandIn()
+        self.end_silence_ms = end_silence_ms
+        self.min_speech_ms = min_speech_ms
+        self.max_pending = max_pending
+        self.audio = AudioRingBuffer(energy_threshold=energy_threshold)
+        # Features of the most recent answer's audio (None when it had none)
+        self.last_features: Optional[AudioFeatures] = None
+        self._texts: deque = deque()
+        self._wake = asyncio.Event()
+        self._listening = False
+        self._capturing = False
+        self._opened_at = 0.0
+        self._timeout = 0.0
+        self.dropped = 0
+
+    @property
+    def listening(self) -> bool:
+        return self._listening
+
+    def push_text(self, text: str, final: bool = True):
+        """Feed candidate text from the data channel"""
+        # Input outside a listening window belongs to no question
+        if not text or not self._listening:
+            return
+        if len(self._texts) >= self.max_pending:
+            self.dropped += 1
+            return
+        self._texts.append((text, final))
+        self._wake.set()
+
+    def push_audio(self, pcm, sample_rate: int, num_channels: int = 1):
+        """Feed one frame of signed 16-bit PCM from the candidate's audio track"""
+        if not self._listening:
+            return
+        if not self._capturing:
+            # Until capture starts its deadline, the answer may run at least this long
+            self.audio.max_seconds = time.monotonic() - self._opened_at + self._timeout
+        self.audio.write(pcm, sample_rate, num_channels)
+        # Endpointing runs once per batch of audio, not per frame
+        if self.audio.pending * 1000 >= sample_rate * AUDIO_FEATURE_BATCH_MS:
+            self._wake.set()
+
+    def open(self, timeout: float):
+        """Start collecting the next answer, e.g. as soon as its question is sent.
+
+        Input from then on is kept for ``capture``, so a candidate who answers
+        while the question is still being read is not lost.
+        """
+        self._texts.clear()
+        self._wake.clear()
+        # The ring grows to hold the whole answer, however long it is allowed to run
+        self.audio.reset(timeout)
+        self.last_features = None
+        self._listening = True
+        self._opened_at = time.monotonic()
+        self._timeout = timeout
+
+    async def capture(self, timeout: float) -> Optional[str]:
+        """Return the candidate's answer as soon as it ends, or None on timeout"""
+        if not self._listening:
+            self.open(timeout)
+        # Opened early, the answer may have begun before this call
+        self.audio.max_seconds = time.monotonic() - self._opened_at + timeout
+        self._capturing = True
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        texts: List[str] = []
+        try:
+            while True:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    await asyncio.wait_for(self._wake.wait(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                self._wake.clear()
+
+                while self._texts:
+                    text, final = self._texts.popleft()
+                    texts.append(text)
+                    if final:
+                        return " ".join(texts)
+
+                features = self.audio.analyze()
+                if features.speech_ms >= self.min_speech_ms and features.trailing_silence_ms >= self.end_silence_ms:
+                    break
+        finally:
+            self._listening = self._capturing = False
+            if self.audio.written:
+                self.last_features = self.audio.analyze()
+
+        if self.last_features is not None and self.last_features.speech_ms >= self.min_speech_ms:
+            texts.append(await self.stt.transcribe(self.audio.speech_pcm(), self.audio.sample_rate, 1))
+        return " ".join(texts) if texts else None
+
+    def release(self):
+        """Drop buffered input and free the audio ring once the interview is over"""
+        self._listening = self._capturing = False
+        self._texts.clear()
+        self.last_features = None
+        self.audio.release()
+
+
+# Scoring service
+# One per process. analyze_response calls from every agent are collected and
+# scored together, so a real model sees one batched call instead of one per answer.
+class ScoringItem(NamedTuple):
+    question: str
+    response: str
+    context: Optional[dict] = None
+
+
+# Relevance scoring
+# CPU-only default scorer. Texts become hashed bag-of-words vectors
+# (RELEVANCE_DIM buckets, log term frequency, unit length). Job vectors and
+# keywords are built once per shared JobProfile and question vectors once per
+# question text; per answer only the answer itself is vectorized, and a whole
+# batch is compared against its job and question vectors in one NumPy pass.
+RELEVANCE_DIM = 1024
+RELEVANCE_CACHE_SIZE = int(os.getenv("RELEVANCE_CACHE_SIZE", "2048"))
+RELEVANCE_KEYWORDS = 25
+# Cosine similarity of a clearly on-topic answer; higher values score as 1.0
+RELEVANCE_SIM_FULL = 0.35
+# Answer length (content words) treated as complete
+RELEVANCE_FULL_TERMS = 30
+# Texts with fewer content terms than this say too little to compare against
+RELEVANCE_MIN_TERMS = 3
+
+TERM_PATTERN = re.compile(r"[a-z][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+STOPWORDS = frozenset("""
+a about above after again all also am an and any are as at be because been before being below between both but by
+can could did do does doing done down during each few for from further get got had has have having he her here hers
+him his how i if in into is it its itself just let like me more most my myself no nor not now of off on once only or
+other our ours out over own really same she should so some such than that the their theirs them then there these
+they this those through to too under until up very was we were what when where which while who whom why will with
+would you your yours yourself yourselves
+""".split())
+
+
+def text_terms(text: str) -> List[str]:
+    return [term for term in TERM_PATTERN.findall(text.lower()) if term not in STOPWORDS and len(term) > 1]
+
+
+def term_vector(terms: List[str]):
+    """Unit-length hashed log-TF vector of a term list"""
+    vector = np.zeros(RELEVANCE_DIM, dtype=np.float32)
+    if terms:
+        buckets = np.fromiter((zlib.crc32(term.encode()) % RELEVANCE_DIM for term in terms), dtype=np.int64, count=len(terms))
+        counts = np.bincount(buckets, minlength=RELEVANCE_DIM)
+        np.log1p(counts, out=vector, casting="unsafe")
+        norm = np.linalg.norm(vector)
+        if norm:
+            vector /= norm
+    return vector
+
+
+def top_terms(terms: List[str], limit: int) -> frozenset:
+    counts: Dict[str, int] = {}
+    for term in terms:
+        counts[term] = counts.get(term, 0) + 1
+    return frozenset(sorted(counts, key=lambda term: (-counts[term], term))[:limit])
+
+
+class TextVector(NamedTuple):
+    vector: Any
+    terms: int
+
+
+class JobVectors(NamedTuple):
+    vector: Any
+    keywords: frozenset
+    informative: bool
+
+
+class RelevanceScorer:
+    """Scores answers by similarity to the job and question plus keyword coverage.
+
+    Batches run in executor threads, so the caches are guarded by a lock.
+    """
+
+    def __init__(self, cache_size: int = RELEVANCE_CACHE_SIZE):
+        self.cache_size = cache_size
+        self._jobs: "weakref.WeakKeyDictionary[JobProfile, JobVectors]" = weakref.WeakKeyDictionary()
+        self._questions: "OrderedDict[str, Any]" = OrderedDict()
+        self._candidates: "OrderedDict[str, frozenset]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._empty = np.zeros(RELEVANCE_DIM, dtype=np.float32)
+
+    def job_vectors(self, job: Optional["JobProfile"]) -> Optional[JobVectors]:
+        if job is None:
+            return None
+        with self._lock:
+            cached = self._jobs.get(job)
+        if cached is not None:
+            return cached
+        prompt_text = job.prompt_text or {}
+        texts = [job.job_title, job.job_department, job.job_description]
+        texts.extend(question_text(q) for q in (prompt_text.get("technical_questions") or ()))
+        terms = text_terms(" ".join(t for t in texts if isinstance(t, str)))
+        computed = JobVectors(term_vector(terms), top_terms(terms, RELEVANCE_KEYWORDS), len(terms) >= RELEVANCE_MIN_TERMS)
+        with self._lock:
+            self._jobs[job] = computed
+        return computed
+
+    def _cached(self, cache: OrderedDict, key: str, build: Callable):
+        with self._lock:
+            value = cache.get(key)
+            if value is not None:
+                cache.move_to_end(key)
+                return value
+        value = build()
+        with self._lock:
+            cache[key] = value
+            while len(cache) > self.cache_size:
+                cache.popitem(last=False)
+        return value
+
+    def question_vector(self, question: str) -> TextVector:
+        def build():
+            terms = text_terms(question)
+            return TextVector(term_vector(terms), len(terms))
+        return self._cached(self._questions, question, build)
+
+    def candidate_terms(self, profile: str) -> frozenset:
+        return self._cached(self._candidates, profile, lambda: frozenset(text_terms(profile)))
+
+    def score_batch(self, items: List[ScoringItem]) -> List[dict]:
+        contexts = [item.context or {} for item in items]
+        answer_terms = [text_terms(item.response) for item in items]
+        jobs = [self.job_vectors(context.get("job")) for context in contexts]
+
+        questions = [self.question_vector(item.question) for item in items]
+        answers = np.stack([term_vector(terms) for terms in answer_terms])
+        question_matrix = np.stack([question.vector for question in questions])
+        job_matrix = np.stack([job.vector if job is not None else self._empty for job in jobs])
+        question_sim = np.minimum(1.0, np.einsum("ij,ij->i", answers, question_matrix) / RELEVANCE_SIM_FULL)
+        job_sim = np.minimum(1.0, np.einsum("ij,ij->i", answers, job_matrix) / RELEVANCE_SIM_FULL)
+        completeness = np.minimum(1.0, np.array([len(terms) for terms in answer_terms], dtype=np.float32) / RELEVANCE_FULL_TERMS)
+
+        results = []
+        for i, (terms, question, job, context) in enumerate(zip(answer_terms, questions, jobs, contexts)):
+            used = set(terms)
+            # (weight, value) for each signal this answer has data for
+            signals = [(0.2, completeness[i])]
+            matched = []
+            if job is not None and job.informative:
+                matched = sorted(used & job.keywords)
+                signals += [(0.35, job_sim[i]), (0.15, min(1.0, len(matched) / 5))]
+            if question.terms >= RELEVANCE_MIN_TERMS:
+                signals.append((0.2, question_sim[i]))
+            claimed = self.candidate_terms(context.get("candidate") or "")
+            if len(claimed) >= RELEVANCE_MIN_TERMS:
+                signals.append((0.1, min(1.0, len(used & claimed) / 3)))
+            score = 10.0 * sum(w * v for w, v in signals) / sum(w for w, _ in signals)
+            results.append(self._analysis(round(float(score), 1), matched, float(completeness[i]), context.get("audio")))
+        return results
+
+    @staticmethod
+    def _analysis(score: float, matched: List[str], completeness: float, audio: Optional[dict]) -> dict:
+        if score >= 7:
+            feedback, sentiment = "Strong, relevant answer", "positive"
+        elif score >= 4:
+            feedback, sentiment = "Relevant, could use more specific detail", "neutral"
+        else:
+            feedback, sentiment = "Try to relate your answer more closely to the role", "negative"
+        if audio and audio.get("longest_gap_ms", 0) > 3000:
+            feedback += "; take your time, but try to keep a steady pace"
+        return {
+            "score": score,
+            "feedback": feedback,
+            "keywords": matched[:5],
+            "sentiment": sentiment,
+            "completeness": round(completeness, 2)
+        }
+
+
+relevance_scorer = RelevanceScorer()
+
+
+class ScoringService:
+    """Micro-batches (question, response) pairs across all agents in the process.
+
+    A batch is scored when it reaches ``max_batch`` items or ``max_delay``
+    seconds after its first item arrived, whichever comes first. The scorer
+    takes the whole batch and returns one analysis per item; with ``offload``
+    it runs in the default executor so a slow model never blocks the loop.
+    """
+
+    def __init__(self, scorer: Callable[[List[ScoringItem]], List[dict]] = relevance_scorer.score_batch,
+                 max_batch: int = 32, max_delay: float = 0.02, offload: bool = True):
+        self.scorer = scorer
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.offload = offload
+        self._pending: List[tuple] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.batches = 0
+        self.items = 0
+
+    async def score(self, question: str, response: str, context: Optional[dict] = None) -> dict:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((ScoringItem(question, response, context), future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            asyncio.ensure_future(self._run_batch(batch))
+
+    async def _run_batch(self, batch: List[tuple]):
+        items = [item for item, _ in batch]
+        self.batches += 1
+        self.items += len(items)
+        try:
+            if self.offload:
+                results = await asyncio.get_running_loop().run_in_executor(None, self.scorer, items)
+            else:
+                results = self.scorer(items)
+            results = list(results)
+            # A short result list would leave its callers waiting forever
+            if len(results) != len(items):
+                raise ValueError(f"Scorer returned {len(results)} results for {len(items)} items")
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+scoring_service = ScoringService()
+
+
+# Score aggregates
+# Running statistics per session and per job, updated as each answer is scored
+# instead of re-scanning responses. Each job also keeps a top-K ranking of its
+# candidates, so dashboards read a leaderboard without touching interview data.
+# Worker processes forward their score events to the API process's aggregator.
+LEADERBOARD_SIZE = int(os.getenv("LEADERBOARD_SIZE", "50"))
+SCORE_MAX = 10.0
+# Score sketch resolution: bins of 0.1 over 0-10
+SCORE_SKETCH_BINS = 100
+
+
+class RunningStats:
+    """Count, mean, variance (Welford), min and max in constant space"""
+    __slots__ = ("count", "mean", "_m2", "min", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / self.count if self.count else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": round(self.mean, 4) if self.count else None,
+            "variance": round(self.variance, 4),
+            "stddev": round(math.sqrt(self.variance), 4),
+            "min": round(self.min, 4) if self.count else None,
+            "max": round(self.max, 4) if self.count else None
+        }
+
+
+class ScoreSketch:
+    """Fixed-width histogram over the score range for approximate percentiles"""
+    __slots__ = ("bins", "count")
+
+    def __init__(self):
+        self.bins = [0] * (SCORE_SKETCH_BINS + 1)
+        self.count = 0
+
+    def add(self, value: float):
+        index = round(min(max(value, 0.0), SCORE_MAX) / SCORE_MAX * SCORE_SKETCH_BINS)
+        self.bins[index] += 1
+        self.count += 1
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index, n in enumerate(self.bins):
+            seen += n
+            if seen >= rank:
+                return round(index * SCORE_MAX / SCORE_SKETCH_BINS, 2)
+        return SCORE_MAX
+
+    def percentiles(self) -> dict:
+        return {f"p{int(q * 100)}": self.quantile(q) for q in (0.25, 0.5, 0.75, 0.9)}
+
+
+class JobScores:
+    """Aggregates and the top-K candidate ranking for one job"""
+    __slots__ = ("answers", "answer_sketch", "interviews", "interview_sketch", "_ranking", "_ranked", "_seq")
+
+    def __init__(self):
+        self.answers = RunningStats()
+        self.answer_sketch = ScoreSketch()
+        self.interviews = RunningStats()
+        self.interview_sketch = ScoreSketch()
+        # Sorted (-score, seq, key); ties keep the earlier entry ahead
+        self._ranking: List[tuple] = []
+        self._ranked: Dict[str, tuple] = {}
+        self._seq = itertools.count()
+
+    def rank(self, key: str, score: float, entry: dict, limit: int = LEADERBOARD_SIZE):
+        """Insert or move a session in the ranking, keeping at most ``limit`` entries"""
+        previous = self._ranked.pop(key, None)
+        if previous is not None:
+            del self._ranking[bisect.bisect_left(self._ranking, previous[0])]
+        position = (-score, next(self._seq), key)
+        if len(self._ranking) >= limit and position > self._ranking[-1]:
+            return
+        bisect.insort(self._ranking, position)
+        self._ranked[key] = (position, entry)
+        if len(self._ranking) > limit:
+            dropped = self._ranking.pop()
+            del self._ranked[dropped[2]]
+
+    def leaderboard(self, limit: int) -> List[dict]:
+        return [
+            {"rank": i + 1, **self._ranked[key][1]}
+            for i, (_, _, key) in enumerate(self._ranking[:limit])
+        ]
+
+    def to_dict(self) -> dict:
+        return {
+            "answers": {**self.answers.to_dict(), **self.answer_sketch.percentiles()},
+            "interviews": {**self.interviews.to_dict(), **self.interview_sketch.percentiles()},
+            "ranked": len(self._ranking)
+        }
+
+
+class ScoreAggregator:
+    """Per-job score aggregates fed by agents as answers are scored.
+
+    With ``forward`` set (inside agent workers) events are handed to it
+    instead of applied, and the API process applies them on arrival.
+    """
+
+    def __init__(self):
+        self.jobs: Dict[str, JobScores] = {}
+        self.forward: Optional[Callable[[tuple], None]] = None
+
+    def record_answer(self, job_id: str, key: str, candidate_id: str, candidate_name: str, score: float, session: RunningStats):
+        self.apply(("answer", job_id, key, candidate_id, candidate_name, score, session.mean, session.count))
+
+    def record_complete(self, job_id: str, key: str, candidate_id: str, candidate_name: str, session: RunningStats):
+        self.apply(("complete", job_id, key, candidate_id, candidate_name, None, session.mean, session.count))
+
+    def apply(self, event: tuple):
+        if self.forward is not None:
+            self.forward(event)
+            return
+        kind, job_id, key, candidate_id, candidate_name, score, session_mean, answered = event
+        if not answered:
+            return
+        job = self.jobs.get(job_id)
+        if job is None:
+            job = self.jobs[job_id] = JobScores()
+        if kind == "answer":
+            job.answers.add(score)
+            job.answer_sketch.add(score)
+        else:
+            job.interviews.add(session_mean)
+            job.interview_sketch.add(session_mean)
+        job.rank(key, session_mean, {
+            "candidateId": candidate_id,
+            "candidateName": candidate_name,
+            "sessionKey": key,
+            "score": round(session_mean, 2),
+            "answers": answered,
+            "completed": kind == "complete"
+        })
+
+    def leaderboard(self, job_id: str, limit: int = 10) -> List[dict]:
+        job = self.jobs.get(job_id)
+        return job.leaderboard(limit) if job is not None else []
+
+    def job_stats(self, job_id: str) -> Optional[dict]:
+        job = self.jobs.get(job_id)
+        return job.to_dict() if job is not None else None
+
+
+score_aggregator = ScoreAggregator()
+
+
+@app.get("/jobs/{job_id}/leaderboard")
+async def get_job_leaderboard(job_id: str, limit: int = 10):
+    """Top-ranked candidates for a job plus its score aggregates"""
+    limit = max(1, min(limit, LEADERBOARD_SIZE))
+    return {
+        "jobId": job_id,
+        "candidates": score_aggregator.leaderboard(job_id, limit),
+        "stats": score_aggregator.job_stats(job_id)
+    }
+
+
+# Result persistence
+# Write-behind: agents add rows to a per-process buffer and never wait on the
+# database. Buffered rows go out as bulk upserts through one pooled HTTP client
+# once a table reaches PERSIST_BATCH_SIZE rows or PERSIST_FLUSH_INTERVAL seconds
+# after the first unflushed row. Disabled unless the Supabase URL and service
+# role key are set (tables: supabase/migrations/011_create_interview_results_tables.sql).
+SUPABASE_URL = os.getenv("SUPABASE_URL") or os.getenv("NEXT_PUBLIC_SUPABASE_URL", "")
+SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY", "")
+PERSIST_BATCH_SIZE = int(os.getenv("PERSIST_BATCH_SIZE", "200"))
+PERSIST_FLUSH_INTERVAL = float(os.getenv("PERSIST_FLUSH_INTERVAL", "1.0"))
+PERSIST_MAX_RETRIES = int(os.getenv("PERSIST_MAX_RETRIES", "5"))
+# Rows kept while the database is unreachable; the oldest are dropped past this
+PERSIST_MAX_BUFFER = int(os.getenv("PERSIST_MAX_BUFFER", "10000"))
+
+# table -> columns that identify a row (the upsert conflict target)
+PERSIST_TABLES = {
+    "interview_responses": ("session_key", "question_index"),
+    "interview_results": ("session_key",),
+}
+
+
+class ResultWriter:
+    """Buffers rows per table and writes them as bulk upserts.
+
+    Rows with the same key replace each other while buffered, so a retried
+    or rewritten row is sent once. Failed batches are retried with
+    exponential backoff; after ``max_retries`` they go back into the buffer
+    for the next flush. ``transport`` lets tests point the client at a
+    local stand-in (see fake_supabase.py).
+    """
+
+    def __init__(self, base_url: str = SUPABASE_URL, api_key: str = SUPABASE_SERVICE_ROLE_KEY,
+                 batch_size: int = PERSIST_BATCH_SIZE, flush_interval: float = PERSIST_FLUSH_INTERVAL,
+                 max_retries: int = PERSIST_MAX_RETRIES, max_buffer: int = PERSIST_MAX_BUFFER,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.max_buffer = max_buffer
+        self.transport = transport
+        self._buffers: Dict[str, "OrderedDict[tuple, dict]"] = {table: OrderedDict() for table in PERSIST_TABLES}
+        self._client: Optional[httpx.AsyncClient] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flush_lock = asyncio.Lock()
+        self.rows_written = 0
+        self.rows_dropped = 0
+        self.failed_batches = 0
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.base_url and self.api_key)
+
+    @property
+    def buffered(self) -> int:
+        return sum(len(buffer) for buffer in self._buffers.values())
+
+    def add(self, table: str, row: dict):
+        if not self.configured:
+            return
+        buffer = self._buffers[table]
+        key = tuple(row[column] for column in PERSIST_TABLES[table])
+        buffer.pop(key, None)
+        buffer[key] = row
+        while self.buffered > self.max_buffer:
+            self._drop_oldest()
+        if len(buffer) >= self.batch_size:
+            asyncio.ensure_future(self.flush())
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.flush_interval, self._flush_later)
+
+    def _drop_oldest(self):
+        buffer = max(self._buffers.values(), key=len)
+        buffer.popitem(last=False)
+        self.rows_dropped += 1
+
+    def _flush_later(self):
+        self._timer = None
+        asyncio.ensure_future(self.flush())
+
+    def client(self) -> httpx.AsyncClient:
+        """The shared pooled client, created on first use"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=f"{self.base_url}/rest/v1",
+                headers={
+                    "apikey": self.api_key,
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Prefer": "resolution=merge-duplicates,return=minimal"
+                },
+                limits=httpx.Limits(max_connections=4, max_keepalive_connections=4),
+                timeout=httpx.Timeout(10.0),
+                transport=self.transport
+            )
+        return self._client
+
+    async def flush(self):
+        """Write everything buffered; concurrent callers share the work"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        async with self._flush_lock:
+            for table, buffer in self._buffers.items():
+                while buffer:
+                    batch = []
+                    while buffer and len(batch) < self.batch_size:
+                        batch.append(buffer.popitem(last=False))
+                    if not await self._upsert(table, [row for _, row in batch]):
+                        # Put the batch back unless newer versions arrived meanwhile
+                        for key, row in reversed(batch):
+                            if key not in buffer:
+                                buffer[key] = row
+                                buffer.move_to_end(key, last=False)
+                        break
+
+    async def _upsert(self, table: str, rows: List[dict]) -> bool:
+        params = {"on_conflict": ",".join(PERSIST_TABLES[table])}
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await self.client().post(f"/{table}", params=params, json=rows)
+                if response.status_code < 300:
+                    self.rows_written += len(rows)
+                    return True
+                if response.status_code != 429 and response.status_code < 500:
+                    # The rows themselves are rejected; retrying will not help
+                    print(f"❌ Dropping {len(rows)} {table} rows: HTTP {response.status_code} {response.text[:200]}")
+                    self.rows_dropped += len(rows)
+                    return True
+                error = f"HTTP {response.status_code}"
+            except httpx.HTTPError as e:
+                error = str(e) or type(e).__name__
+            if attempt < self.max_retries:
+                await asyncio.sleep(min(5.0, 0.2 * 2 ** attempt) * random.uniform(0.5, 1.0))
+        print(f"⚠️ Could not persist {len(rows)} {table} rows ({error}), keeping them buffered")
+        self.failed_batches += 1
+        return False
+
+    async def close(self):
+        await self.flush()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def utc_timestamp() -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+
+
+result_writer = ResultWriter()
+metrics.describe("result_rows_buffered", "Result rows waiting to be written to the database")
+metrics.set_gauge("result_rows_buffered", lambda: result_writer.buffered)
+
+
+async def close_result_writer():
+    await result_writer.close()
+
+
+# TTS audio cache
+# Most of what the agent says is shared across candidates (template and default
+# questions, greeting wording), so synthesized audio is cached per process,
+# keyed by (text, language, voice).
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", "")
+TTS_VOICE = os.getenv("TTS_VOICE", "default")
+PROMPT_TEMPLATES_FILE = os.getenv("PROMPT_TEMPLATES_FILE", "")
+
+# Default questions that do not depend on the candidate or job
+GENERIC_DEFAULT_QUESTIONS = [
+    "Describe a challenging project you worked on",
+    "What are your greatest strengths?",
+    "Do you have any questions for us?"
+]
+
+
+def question_text(question) -> str:
+    """Spoken text of a template question (plain string or {"question": ...} object)"""
+    if isinstance(question, Mapping):
+        return question.get("question", "")
+    return str(question)
+
+
+class TextToSpeech(ABC):
+    """Pluggable text-to-speech backend used by TTSCache"""
+
+    @abstractmethod
+    async def synthesize(self, text: str, language: str, voice: str) -> bytes:
+        ...
+
+
+class SilentTTSStandIn(TextToSpeech):
+    """Offline stand-in that returns 16 kHz mono silence sized to the text"""
+
+    async def synthesize(self, text: str, language: str, voice: str) -> bytes:
+        return bytes(2 * 16000 * max(1, len(text.split())) // 3)
+
+
+class TTSCache:
+    """Byte-budgeted LRU of synthesized audio with an optional on-disk tier.
+
+    Entries are evicted least recently used first once ``max_bytes`` is
+    exceeded. With ``disk_dir`` set, every synthesis is also written to disk
+    and memory misses are served from a read-only memory map of that file.
+    Concurrent requests for the same phrase share one synthesis.
+    """
+
+    def __init__(self, engine: Optional[TextToSpeech] = None, max_bytes: int = TTS_CACHE_MAX_BYTES, disk_dir: str = TTS_CACHE_DIR):
+        self.engine = engine
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self._entries: "OrderedDict[tuple, Any]" = OrderedDict()
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+        self.size_bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, text: str, language: str, voice: str = TTS_VOICE):
+        """Return audio for text, synthesizing it at most once per process"""
+        if self.engine is None or not text:
+            return None
+        key = (text, language, voice)
+        audio = self._entries.get(key)
+        if audio is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return audio
+        if key in self._inflight:
+            return await asyncio.shield(self._inflight[key])
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            audio = self._load_from_disk(key)
+            if audio is not None:
+                self.disk_hits += 1
+            else:
+                self.misses += 1
+                audio = await self.engine.synthesize(text, language, voice)
+                if self.disk_dir:
+                    await asyncio.get_running_loop().run_in_executor(None, self._write_to_disk, key, audio)
+            self._store(key, audio)
+            future.set_result(audio)
+            return audio
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so a failure nobody else awaited is not logged as unhandled
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    async def prewarm(self, texts, language: str, voice: str = TTS_VOICE, concurrency: int = 4) -> int:
+        """Synthesize phrases ahead of time; returns how many were requested"""
+        if self.engine is None:
+            return 0
+        semaphore = asyncio.Semaphore(concurrency)
+        unique = [t for t in dict.fromkeys(texts) if t]
+
+        async def _warm(text: str):
+            async with semaphore:
+                try:
+                    await self.get(text, language, voice)
+                except Exception as e:
+                    print(f"⚠️ TTS prewarm failed for '{text[:40]}': {str(e)}")
+
+        await asyncio.gather(*(_warm(t) for t in unique))
+        return len(unique)
+
+    def _store(self, key: tuple, audio):
+        size = len(audio)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = audio
+        self.size_bytes += size
+        while self.size_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size_bytes -= len(evicted)
+
+    def _disk_path(self, key: tuple) -> str:
+        text, language, voice = key
+        digest = hashlib.sha1(f"{language}\0{voice}\0{text}".encode()).hexdigest()
+        return os.path.join(self.disk_dir, f"{digest}.pcm")
+
+    def _load_from_disk(self, key: tuple):
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._disk_path(key), "rb") as f:
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            # ValueError: empty file cannot be mapped
+            return None
+
+    def _write_to_disk(self, key: tuple, audio: bytes):
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(audio)
+        os.replace(tmp_path, path)
+
+
+tts_cache = TTSCache()
+
+
+def template_phrases(prompt_text: dict) -> List[str]:
+    """Phrases in a prompt template that are spoken verbatim to every candidate"""
+    phrases = [question_text(q) for key in ("technical_questions", "default_questions")
+               for q in (prompt_text.get(key) or [])]
+    for key in ("positive_feedback", "neutral_feedback", "encouragement"):
+        phrases.extend(p for p in (prompt_text.get(key) or []) if isinstance(p, str))
+    if isinstance(prompt_text.get("closing_message"), str):
+        phrases.append(prompt_text["closing_message"])
+    return phrases
+
+
+async def prewarm_tts_cache():
+    """Synthesize default and template phrases in the background at startup"""
+    if tts_cache.engine is None:
+        return
+    phrases = list(GENERIC_DEFAULT_QUESTIONS)
+    if PROMPT_TEMPLATES_FILE:
+        # JSON list of prompt_text objects (or templates with a prompt_text field)
+        with open(PROMPT_TEMPLATES_FILE) as f:
+            for template in json.load(f):
+                prompt_text = template.get("prompt_text", template)
+                if isinstance(prompt_text, str):
+                    prompt_text = json.loads(prompt_text)
+                phrases.extend(template_phrases(prompt_text))
+    asyncio.create_task(tts_cache.prewarm(phrases, os.getenv("TTS_PREWARM_LANGUAGE", "en")))
+
+
+# Job profiles
+# Job, prompt template and interview settings are the same for every candidate
+# of a job, so agents share one immutable JobProfile per distinct set of values
+# instead of each keeping its own copy. Profiles are interned by a digest of
+# their content and freed once no session references them.
+def freeze(value):
+    """Read-only copy of JSON-like data (dicts become mapping proxies, lists tuples)"""
+    if isinstance(value, Mapping):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+class JobProfile:
+    """Immutable job/template/settings data shared by all sessions of a job"""
+    __slots__ = ("job_id", "job_title", "job_description", "job_department",
+                 "interview_mode", "interview_language", "interview_duration",
+                 "questions_count", "difficulty_level", "prompt_text", "agent_prompt",
+                 "prompt_template_name", "prompt_template_version", "tts_voice",
+                 "wire_format", "prompt_digest", "__weakref__")
+
+    # interview_data key -> (attribute, default)
+    FIELDS = {
+        "jobTitle": ("job_title", ""),
+        "jobDescription": ("job_description", ""),
+        "jobDepartment": ("job_department", ""),
+        "interviewMode": ("interview_mode", "video"),
+        "interviewLanguage": ("interview_language", "en"),
+        "interviewDuration": ("interview_duration", 30),
+        "questionsCount": ("questions_count", 5),
+        "difficultyLevel": ("difficulty_level", "medium"),
+        "promptText": ("prompt_text", {}),
+        "agentPrompt": ("agent_prompt", {}),
+        "promptTemplateName": ("prompt_template_name", ""),
+        "promptTemplateVersion": ("prompt_template_version", ""),
+        "ttsVoice": ("tts_voice", TTS_VOICE),
+        "wireFormat": ("wire_format", "json"),
+    }
+
+    def __init__(self, job_id: str, values: dict):
+        object.__setattr__(self, "job_id", job_id)
+        for attribute, value in values.items():
+            object.__setattr__(self, attribute, freeze(value))
+        # Identifies the template content, which callers may send without a version
+        prompt = json.dumps(values.get("prompt_text", {}), sort_keys=True, separators=(",", ":"), default=str)
+        object.__setattr__(self, "prompt_digest", hashlib.blake2b(prompt.encode(), digest_size=8).hexdigest())
+
+    def __setattr__(self, name, value):
+        raise AttributeError("JobProfile is immutable")
+
+
+class JobProfileRegistry:
+    """Interns JobProfiles so equal job data maps to one shared object"""
+
+    def __init__(self):
+        self._profiles: "weakref.WeakValueDictionary[bytes, JobProfile]" = weakref.WeakValueDictionary()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._profiles)
+
+    def intern(self, job_id: str, interview_data: dict) -> JobProfile:
+        values = {attribute: interview_data.get(key, default)
+                  for key, (attribute, default) in JobProfile.FIELDS.items()}
+        canonical = json.dumps([job_id, values], sort_keys=True, separators=(",", ":"), default=str)
+        key = hashlib.blake2b(canonical.encode(), digest_size=16).digest()
+        profile = self._profiles.get(key)
+        if profile is not None:
+            self.hits += 1
+            return profile
+        self.misses += 1
+        profile = self._profiles[key] = JobProfile(job_id, values)
+        return profile
+
+
+job_profiles = JobProfileRegistry()
+metrics.describe("job_profiles_interned", "Distinct shared job profiles referenced by sessions")
+metrics.set_gauge("job_profiles_interned", lambda: len(job_profiles))
+
+
+# Question scheduling
+# Interviews should end within interviewDuration so agent capacity frees up on
+# a predictable schedule. Before each question the scheduler compares the time
+# left with the projected cost of the remaining questions: each costs its
+# expected answer time scaled by how fast this candidate has actually answered,
+# plus the observed per-question overhead (speaking, scoring, feedback). When
+# running behind, the most important questions go first and the least important
+# are skipped. Answer timeouts follow the same projection. Follow-ups from the
+# template pool replace planned questions whose difficulty is further from the
+# level the candidate's scores show.
+QUESTION_DEFAULT_SECONDS = float(os.getenv("QUESTION_DEFAULT_SECONDS", "60"))
+QUESTION_OVERHEAD_SECONDS = float(os.getenv("QUESTION_OVERHEAD_SECONDS", "5"))
+QUESTION_MIN_TIMEOUT = float(os.getenv("QUESTION_MIN_TIMEOUT", "15"))
+QUESTION_MAX_TIMEOUT = float(os.getenv("QUESTION_MAX_TIMEOUT", "180"))
+# Answer timeout as a multiple of the candidate's expected answer time
+QUESTION_TIMEOUT_SLACK = 1.5
+# Weight of the newest observation in the pace/overhead/level averages
+SCHEDULE_SMOOTHING = 0.3
+
+DIFFICULTY_LEVELS = {"easy": 0, "medium": 1, "hard": 2}
+
+# Template categories that matter most when questions have to be skipped
+CATEGORY_PRIORITY = {"technical": 3, "skills": 3, "experience": 2, "introduction": 2, "motivation": 1, "goals": 1}
+
+
+class QuestionMeta(NamedTuple):
+    """Scheduling data for one template question"""
+    expected_seconds: float
+    difficulty: int
+    priority: int
+    category: str
+
+    @classmethod
+    def default(cls, difficulty: int = 1) -> "QuestionMeta":
+        return cls(QUESTION_DEFAULT_SECONDS, difficulty, 1, "")
+
+    @classmethod
+    def of(cls, question, difficulty: int = 1) -> "QuestionMeta":
+        """Read expected_duration/difficulty/priority/category from a template question"""
+        if not isinstance(question, Mapping):
+            return cls.default(difficulty)
+        category = str(question.get("category") or "")
+        try:
+            expected = float(question.get("expected_duration") or QUESTION_DEFAULT_SECONDS)
+        except (TypeError, ValueError):
+            expected = QUESTION_DEFAULT_SECONDS
+        try:
+            priority = int(question.get("priority", CATEGORY_PRIORITY.get(category, 1)))
+        except (TypeError, ValueError):
+            priority = CATEGORY_PRIORITY.get(category, 1)
+        level = DIFFICULTY_LEVELS.get(question.get("difficulty"), difficulty)
+        return cls(max(expected, 1.0), level, priority, category)
+
+
+class QuestionScheduler:
+    """Picks the next question and its answer timeout for one interview.
+
+    Questions are referred to by their index in the plan (planned questions
+    first, then the follow-up pool), which is also what the journal records.
+    """
+
+    def __init__(self, questions: List[str], meta: tuple, count: int, budget: float, difficulty: str = "medium"):
+        self.questions = questions
+        self.meta = meta
+        self.target = count
+        self.queue = list(range(count))
+        self.pool = list(range(count, len(questions)))
+        self.asked: List[int] = []
+        self.skipped: List[int] = []
+        self.swapped = 0
+        self.budget = budget
+        self.level = float(DIFFICULTY_LEVELS.get(difficulty, 1))
+        self.pace = 1.0
+        self.overhead = QUESTION_OVERHEAD_SECONDS
+        self.deadline = None
+        self.behind = False
+
+    def planned(self) -> List[str]:
+        return self.questions[:self.target]
+
+    def start(self, now: float, done: List[int] = ()):
+        """Start the clock; ``done`` are questions already asked before a restart"""
+        # A question asked again after an earlier restart is journaled twice
+        for index in dict.fromkeys(done):
+            if index in self.queue:
+                self.queue.remove(index)
+            elif index in self.pool:
+                self.pool.remove(index)
+            self.asked.append(index)
+        # A resumed interview gets the share of the budget left for its questions
+        share = len(self.queue) / self.target if self.target else 0.0
+        self.deadline = now + self.budget * share
+
+    def cost(self, index: int) -> float:
+        return self.overhead + self.meta[index].expected_seconds * self.pace
+
+    def next(self, now: float) -> Optional[int]:
+        """Index of the question to ask next, or None when the interview is done"""
+        remaining = self.deadline - now
+        if self.queue and remaining < QUESTION_MIN_TIMEOUT:
+            self.skipped.extend(self.queue)
+            self.queue.clear()
+        if not self.queue:
+            return None
+        self._fit(remaining)
+        return self._adapt(remaining)
+
+    def peek(self) -> Optional[int]:
+        """Likely next question, for preparing it ahead of time"""
+        return self.queue[0] if self.queue else None
+
+    def _fit(self, remaining: float):
+        projected = sum(self.cost(i) for i in self.queue)
+        self.behind = projected > remaining
+        if not self.behind:
+            return
+        # Most important first (template order breaks ties); drop from the end until it fits
+        self.queue.sort(key=lambda i: (-self.meta[i].priority, i))
+        while len(self.queue) > 1 and projected > remaining:
+            dropped = self.queue.pop()
+            projected -= self.cost(dropped)
+            self.skipped.append(dropped)
+
+    def _adapt(self, remaining: float) -> int:
+        index = self.queue[0]
+        want = round(self.level)
+        gap = abs(self.meta[index].difficulty - want)
+        if gap == 0 or not self.pool:
+            return index
+        # A follow-up must cover the same category and still fit the time left
+        available = remaining - sum(self.cost(i) for i in self.queue[1:])
+        category = self.meta[index].category
+        best = None
+        for candidate in self.pool:
+            meta = self.meta[candidate]
+            if meta.category != category or self.cost(candidate) > available:
+                continue
+            candidate_gap = abs(meta.difficulty - want)
+            if candidate_gap < gap:
+                best, gap = candidate, candidate_gap
+        if best is None:
+            return index
+        self.pool.remove(best)
+        self.pool.append(index)
+        self.queue[0] = best
+        self.swapped += 1
+        return best
+
+    def begin(self, index: int, now: float) -> float:
+        """Mark a question asked and return how long to wait for its answer"""
+        if index in self.queue:
+            self.queue.remove(index)
+        self.asked.append(index)
+        expected = self.meta[index].expected_seconds * self.pace * QUESTION_TIMEOUT_SLACK
+        # Never eat into the time the remaining questions need
+        available = self.deadline - now - self.overhead - sum(self.cost(i) for i in self.queue)
+        return max(QUESTION_MIN_TIMEOUT, min(expected, QUESTION_MAX_TIMEOUT, available))
+
+    def record(self, index: int, answer_seconds: Optional[float], total_seconds: float, score: Optional[float] = None):
+        """Fold one finished question into the pace, overhead and level estimates.
+
+        ``answer_seconds`` is None when the candidate did not answer in time,
+        which says nothing about how long their answers take.
+        """
+        waited = answer_seconds if answer_seconds is not None else 0.0
+        self.overhead += SCHEDULE_SMOOTHING * (max(0.0, total_seconds - waited) - self.overhead)
+        if answer_seconds is not None:
+            ratio = answer_seconds / self.meta[index].expected_seconds
+            self.pace += SCHEDULE_SMOOTHING * (ratio - self.pace)
+        if score is not None:
+            # Strong answers move towards harder follow-ups, weak ones towards easier
+            shift = 1.0 if score >= 7.5 else -1.0 if score <= 4.0 else 0.0
+            target = self.meta[index].difficulty + shift
+            self.level = min(2.0, max(0.0, self.level + SCHEDULE_SMOOTHING * (target - self.level)))
+
+    def progress(self) -> float:
+        if not self.target:
+            return 100.0
+        return min(100.0, (len(self.asked) + len(self.skipped)) / self.target * 100)
+
+
+# Question plans
+# The question list for a (job, template version and content, language,
+# difficulty, count) is compiled once and shared; per candidate only the
+# placeholders are filled.
+QUESTION_PLAN_CACHE_SIZE = int(os.getenv("QUESTION_PLAN_CACHE_SIZE", "512"))
+
+# Placeholders allowed in question text; anything else in braces is left alone
+QUESTION_PLACEHOLDER = re.compile(r"\{(candidateName|jobTitle|jobDepartment)\}")
+
+
+class QuestionPlan:
+    """Precompiled questions: literal text interleaved with placeholder names.
+
+    Holds every template question with its scheduling metadata; the first
+    ``count`` are the planned interview and the rest the follow-up pool.
+    """
+    __slots__ = ("questions", "meta", "count")
+
+    def __init__(self, questions: List[str], meta: List["QuestionMeta"] = None, count: int = None):
+        compiled = []
+        for text in questions:
+            pieces = QUESTION_PLACEHOLDER.split(text)
+            # Static questions render to the same shared string
+            compiled.append(text if len(pieces) == 1 else tuple(pieces))
+        self.questions = tuple(compiled)
+        self.meta = tuple(meta) if meta is not None else tuple(QuestionMeta.default() for _ in compiled)
+        self.count = len(compiled) if count is None else min(count, len(compiled))
+
+    def render(self, fields: Dict[str, str]) -> List[str]:
+        """All questions (planned then pool) with placeholders filled"""
+        rendered = []
+        for question in self.questions:
+            if isinstance(question, str):
+                rendered.append(question)
+            else:
+                # split() puts placeholder names at odd indexes
+                rendered.append("".join(fields.get(piece, "") if i % 2 else piece for i, piece in enumerate(question)))
+        return rendered
+
+
+def compile_question_plan(prompt_text: dict, questions_count: int, difficulty: str = "medium") -> QuestionPlan:
+    """Build the question plan for a prompt template (or the defaults without one)"""
+    template_questions = []
+    
+    # Get questions from prompt_text JSONB
+    if prompt_text:
+        # Technical questions
+        if prompt_text.get('technical_questions'):
+            template_questions.extend(prompt_text['technical_questions'])
+        
+        # Default questions
+        if prompt_text.get('default_questions'):
+            template_questions.extend(prompt_text['default_questions'])
     
-    # Interview Settings
-    interviewMode: str = "video"
-    interviewLanguage: str = "en"
-    interviewDuration: int = 30
-    questionsCount: int = 5
-    difficultyLevel: str = "medium"
-    interviewDate: str = None
-    interviewTime: str = None
+    # If no questions in template, use default based on job
+    if not template_questions:
+        template_questions = [
+            "Hello {candidateName}, tell me about yourself and your background",
+            "Why are you interested in the {jobTitle} position?",
+            "What relevant experience do you have for this {jobDepartment} role?",
+            *GENERIC_DEFAULT_QUESTIONS
+        ]
     
-    # Agent/Prompt Template Details
-    agentId: str = None
-    agentPrompt: dict = {}
-    promptTemplateName: str = ""
-    promptTemplateDescription: str = ""
-    promptTemplateCategory: str = "technical"
-    promptTemplateLevel: str = "mid"
-    promptTemplateDuration: int = 45
-    promptText: dict = {}
+    # The first questions_count are planned; the rest stay available as follow-ups
+    level = DIFFICULTY_LEVELS.get(difficulty, 1)
+    return QuestionPlan(
+        [question_text(q) for q in template_questions],
+        [QuestionMeta.of(q, level) for q in template_questions],
+        questions_count
+    )
 
-# FastAPI App
-app = FastAPI(title="AI Interview Agent Backend")
 
-# CORS middleware for frontend communication
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:3000"],  # Your frontend URL
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+class QuestionPlanCache:
+    """LRU of compiled question plans.
 
-# Global variables to track active interviews
-active_interviews: Dict[str, Any] = {}
+    Keys are (jobId, template name, template version, promptText digest,
+    language, difficulty, questionsCount). Compiling a new version of a
+    job's template drops the plans built from its older versions. Plans
+    without a version are told apart by content only and never evict each
+    other; they age out of the LRU. ``invalidate`` drops plans on demand.
+    """
 
-@app.post("/agent/join")
-async def agent_join(request: AgentJoinRequest):
-    """Endpoint for agent to join interview with complete details"""
-    try:
-        print(f"🤖 Agent join request received")
-        print(f"📋 Room: {request.roomName}")
-        print(f"👤 Candidate: {request.candidateName} ({request.candidateId})")
-        print(f"💼 Job: {request.jobTitle} ({request.jobId})")
-        print(f"🤖 Agent ID: {request.agentId}")
-        
-        # Create and start AI agent with complete interview data
-        interview_data = {
-            'candidateName': request.candidateName,
-            'candidateEmail': request.candidateEmail,
-            'candidateSkills': request.candidateSkills,
-            'candidateExperience': request.candidateExperience,
-            'candidateProjects': request.candidateProjects,
-            'jobTitle': request.jobTitle,
-            'jobDescription': request.jobDescription,
-            'jobDepartment': request.jobDepartment,
-            'interviewMode': request.interviewMode,
-            'interviewLanguage': request.interviewLanguage,
-            'interviewDuration': request.interviewDuration,
-            'questionsCount': request.questionsCount,
-            'difficultyLevel': request.difficultyLevel,
-            'promptText': request.promptText,
-            'agentPrompt': request.agentPrompt,
-            'promptTemplateName': request.promptTemplateName
-        }
-        
-        # Note: You'll need to generate agent_token and get livekit_url from your config
-        # For now, using placeholders - update these based on your setup
-        agent = AIInterviewAgent(
-            room_name=request.roomName,
-            agent_token="",  # Generate from LiveKit
-            candidate_id=request.candidateId,
-            job_id=request.jobId,
-            livekit_url="",  # Get from config
-            interview_data=interview_data
-        )
-        
-        # Start agent in background
-        asyncio.create_task(agent.start_interview())
-        
-        # Store agent reference
-        active_interviews[request.candidateId] = agent
-        
-        return {
-            "success": True,
-            "message": "Agent join request received",
-            "sessionId": request.sessionId,
-            "roomName": request.roomName,
-            "agentStatus": "connecting"
-        }
-        
-    except Exception as e:
-        print(f"❌ Error in agent join: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    def __init__(self, max_entries: int = QUESTION_PLAN_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._plans: "OrderedDict[tuple, QuestionPlan]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
 
-@app.post("/start-interview")
-async def start_interview(request: InterviewRequest):
-    """Main endpoint called by frontend to start AI interview"""
-    try:
-        print(f"🚀 Starting interview for candidate: {request.candidateId}")
-        print(f"📋 Job ID: {request.jobId}")
-        print(f"🏠 Room: {request.roomName}")
-        
-        # Create and start AI agent
-        agent = AIInterviewAgent(
-            room_name=request.roomName,
-            agent_token=request.agentToken,
-            candidate_id=request.candidateId,
-            job_id=request.jobId,
-            livekit_url=request.livekitUrl
-        )
-        
-        # Start agent in background
-        asyncio.create_task(agent.start_interview())
-        
-        # Store agent reference
-        active_interviews[request.candidateId] = agent
-        
-        return {
-            "success": True,
-            "message": "AI agent started successfully",
-            "roomName": request.roomName,
-            "candidateId": request.candidateId,
-            "jobId": request.jobId,
-            "agentStatus": "connecting"
-        }
-        
-    except Exception as e:
-        print(f"❌ Error starting interview: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    def __len__(self) -> int:
+        return len(self._plans)
 
-@app.get("/interview-status/{candidate_id}")
-async def get_interview_status(candidate_id: str):
-    """Get current interview status"""
-    if candidate_id in active_interviews:
-        agent = active_interviews[candidate_id]
-        return {
-            "status": "active",
-            "candidateId": candidate_id,
-            "agentConnected": agent.is_connected,
-            "currentQuestion": agent.current_question,
-            "interviewProgress": agent.progress
+    @staticmethod
+    def plan_key(job_id: str, template_name: str, template_version: str, prompt_digest: str,
+                 language: str, difficulty: str, questions_count: int) -> tuple:
+        return (job_id, template_name, template_version, prompt_digest, language, difficulty, questions_count)
+
+    def get(self, key: tuple) -> Optional[QuestionPlan]:
+        plan = self._plans.get(key)
+        if plan is None:
+            self.misses += 1
+            return None
+        self._plans.move_to_end(key)
+        self.hits += 1
+        return plan
+
+    def put(self, key: tuple, plan: QuestionPlan):
+        job_id, template_name, template_version = key[:3]
+        if template_version:
+            stale = [k for k in self._plans
+                     if k[0] == job_id and k[1] == template_name and k[2] and k[2] != template_version]
+            for k in stale:
+                del self._plans[k]
+        self._plans[key] = plan
+        while len(self._plans) > self.max_entries:
+            self._plans.popitem(last=False)
+
+    def invalidate(self, job_id: Optional[str] = None, template_name: Optional[str] = None) -> int:
+        """Drop plans for a job and/or template; with no filters drop everything"""
+        stale = [k for k in self._plans
+                 if (job_id is None or k[0] == job_id) and (template_name is None or k[1] == template_name)]
+        for k in stale:
+            del self._plans[k]
+        return len(stale)
+
+
+question_plans = QuestionPlanCache()
+
+
+class QuestionPlanInvalidation(BaseModel):
+    jobId: str = None
+    promptTemplateName: str = None
+
+
+@app.post("/question-plans/invalidate")
+async def invalidate_question_plans(request: QuestionPlanInvalidation):
+    """Call after editing a prompt template or job so new joins recompile"""
+    dropped = question_plans.invalidate(request.jobId, request.promptTemplateName)
+    return {"success": True, "dropped": dropped}
+
+
+# Data channel wire format
+# JSON (one message per packet) stays the default for older frontends. The
+# binary format is versioned and schema-tagged, and a packet may carry several
+# messages issued within a short coalescing window:
+#
+#   header: magic (B) | version (B) | record count (B) | base timestamp ms (Q)
+#   record: schema tag (B) | timestamp delta ms (I) | schema fields
+#
+# Strings are a uint16 length followed by UTF-8; scores are uint16 hundredths.
+# Messages that do not fit a schema exactly are sent as a JSON record, and a
+# message with text too long for any record (over 64 KB) as a JSON packet.
+WIRE_MAGIC = 0xA7
+WIRE_VERSION = 1
+WIRE_HEADER = struct.Struct("!BBBQ")
+WIRE_RECORD = struct.Struct("!BI")
+WIRE_U16 = struct.Struct("!H")
+WIRE_MAX_STR_BYTES = 0xFFFF
+WIRE_MAX_RECORDS = 255
+WIRE_MAX_PACKET_BYTES = 14 * 1024
+DATA_COALESCE_WINDOW = float(os.getenv("DATA_COALESCE_WINDOW", "0.015"))
+
+SCHEMA_JSON = 0
+SCHEMA_QUESTION = 1
+SCHEMA_FEEDBACK = 2
+SCHEMA_INTERVIEW_COMPLETE = 3
+
+# message type -> (schema tag, keys it carries besides type/timestamp)
+WIRE_SCHEMAS = {
+    "question": (SCHEMA_QUESTION, {"question", "agent"}),
+    "feedback": (SCHEMA_FEEDBACK, {"message", "score"}),
+    "interview_complete": (SCHEMA_INTERVIEW_COMPLETE, {"final_score", "total_questions"}),
+}
+
+
+def _pack_str(text: str) -> Optional[bytes]:
+    """Length-prefixed UTF-8, or None when the text is too long for the prefix"""
+    data = text.encode()
+    if len(data) > WIRE_MAX_STR_BYTES:
+        return None
+    return WIRE_U16.pack(len(data)) + data
+
+
+def _unpack_str(buf: bytes, offset: int):
+    (length,) = WIRE_U16.unpack_from(buf, offset)
+    offset += WIRE_U16.size
+    return buf[offset:offset + length].decode(), offset + length
+
+
+def _centi(value) -> Optional[int]:
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and 0 <= value <= 655.35:
+        return round(value * 100)
+    return None
+
+
+def _encode_fields(message: dict) -> Optional[tuple]:
+    """Pick the record schema for a message and pack its fields (None if no record can hold it)"""
+    schema = WIRE_SCHEMAS.get(message.get("type"))
+    if schema is not None and set(message) - {"type", "timestamp"} == schema[1]:
+        tag = schema[0]
+        if tag == SCHEMA_QUESTION and isinstance(message["question"], str) and message["agent"] == "ai-interviewer":
+            question = _pack_str(message["question"])
+            if question is not None:
+                return tag, question
+        if tag == SCHEMA_FEEDBACK and isinstance(message["message"], str) and _centi(message["score"]) is not None:
+            text = _pack_str(message["message"])
+            if text is not None:
+                return tag, WIRE_U16.pack(_centi(message["score"])) + text
+        if (tag == SCHEMA_INTERVIEW_COMPLETE and _centi(message["final_score"]) is not None
+                and isinstance(message["total_questions"], int) and 0 <= message["total_questions"] <= 0xFFFF):
+            return tag, WIRE_U16.pack(_centi(message["final_score"])) + WIRE_U16.pack(message["total_questions"])
+    payload = _pack_str(json.dumps({k: v for k, v in message.items() if k != "timestamp"}, separators=(",", ":")))
+    return (SCHEMA_JSON, payload) if payload is not None else None
+
+
+def _frame_records(records: List[tuple]) -> bytes:
+    """One binary packet from up to 255 (message, (tag, fields)) pairs"""
+    now_ms = int(time.time() * 1000)
+    stamps = [int(message.get("timestamp", now_ms / 1000) * 1000) for message, _ in records]
+    base = min(stamps)
+    parts = [WIRE_HEADER.pack(WIRE_MAGIC, WIRE_VERSION, len(records), base)]
+    for (_, (tag, fields)), stamp in zip(records, stamps):
+        parts.append(WIRE_RECORD.pack(tag, stamp - base))
+        parts.append(fields)
+    return b"".join(parts)
+
+
+def encode_packets(messages: List[dict]) -> List[bytes]:
+    """Packets for a batch of messages in order.
+
+    Consecutive messages share a binary frame; one with text too long for a
+    record goes on its own as a JSON packet, which every client can decode.
+    """
+    packets = []
+    run = []
+    for message in messages:
+        encoded = _encode_fields(message)
+        if encoded is not None:
+            run.append((message, encoded))
+            continue
+        if run:
+            packets.append(_frame_records(run))
+            run = []
+        packets.append(json.dumps(message).encode())
+    if run:
+        packets.append(_frame_records(run))
+    return packets
+
+
+def decode_frame(data: bytes) -> List[dict]:
+    """Decode a data packet in either wire format into message dicts"""
+    data = bytes(data)
+    if not data or data[0] != WIRE_MAGIC:
+        return [json.loads(data.decode())]
+    magic, version, count, base = WIRE_HEADER.unpack_from(data, 0)
+    if version != WIRE_VERSION:
+        raise ValueError(f"Unsupported wire version {version}")
+    offset = WIRE_HEADER.size
+    messages = []
+    for _ in range(count):
+        tag, delta = WIRE_RECORD.unpack_from(data, offset)
+        offset += WIRE_RECORD.size
+        timestamp = (base + delta) / 1000
+        if tag == SCHEMA_QUESTION:
+            question, offset = _unpack_str(data, offset)
+            message = {"type": "question", "question": question, "agent": "ai-interviewer"}
+        elif tag == SCHEMA_FEEDBACK:
+            (score,) = WIRE_U16.unpack_from(data, offset)
+            text, offset = _unpack_str(data, offset + WIRE_U16.size)
+            message = {"type": "feedback", "message": text, "score": score / 100}
+        elif tag == SCHEMA_INTERVIEW_COMPLETE:
+            score, total = struct.unpack_from("!HH", data, offset)
+            offset += 4
+            message = {"type": "interview_complete", "final_score": score / 100, "total_questions": total}
+        elif tag == SCHEMA_JSON:
+            text, offset = _unpack_str(data, offset)
+            message = json.loads(text)
+        else:
+            raise ValueError(f"Unknown wire schema {tag}")
+        message["timestamp"] = timestamp
+        messages.append(message)
+    return messages
+
+
+class DataSender:
+    """Publishes agent messages on the data channel.
+
+    In JSON mode every message is its own packet, exactly as before. In
+    binary mode messages are buffered for ``window`` seconds and sent as one
+    frame; ``send(..., wait=False)`` lets a message ride along with whatever
+    is sent next (e.g. feedback followed by the next question).
+    """
+
+    def __init__(self, publish, wire_format: str = "json", window: float = DATA_COALESCE_WINDOW):
+        self.publish = publish
+        self.binary = wire_format == "binary"
+        self.window = window
+        self._buffer: List[dict] = []
+        self._buffer_bytes = 0
+        self._waiters: List[asyncio.Future] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flush_lock = asyncio.Lock()
+        self.packets = 0
+        self.bytes_sent = 0
+
+    async def send(self, message: dict, wait: bool = True):
+        if not self.binary:
+            payload = json.dumps(message).encode()
+            await self.publish(payload)
+            self.packets += 1
+            self.bytes_sent += len(payload)
+            return
+
+        self._buffer.append(message)
+        # Rough size estimate keeps frames under the data channel packet limit
+        self._buffer_bytes += 64 + sum(len(v) for v in message.values() if isinstance(v, str))
+        if len(self._buffer) >= WIRE_MAX_RECORDS or self._buffer_bytes >= WIRE_MAX_PACKET_BYTES:
+            await self.flush()
+            return
+        if self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window, lambda: asyncio.ensure_future(self.flush()))
+        if wait:
+            future = asyncio.get_running_loop().create_future()
+            self._waiters.append(future)
+            await future
+
+    async def flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        async with self._flush_lock:
+            messages, self._buffer = self._buffer, []
+            waiters, self._waiters = self._waiters, []
+            self._buffer_bytes = 0
+            if not messages:
+                return
+            try:
+                for payload in encode_packets(messages):
+                    await self.publish(payload)
+                    self.packets += 1
+                    self.bytes_sent += len(payload)
+            except Exception as e:
+                for future in waiters:
+                    if not future.done():
+                        future.set_exception(e)
+                if not waiters:
+                    print(f"⚠️ Data packet dropped: {str(e)}")
+                return
+            for future in waiters:
+                if not future.done():
+                    future.set_result(None)
+
+
+# Data channel receive pipeline
+# Room callbacks only decode and enqueue; one consumer task per session runs the
+# handlers. High-rate message types keep just their latest value, so a chatty
+# client can fill at most its own bounded queue.
+RECEIVE_QUEUE_SIZE = int(os.getenv("RECEIVE_QUEUE_SIZE", "256"))
+RECEIVE_MAX_PACKET_BYTES = 64 * 1024
+COALESCED_MESSAGE_TYPES = frozenset({"typing", "heartbeat", "ping", "audio_level"})
+
+
+class ReceivePipeline:
+    """Bounded, type-dispatched inbound message queue for one session"""
+
+    def __init__(self, handlers: Dict[str, Callable], max_queue: int = RECEIVE_QUEUE_SIZE):
+        self.handlers = handlers
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        # Latest pending message per coalesced type; the queue holds only the type
+        self._latest: Dict[str, dict] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.counters = {
+            "received": 0,
+            "malformed": 0,
+            "oversized": 0,
+            "dropped": 0,
+            "coalesced": 0,
+            "unhandled": 0,
+            "handler_errors": 0
         }
-    return {"status": "not_found"}
 
-@app.delete("/end-interview/{candidate_id}")
-async def end_interview(candidate_id: str):
-    """End interview session"""
-    if candidate_id in active_interviews:
-        agent = active_interviews[candidate_id]
-        await agent.end_interview()
-        del active_interviews[candidate_id]
-        return {"success": True, "message": "Interview ended"}
-    return {"success": False, "message": "Interview not found"}
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def submit(self, payload: bytes):
+        """Decode a packet and queue its messages; never blocks"""
+        self.counters["received"] += 1
+        if len(payload) > RECEIVE_MAX_PACKET_BYTES:
+            self.counters["oversized"] += 1
+            return
+        try:
+            messages = decode_frame(payload)
+        except Exception:
+            self.counters["malformed"] += 1
+            return
+        for message in messages:
+            msg_type = message.get("type") if isinstance(message, dict) else None
+            if not isinstance(msg_type, str):
+                self.counters["malformed"] += 1
+            elif msg_type not in self.handlers:
+                self.counters["unhandled"] += 1
+            elif msg_type in COALESCED_MESSAGE_TYPES:
+                pending = msg_type in self._latest
+                self._latest[msg_type] = message
+                if pending:
+                    self.counters["coalesced"] += 1
+                elif not self._offer((msg_type, None)):
+                    del self._latest[msg_type]
+            else:
+                self._offer((msg_type, message))
+
+    def _offer(self, item) -> bool:
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except asyncio.QueueFull:
+            self.counters["dropped"] += 1
+            return False
+
+    async def _run(self):
+        while True:
+            msg_type, message = await self._queue.get()
+            if message is None:
+                message = self._latest.pop(msg_type)
+            try:
+                await self.handlers[msg_type](message)
+            except Exception as e:
+                self.counters["handler_errors"] += 1
+                print(f"⚠️ Error handling '{msg_type}' message: {str(e)}")
+
+
+# Factory for the agent's room connection (None = livekit rtc.Room). Benchmarks and
+# offline tests swap in a fake room; only affects agents run in this process.
+room_factory: Optional[Callable[[], Any]] = None
+
+
+# Pre-warmed agent shells
+# AGENT_POOL_SIZE agents are kept constructed (room, pipelines, livekit loaded)
+# so a join only has to assign session data. Checkouts refill in the background.
+AGENT_POOL_SIZE = int(os.getenv("AGENT_POOL_SIZE", "0"))
+
+
+class AgentShellPool:
+    """Ready-made AIInterviewAgent shells for instant checkout"""
+
+    def __init__(self, size: int = AGENT_POOL_SIZE):
+        self.size = size
+        self._shells = deque()
+        self._refill_task: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._shells)
+
+    def start(self):
+        self._schedule_refill()
+
+    def checkout(self) -> "AIInterviewAgent":
+        if self._shells:
+            self.hits += 1
+            agent = self._shells.popleft()
+        else:
+            self.misses += 1
+            agent = AIInterviewAgent.create_shell()
+        self._schedule_refill()
+        return agent
+
+    def _schedule_refill(self):
+        if self.size > 0 and (self._refill_task is None or self._refill_task.done()):
+            self._refill_task = asyncio.create_task(self._refill())
+
+    async def _refill(self):
+        if room_factory is None:
+            # The first livekit import is slow; keep it off the event loop
+            await asyncio.get_running_loop().run_in_executor(None, livekit_rtc)
+        while len(self._shells) < self.size:
+            self._shells.append(AIInterviewAgent.create_shell())
+            # Yield between constructions so refills never stall live rooms
+            await asyncio.sleep(0)
+
+
+agent_shells = AgentShellPool()
+
+
+async def prewarm_agent_shells():
+    if worker_pool is None:
+        agent_shells.start()
+
 
 class AIInterviewAgent:
-    def __init__(self, room_name: str, agent_token: str, candidate_id: str, job_id: str, livekit_url: str, interview_data: dict = None):
+    # Per-session state only; job-wide data lives in the shared self.job profile
+    __slots__ = (
+        "room", "is_connected", "current_question", "progress", "questions", "responses",
+        "score_stats", "completed", "response_capture", "candidate_ready", "last_heartbeat",
+        "candidate_typing", "inbound", "journal", "session_key", "resumed", "resume_done",
+        "schedule", "recorder", "data_sender",
+        "audio_tasks", "room_name", "agent_token", "candidate_id", "job_id", "livekit_url",
+        "session_id", "candidate_name", "candidate_email", "candidate_skills",
+        "candidate_experience", "candidate_projects", "job"
+    )
+    
+    def __init__(self, room_name: str, agent_token: str, candidate_id: str, job_id: str, livekit_url: str, interview_data: dict = None, stt: SpeechToText = None):
+        self.init_shell(stt)
+        self.assign(room_name, agent_token, candidate_id, job_id, livekit_url, interview_data)
+    
+    @classmethod
+    def create_shell(cls, stt: SpeechToText = None) -> "AIInterviewAgent":
+        """Agent with its room and pipelines built but no session assigned yet"""
+        agent = cls.__new__(cls)
+        agent.init_shell(stt)
+        return agent
+    
+    def init_shell(self, stt: SpeechToText = None):
+        """Build everything that does not depend on the session"""
+        self.room = room_factory() if room_factory is not None else livekit_rtc().Room()
+        self.is_connected = False
+        self.current_question = None
+        self.progress = 0
+        self.questions = []
+        self.responses = []
+        self.score_stats = RunningStats()
+        self.completed = False
+        self.response_capture = ResponseCapture(stt)
+        self.candidate_ready = asyncio.Event()
+        self.last_heartbeat = None
+        self.candidate_typing = False
+        self.inbound = ReceivePipeline({
+            "candidate_ready": self.on_candidate_ready,
+            **{msg_type: self.on_candidate_text for msg_type in CANDIDATE_TEXT_TYPES},
+            "typing": self.on_candidate_typing,
+            "heartbeat": self.on_heartbeat,
+            "ping": self.on_heartbeat
+        })
+        self.journal = None
+        self.session_key = None
+        self.resumed = False
+        self.resume_done = []
+        self.schedule = None
+        self.recorder = None
+        self.data_sender = DataSender(self.publish_data)
+        self.audio_tasks = []
+    
+    def assign(self, room_name: str, agent_token: str, candidate_id: str, job_id: str, livekit_url: str, interview_data: dict = None):
+        """Bind the agent to one interview session"""
         self.room_name = room_name
         self.agent_token = agent_token
         self.candidate_id = candidate_id
         self.job_id = job_id
         self.livekit_url = livekit_url
         
-        # Store complete interview data
-        self.interview_data = interview_data or {}
+        interview_data = interview_data or {}
         
-        # Extract details from interview_data
+        # Only candidate details are kept per session
+        self.session_id = interview_data.get('sessionId')
         self.candidate_name = interview_data.get('candidateName', 'Candidate')
         self.candidate_email = interview_data.get('candidateEmail', '')
         self.candidate_skills = interview_data.get('candidateSkills', '')
         self.candidate_experience = interview_data.get('candidateExperience', '')
         self.candidate_projects = interview_data.get('candidateProjects', '')
         
-        self.job_title = interview_data.get('jobTitle', '')
-        self.job_description = interview_data.get('jobDescription', '')
-        self.job_department = interview_data.get('jobDepartment', '')
+        # Job, prompt template and settings are shared with every session of the job
+        self.job = job_profiles.intern(job_id, interview_data)
+        self.data_sender.binary = self.job.wire_format == "binary"
         
-        self.interview_mode = interview_data.get('interviewMode', 'video')
-        self.interview_language = interview_data.get('interviewLanguage', 'en')
-        self.interview_duration = interview_data.get('interviewDuration', 30)
-        self.questions_count = interview_data.get('questionsCount', 5)
-        self.difficulty_level = interview_data.get('difficultyLevel', 'medium')
-        
-        # Prompt template data
-        self.prompt_text = interview_data.get('promptText', {})
-        self.agent_prompt = interview_data.get('agentPrompt', {})
-        self.prompt_template_name = interview_data.get('promptTemplateName', '')
-        
-        self.room = rtc.Room()
-        self.is_connected = False
-        self.current_question = None
-        self.progress = 0
-        self.questions = []
-        self.responses = []
+    def connect_token(self) -> str:
+        """Token supplied with the request, else one minted from server config"""
+        if self.agent_token or not livekit_tokens.configured:
+            return self.agent_token
+        return livekit_tokens.token_for(self.room_name)
+    
+    def attach_journal(self, journal: Optional[SessionJournal], session_key: str, restore_state: Optional[dict] = None):
+        """Record progress to the session journal, resuming from a recovered state"""
+        self.journal = journal
+        self.session_key = session_key
+        if restore_state:
+            self.responses = list(restore_state["responses"])
+            # States journaled before "asked"/"in_flight" only have an in-order resume_index
+            resume_index = restore_state.get("resume_index", 0)
+            asked = restore_state.get("asked", range(resume_index))
+            in_flight = restore_state.get("in_flight", resume_index)
+            # The question in flight when the process stopped is asked again
+            self.resume_done = [index for index in asked if index != in_flight]
+            self.resumed = bool(asked)
+            for record in self.responses:
+                self.score_stats.add(record["analysis"]["score"])
+    
+    def journal_event(self, event: str, **fields):
+        if self.journal is not None:
+            self.journal.record({"event": event, "key": self.session_key, **fields})
+    
+    def record_event(self, event: str, **fields):
+        if self.recorder is not None:
+            self.recorder.record(event, **fields)
+    
+    def timed(self, phase: str):
+        """Phase timer for agent_phase_seconds, also recorded when the session is"""
+        timer = metrics.timer("agent_phase_seconds", phase=phase)
+        if self.recorder is None:
+            return timer
+        return RecordedPhase(timer, self.recorder, phase)
+    
+    async def publish_data(self, payload: bytes):
+        if self.recorder is not None:
+            self.recorder.record("sent", messages=decode_frame(payload))
+        await self.room.local_participant.publish_data(payload)
+    
+    def publish_status(self, **fields):
+        """Push changed status fields to /interview-events subscribers"""
+        if self.session_key is not None:
+            status_feed.publish(self.session_key, fields)
+    
+    def status_snapshot(self) -> dict:
+        """Live interview state reported by /interview-status"""
+        return {
+            "agentConnected": self.is_connected,
+            "currentQuestion": self.current_question,
+            "interviewProgress": self.progress,
+            "inboundMessages": dict(self.inbound.counters)
+        }
         
     async def start_interview(self):
         """Connect to LiveKit room and start interview"""
@@ -246,21 +3802,34 @@ class AIInterviewAgent:
             print(f"🤖 AI Agent connecting to room: {self.room_name}")
             
             # Connect to LiveKit room
-            await self.room.connect(self.livekit_url, self.agent_token)
+            with self.timed("connect"):
+                await self.room.connect(self.livekit_url or LIVEKIT_URL, self.connect_token())
             self.is_connected = True
+            self.publish_status(agentConnected=True)
+            if self.recorder is not None:
+                present = getattr(self.room, "remote_participants", None) or getattr(self.room, "participants", None)
+                self.recorder.record("connected", participants=list(present or ()))
             print(f"✅ AI Agent connected successfully!")
             
             # Enable microphone and camera
             await self.room.local_participant.set_microphone_enabled(True)
             await self.room.local_participant.set_camera_enabled(True)
             
-            # Set up event handlers
-            self.room.on("participant_connected", self.on_participant_connected)
+            # Set up event handlers (room callbacks are sync, so schedule the coroutines)
+            self.room.on("participant_connected", self._schedule(self.on_participant_connected))
             self.room.on("data_received", self.on_data_received)
-            self.room.on("track_subscribed", self.on_track_subscribed)
+            self.inbound.start()
+            self.room.on("track_subscribed", self._schedule(self.on_track_subscribed))
+            
+            # The candidate may already be in the room
+            participants = getattr(self.room, "remote_participants", None) or getattr(self.room, "participants", None)
+            if participants:
+                self.candidate_ready.set()
             
             # Load interview questions
-            self.questions = await self.load_interview_questions(self.job_id)
+            with self.timed("load_questions"):
+                self.schedule = await self.load_interview_questions(self.job_id)
+                self.questions = self.schedule.planned()
             
             # Start interview process
             await self.conduct_interview()
@@ -268,201 +3837,379 @@ class AIInterviewAgent:
         except Exception as e:
             print(f"❌ Error in AI Agent: {str(e)}")
             self.is_connected = False
+            self.publish_status(agentConnected=False)
+            # The supervisor records the failure and releases the room
+            raise
     
     async def conduct_interview(self):
         """Main interview logic"""
         print(f"🎯 Starting interview with {len(self.questions)} questions")
         print(f"👤 Candidate: {self.candidate_name} ({self.candidate_email})")
-        print(f"💼 Position: {self.job_title} - {self.job_department}")
-        print(f"⚙️ Settings: {self.interview_mode} mode, {self.interview_language} language, {self.interview_duration} min")
-        print(f"📝 Prompt Template: {self.prompt_template_name}")
+        print(f"💼 Position: {self.job.job_title} - {self.job.job_department}")
+        print(f"⚙️ Settings: {self.job.interview_mode} mode, {self.job.interview_language} language, {self.job.interview_duration} min")
+        print(f"📝 Prompt Template: {self.job.prompt_template_name}")
         
         # Send greeting message if available
-        greeting = self.prompt_text.get('greeting_message', '') if self.prompt_text else ''
-        if not greeting:
-            greeting = f"Hello {self.candidate_name}, welcome to your interview for the {self.job_title} position!"
+        greeting = self.job.prompt_text.get('greeting_message', '') if self.job.prompt_text else ''
+        if self.resumed:
+            # Resuming after a restart: skip the full greeting
+            greeting = f"Welcome back {self.candidate_name}, let's continue where we left off."
+            greeting_prepared = await self.prepare_question(greeting)
+        elif greeting:
+            greeting_prepared = await self.prepare_question(greeting)
+        else:
+            # Only the name is candidate-specific; the rest is cached per job
+            greeting_parts = [f"Hello {self.candidate_name},", f"welcome to your interview for the {self.job.job_title} position!"]
+            greeting = " ".join(greeting_parts)
+            greeting_prepared = {"question": greeting, "audio": await self.synthesize_segments(greeting_parts)}
         
-        await self.ask_question(greeting)
-        await asyncio.sleep(3)
+        # The greeting already counts against the interview's time budget
+        schedule = self.schedule
+        schedule.start(time.monotonic(), self.resume_done)
         
-        # Wait for candidate to be ready
-        await asyncio.sleep(2)
+        # Synthesize the likely first question while the greeting plays
+        prepared_index = schedule.peek()
+        next_prepared = asyncio.create_task(self.prepare_question(schedule.questions[prepared_index])) if prepared_index is not None else None
+        with self.timed("greeting"):
+            await self.ask_question(greeting, greeting_prepared)
         
-        for i, question in enumerate(self.questions):
-            try:
-                self.current_question = question
-                self.progress = (i / len(self.questions)) * 100
-                
-                print(f"❓ Asking question {i+1}/{len(self.questions)}: {question}")
-                
-                # Ask question
-                await self.ask_question(question)
-                
-                # Wait for response (with timeout)
-                response = await self.wait_for_response(timeout=60)
-                
-                if response:
-                    # Analyze response
-                    analysis = await self.analyze_response(question, response)
-                    self.responses.append({
-                        "question": question,
-                        "response": response,
-                        "analysis": analysis
-                    })
+        # Wait for candidate to be ready (falls back after a short grace period)
+        try:
+            await asyncio.wait_for(self.candidate_ready.wait(), CANDIDATE_READY_TIMEOUT)
+        except asyncio.TimeoutError:
+            print("⏳ Candidate ready signal not received, starting anyway")
+        
+        try:
+            while True:
+                skipped = len(schedule.skipped)
+                i = schedule.next(time.monotonic())
+                if len(schedule.skipped) > skipped:
+                    print(f"⏩ Running behind schedule, skipping {len(schedule.skipped) - skipped} questions")
+                if i is None:
+                    break
+                question = schedule.questions[i]
+                self.progress = schedule.progress()
+                question_started = time.monotonic()
+                timeout = schedule.begin(i, question_started)
+                try:
+                    self.current_question = question
+                    self.publish_status(currentQuestion=question, interviewProgress=self.progress)
+                    self.journal_event("question", index=i)
                     
-                    # Provide feedback
-                    await self.provide_feedback(analysis)
-                else:
-                    print("⏰ No response received, moving to next question")
-                
-                # Wait before next question
-                await asyncio.sleep(3)
-                
-            except Exception as e:
-                print(f"❌ Error in question {i+1}: {str(e)}")
-                continue
+                    print(f"❓ Asking question {len(schedule.asked)}/{schedule.target}: {question}")
+                    
+                    # Ask question using the audio prepared during the previous answer,
+                    # unless the schedule picked a different question since
+                    prepared = None
+                    if next_prepared is not None and prepared_index == i:
+                        try:
+                            prepared = await next_prepared
+                        except Exception as e:
+                            print(f"⚠️ Question preparation failed: {str(e)}")
+                    elif next_prepared is not None:
+                        next_prepared.cancel()
+                    next_prepared = None
+                    # Candidates may start answering while the question is being read
+                    self.response_capture.open(timeout)
+                    with self.timed("ask_question"):
+                        await self.ask_question(question, prepared)
+                    
+                    # Prepare the likely next question while this one is answered and analyzed
+                    prepared_index = schedule.peek()
+                    if prepared_index is not None:
+                        next_prepared = asyncio.create_task(self.prepare_question(schedule.questions[prepared_index]))
+                    
+                    # Wait for response (timeout adapts to this candidate and the time left)
+                    listen_started = time.monotonic()
+                    with self.timed("wait_for_response"):
+                        response = await self.wait_for_response(timeout=timeout)
+                    answer_seconds = time.monotonic() - listen_started if response else None
+                    score = None
+                    
+                    if response:
+                        # Analyze response
+                        with self.timed("analyze_response"):
+                            analysis = await self.analyze_response(question, response)
+                        record = {
+                            "question": question,
+                            "response": response,
+                            "analysis": analysis
+                        }
+                        self.responses.append(record)
+                        self.journal_event("response", index=i, record=record)
+                        score = analysis["score"]
+                        self.score_stats.add(score)
+                        self.persist_response(i, record)
+                        score_aggregator.record_answer(self.job_id, self.session_key or self.room_name, self.candidate_id,
+                                                       self.candidate_name, score, self.score_stats)
+                        
+                        # Provide feedback
+                        with self.timed("provide_feedback"):
+                            await self.provide_feedback(analysis)
+                    else:
+                        print("⏰ No response received, moving to next question")
+                    schedule.record(i, answer_seconds, time.monotonic() - question_started, score)
+                    
+                except Exception as e:
+                    print(f"❌ Error in question {len(schedule.asked)}: {str(e)}")
+                    continue
+        finally:
+            if next_prepared is not None and not next_prepared.done():
+                next_prepared.cancel()
         
         # Interview completed
-        await self.complete_interview()
+        with self.timed("complete_interview"):
+            await self.complete_interview()
     
-    async def ask_question(self, question: str):
+    def persist_response(self, index: int, record: dict):
+        """Queue one answered question for the write-behind result writer"""
+        result_writer.add("interview_responses", {
+            "session_key": self.session_key or self.room_name,
+            "question_index": index,
+            "session_id": self.session_id,
+            "job_id": self.job_id,
+            "candidate_id": self.candidate_id,
+            "question": question_text(record["question"]),
+            "response": record["response"],
+            "analysis": record["analysis"],
+            "score": record["analysis"].get("score"),
+            "answered_at": utc_timestamp()
+        })
+    
+    def persist_result(self, status: str, final_score: Optional[float]):
+        """Queue the session's final report for the write-behind result writer"""
+        result_writer.add("interview_results", {
+            "session_key": self.session_key or self.room_name,
+            "session_id": self.session_id,
+            "job_id": self.job_id,
+            "candidate_id": self.candidate_id,
+            "candidate_name": self.candidate_name,
+            "status": status,
+            "final_score": final_score,
+            "total_questions": len(self.questions),
+            "answered": self.score_stats.count,
+            "report": {"scores": self.score_stats.to_dict()},
+            "finished_at": utc_timestamp()
+        })
+    
+    async def prepare_question(self, question: str) -> dict:
+        """Do the per-question work that can run ahead of asking it"""
+        return {"question": question, "audio": await self.synthesize_speech(question_text(question))}
+    
+    async def ask_question(self, question: str, prepared: dict = None):
         """Ask question to candidate"""
         # Send question via data channel
-        await self.room.local_participant.publish_data(
-            json.dumps({
-                "type": "question",
-                "question": question,
-                "timestamp": time.time(),
-                "agent": "ai-interviewer"
-            }).encode()
-        )
+        await self.data_sender.send({
+            "type": "question",
+            "question": question,
+            "timestamp": time.time(),
+            "agent": "ai-interviewer"
+        })
         
         # Also speak the question (if you have TTS)
-        await self.speak_question(question)
+        await self.speak_question(question, prepared["audio"] if prepared else None)
     
     async def wait_for_response(self, timeout: int = 60):
         """Wait for candidate response"""
         print(f"👂 Listening for candidate response...")
         
-        # This is a simplified version - in reality you'd implement
-        # speech-to-text or wait for data channel messages
-        await asyncio.sleep(5)  # Simulate waiting
-        
-        # Return mock response for now
-        return f"Mock response to: {self.current_question}"
+        # Returns as soon as the candidate finishes speaking or sends a final text answer
+        return await self.response_capture.capture(timeout)
     
     async def analyze_response(self, question: str, response: str):
         """Analyze candidate response using AI"""
         print(f"🧠 Analyzing response...")
         
-        # Here you would integrate with your AI model
-        # For now, return mock analysis
-        analysis = {
-            "score": 8.5,
-            "feedback": "Good response, shows relevant experience",
-            "keywords": ["experience", "skills", "passion"],
-            "sentiment": "positive",
-            "completeness": 0.9
-        }
-        
-        return analysis
+        # Scored together with answers from every other agent in this process;
+        # spoken answers also carry their audio features
+        features = self.response_capture.last_features
+        return await scoring_service.score(question, response, {
+            "job": self.job,
+            "candidate": f"{self.candidate_skills} {self.candidate_projects}",
+            "audio": features.to_dict() if features else None
+        })
     
     async def provide_feedback(self, analysis: dict):
         """Provide feedback to candidate"""
-        feedback_msg = f"Great answer! Score: {analysis['score']}/10. {analysis['feedback']}"
+        # Scores are real now, so the wording comes from the analysis instead of always praising
+        feedback_msg = f"Score: {analysis['score']}/10. {analysis['feedback']}"
         
-        await self.room.local_participant.publish_data(
-            json.dumps({
-                "type": "feedback",
-                "message": feedback_msg,
-                "score": analysis["score"],
-                "timestamp": time.time()
-            }).encode()
-        )
+        # Coalesced with the next question in binary mode
+        await self.data_sender.send({
+            "type": "feedback",
+            "message": feedback_msg,
+            "score": analysis["score"],
+            "timestamp": time.time()
+        }, wait=False)
         
         print(f"💬 Feedback sent: {feedback_msg}")
     
-    async def speak_question(self, question: str):
+    async def synthesize_speech(self, text: str):
+        """Synthesize speech audio for text (returns None without a TTS engine)"""
+        return await tts_cache.get(text, self.job.interview_language, self.job.tts_voice)
+    
+    async def synthesize_segments(self, segments: List[str]):
+        """Synthesize phrases separately so shared ones come from the cache"""
+        parts = await asyncio.gather(*(self.synthesize_speech(text) for text in segments))
+        if any(part is None for part in parts):
+            return None
+        return b"".join(parts)
+    
+    async def speak_question(self, question: str, audio=None):
         """Speak question using TTS (if available)"""
         print(f"🗣️ Speaking: {question}")
-        # Implement TTS here if you have it
-        pass
+        if audio is None:
+            audio = await self.synthesize_speech(question_text(question))
+        # Play audio on the agent's microphone track here; returns once playback ends
     
-    async def load_interview_questions(self, job_id: str):
-        """Load questions based on job ID and prompt template"""
-        questions = []
-        
-        # Get questions from prompt_text JSONB
-        if self.prompt_text:
-            # Technical questions
-            if 'technical_questions' in self.prompt_text and self.prompt_text['technical_questions']:
-                questions.extend(self.prompt_text['technical_questions'])
-            
-            # Default questions
-            if 'default_questions' in self.prompt_text and self.prompt_text['default_questions']:
-                questions.extend(self.prompt_text['default_questions'])
-        
-        # If no questions in template, use default based on job
-        if not questions:
-            questions = [
-                f"Hello {self.candidate_name}, tell me about yourself and your background",
-                f"Why are you interested in the {self.job_title} position?",
-                f"What relevant experience do you have for this {self.job_department} role?",
-                "Describe a challenging project you worked on",
-                "What are your greatest strengths?",
-                "Do you have any questions for us?"
-            ]
+    async def load_interview_questions(self, job_id: str) -> QuestionScheduler:
+        """Load questions based on job ID and prompt template, scheduled to fit interviewDuration"""
+        key = QuestionPlanCache.plan_key(
+            job_id, self.job.prompt_template_name, self.job.prompt_template_version, self.job.prompt_digest,
+            self.job.interview_language, self.job.difficulty_level, self.job.questions_count
+        )
+        plan = question_plans.get(key)
+        if plan is None:
+            plan = compile_question_plan(self.job.prompt_text, self.job.questions_count, self.job.difficulty_level)
+            # A named template sent without promptText compiles to the defaults; don't cache that
+            if self.job.prompt_text or not self.job.prompt_template_name:
+                question_plans.put(key, plan)
         
-        # Limit questions based on questions_count setting
-        questions = questions[:self.questions_count]
+        questions = plan.render({
+            "candidateName": self.candidate_name,
+            "jobTitle": self.job.job_title,
+            "jobDepartment": self.job.job_department
+        })
         
-        print(f"📋 Loaded {len(questions)} questions for job {self.job_title} ({job_id})")
-        print(f"📋 Questions: {questions}")
-        return questions
+        print(f"📋 Loaded {plan.count} questions (+{len(questions) - plan.count} follow-ups) for job {self.job.job_title} ({job_id})")
+        print(f"📋 Questions: {questions[:plan.count]}")
+        try:
+            budget = float(self.job.interview_duration) * 60
+        except (TypeError, ValueError):
+            budget = QUESTION_DEFAULT_SECONDS * plan.count
+        return QuestionScheduler(questions, plan.meta, plan.count, budget, self.job.difficulty_level)
     
     async def complete_interview(self):
         """Complete interview and generate report"""
         print(f"🎉 Interview completed for candidate {self.candidate_id}")
         
-        # Generate final report
-        final_score = sum(r["analysis"]["score"] for r in self.responses) / len(self.responses)
+        # Final score is the running mean kept as answers were scored (None if nothing was answered)
+        final_score = round(self.score_stats.mean, 2) if self.score_stats.count else None
+        score_aggregator.record_complete(self.job_id, self.session_key or self.room_name, self.candidate_id,
+                                         self.candidate_name, self.score_stats)
+        self.completed = True
+        self.persist_result("completed", final_score)
         
-        await self.room.local_participant.publish_data(
-            json.dumps({
-                "type": "interview_complete",
-                "final_score": final_score,
-                "total_questions": len(self.questions),
-                "timestamp": time.time()
-            }).encode()
-        )
+        await self.data_sender.send({
+            "type": "interview_complete",
+            "final_score": final_score,
+            "total_questions": len(self.questions),
+            "timestamp": time.time()
+        })
         
-        print(f"📊 Final Score: {final_score}/10")
+        if final_score is None:
+            print("📊 No answers were scored")
+        else:
+            print(f"📊 Final Score: {final_score}/10")
     
-    async def end_interview(self):
-        """End interview session"""
-        if self.room:
-            await self.room.disconnect()
-        self.is_connected = False
-        print(f"🔚 Interview ended for candidate {self.candidate_id}")
+    async def end_interview(self, reason: str = "ended", flush_results: bool = True):
+        """End interview session and release its room and audio resources"""
+        for task in self.audio_tasks:
+            task.cancel()
+        self.audio_tasks.clear()
+        try:
+            await self.inbound.stop()
+            try:
+                await self.data_sender.flush()
+            except Exception as e:
+                print(f"⚠️ Could not flush pending messages: {str(e)}")
+            if self.room:
+                await self.room.disconnect()
+            self.is_connected = False
+            self.publish_status(agentConnected=False)
+            if not self.completed:
+                final_score = round(self.score_stats.mean, 2) if self.score_stats.count else None
+                self.persist_result(reason, final_score)
+            if flush_results:
+                await result_writer.flush()
+            if self.recorder is not None:
+                self.recorder.record("end", reason=reason, answered=self.score_stats.count)
+                self.recorder.flush()
+                self.recorder = None
+            print(f"🔚 Interview ended for candidate {self.candidate_id}")
+        finally:
+            # Also when cleanup fails or runs out of time
+            self.release_session_state()
+    
+    def release_session_state(self):
+        """Free the answer buffers and per-question state of a finished interview"""
+        self.response_capture.release()
+        self.responses = []
+        self.questions = []
+        self.schedule = None
     
     # Event handlers
+    def _schedule(self, handler):
+        def _callback(*args):
+            asyncio.ensure_future(handler(*args))
+        return _callback
+    
     async def on_participant_connected(self, participant):
         print(f"👤 Participant connected: {participant.identity}")
+        self.record_event("participant", identity=participant.identity)
+        self.candidate_ready.set()
     
-    async def on_data_received(self, data):
-        try:
-            message = json.loads(data.data.decode())
-            print(f"📨 Received message: {message}")
-        except:
-            pass
+    def on_data_received(self, data):
+        # Runs on the room's event callback: decode and enqueue only
+        if self.recorder is not None:
+            participant = getattr(data, "participant", None)
+            self.recorder.record("received", identity=getattr(participant, "identity", None), **recorded_packet(data.data))
+        self.inbound.submit(data.data)
+    
+    async def on_candidate_ready(self, message: dict):
+        self.candidate_ready.set()
+    
+    async def on_candidate_text(self, message: dict):
+        text = message.get("response") or message.get("text") or ""
+        self.response_capture.push_text(text, final=message.get("final", True))
+    
+    async def on_candidate_typing(self, message: dict):
+        self.candidate_typing = bool(message.get("typing", True))
+    
+    async def on_heartbeat(self, message: dict):
+        self.last_heartbeat = time.monotonic()
     
     async def on_track_subscribed(self, track, publication, participant):
         print(f"🎥 Track subscribed: {track.kind} from {participant.identity}")
+        self.record_event("track", kind=str(track.kind), identity=participant.identity)
+        rtc = livekit_rtc()
+        if track.kind == rtc.TrackKind.KIND_AUDIO:
+            self.audio_tasks.append(asyncio.create_task(self.consume_audio(track)))
+    
+    async def consume_audio(self, track):
+        """Forward candidate audio frames to the response capture stage"""
+        async for event in livekit_rtc().AudioStream(track):
+            frame = getattr(event, "frame", event)
+            self.response_capture.push_audio(frame.data, frame.sample_rate, frame.num_channels)
 
 # Health check endpoint
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "active_interviews": len(active_interviews)}
+    active_interviews.evict_expired()
+    return {
+        "status": "healthy",
+        "active_interviews": active_interviews.active_count,
+        "finished_interviews": active_interviews.finished_count,
+        "queued_joins": admission.queued,
+        "agent_workers": worker_pool.size if worker_pool is not None else 0
+    }
+
+# Metrics endpoint
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Prometheus-format latency histograms and gauges"""
+    worker_snapshots = await worker_pool.collect_metrics() if worker_pool is not None else []
+    return PlainTextResponse(metrics.render(worker_snapshots), media_type="text/plain; version=0.0.4")
 
 # Run the server
 if __name__ == "__main__":
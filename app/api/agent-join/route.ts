@@ -125,6 +125,7 @@ export async function POST(req: NextRequest) {
       promptTemplateCategory: promptTemplate?.category || 'technical',
       promptTemplateLevel: promptTemplate?.level || 'mid',
       promptTemplateDuration: promptTemplate?.duration_minutes || 45,
+      promptTemplateVersion: promptTemplate?.updated_at || '',
       
       // Complete prompt_text JSONB object
       promptText: promptTemplate?.prompt_text || {
@@ -160,7 +161,8 @@ export async function POST(req: NextRequest) {
         return NextResponse.json({
           success: true,
           message: 'Agent join request sent',
-          agentStatus: 'connecting'
+          // A retry for a room that already has a session gets that session's status
+          agentStatus: responseData.agentStatus || 'connecting'
         });
       } else {
         const errorData = await backendResponse.json().catch(() => ({}));
@@ -96,13 +96,10 @@ export async function POST(req: NextRequest) {
  *       'Authorization': `Bearer ${process.env.BACKEND_API_KEY}`
  *     },
  *     body: JSON.stringify({
+ *       // The backend mints the agent's LiveKit token from its own config
  *       roomName,
- *       agentToken,
  *       candidateId,
- *       jobId,
- *       livekitUrl: process.env.LIVEKIT_URL,
- *       livekitApiKey: process.env.LIVEKIT_API_KEY,
- *       livekitApiSecret: process.env.LIVEKIT_API_SECRET
+ *       jobId
  *     })
  *   });
  *   
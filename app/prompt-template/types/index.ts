@@ -36,6 +36,9 @@ export interface InterviewQuestion {
   question: string;
   category: string;
   expected_duration: number;
+  // Used by the agent's scheduler to pick follow-ups and decide what to skip when short on time
+  difficulty?: 'easy' | 'medium' | 'hard';
+  priority?: number;
 }
 
 export interface PromptTemplate {
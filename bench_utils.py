@@ -0,0 +1,33 @@
+# Shared helpers for the offline benchmark and replay scripts
+
+import importlib
+import os
+
+
+def load_offline_backend(**env):
+    """Import the backend set up for offline runs against fake rooms.
+
+    Agents must run in this process so they pick up the fake rooms, and the
+    per-step agent prints are silenced so they do not dominate measurements.
+    ``env`` overrides further backend settings before the import.
+    """
+    os.environ["AGENT_WORKERS"] = "0"
+    os.environ.update({name: str(value) for name, value in env.items()})
+    backend = importlib.import_module("PYTHON_BACKEND_INTEGRATION")
+    backend.print = lambda *a, **k: None
+    return backend
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def print_latency(label, values, width=18):
+    """One line of p50/p95/p99/max for durations given in seconds"""
+    ms = [v * 1000 for v in values]
+    print(f"   {label:<{width}} n={len(ms):<6} p50={percentile(ms, 50):8.2f} ms  "
+          f"p95={percentile(ms, 95):8.2f} ms  p99={percentile(ms, 99):8.2f} ms  max={max(ms, default=0):8.2f} ms")
@@ -0,0 +1,166 @@
+# Offline load test and latency benchmark for the AI interview backend
+# Runs the FastAPI app in-process against fake LiveKit rooms (no server, no network):
+#   python benchmark-backend.py --sessions 200 --questions 5 --answer-delay 0.05
+
+import argparse
+import asyncio
+import os
+import resource
+import time
+
+import httpx
+
+from bench_utils import load_offline_backend, print_latency
+from fake_livekit_room import FakeRoomFactory
+
+backend = load_offline_backend()
+
+
+def rss_bytes():
+    """Current resident set size (falls back to peak RSS off Linux)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class LoopLagMonitor:
+    """Measures how late a periodic timer fires - a proxy for event-loop stalls"""
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.samples = []
+        self.peak_rss = 0
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - expected))
+            self.peak_rss = max(self.peak_rss, rss_bytes())
+
+
+class SessionDriver:
+    def __init__(self, client, args):
+        self.client = client
+        self.args = args
+        self.join_latency = []
+        self.start_latency = []
+        self.poll_latency = []
+        self.session_durations = []
+        self.errors = 0
+
+    async def run_session(self, index):
+        room = f"bench-room-{index}"
+        candidate = f"bench-candidate-{index}"
+        started = time.perf_counter()
+        use_join = self.args.mode == "join" or (self.args.mode == "both" and index % 2 == 0)
+
+        if use_join:
+            lookup_id = f"bench-session-{index}"
+            t = time.perf_counter()
+            response = await self.client.post("/agent/join", json={
+                "roomName": room,
+                "sessionId": lookup_id,
+                "candidateId": candidate,
+                "candidateName": f"Candidate {index}",
+                "jobId": f"bench-job-{index % self.args.jobs}",
+                "jobTitle": "Backend Engineer",
+                "questionsCount": self.args.questions
+            })
+            self.join_latency.append(time.perf_counter() - t)
+        else:
+            lookup_id = candidate
+            t = time.perf_counter()
+            response = await self.client.post("/start-interview", json={
+                "roomName": room,
+                "agentToken": "bench-token",
+                "candidateId": candidate,
+                "jobId": f"bench-job-{index % self.args.jobs}",
+                "livekitUrl": "ws://fake"
+            })
+            self.start_latency.append(time.perf_counter() - t)
+        if response.status_code != 200:
+            self.errors += 1
+            return
+
+        deadline = time.perf_counter() + self.args.session_timeout
+        while time.perf_counter() < deadline:
+            await asyncio.sleep(self.args.poll_interval)
+            t = time.perf_counter()
+            status = (await self.client.get(f"/interview-status/{lookup_id}")).json()
+            self.poll_latency.append(time.perf_counter() - t)
+            if status.get("status") != "active":
+                self.session_durations.append(time.perf_counter() - started)
+                return
+        self.errors += 1
+
+
+async def main(args):
+    backend.room_factory = FakeRoomFactory(
+        connect_delay=args.connect_delay,
+        answer_delay=args.answer_delay,
+        decode=backend.decode_frame
+    )
+
+    baseline_rss = rss_bytes()
+    monitor = LoopLagMonitor()
+    monitor.start()
+    transport = httpx.ASGITransport(app=backend.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        driver = SessionDriver(client, args)
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def _bounded(i):
+            async with semaphore:
+                await driver.run_session(i)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(_bounded(i) for i in range(args.sessions)))
+        elapsed = time.perf_counter() - started
+    await monitor.stop()
+
+    completed = len(driver.session_durations)
+    print("=" * 60)
+    print("Backend Benchmark")
+    print("=" * 60)
+    print(f"   sessions={args.sessions} concurrency={args.concurrency} questions={args.questions} "
+          f"answer_delay={args.answer_delay}s mode={args.mode}")
+    print(f"   completed={completed} errors={driver.errors} wall={elapsed:.2f}s "
+          f"throughput={completed / elapsed if elapsed else 0:.1f} sessions/s")
+    print("\nLatency")
+    print_latency("/agent/join", driver.join_latency)
+    print_latency("/start-interview", driver.start_latency)
+    print_latency("/interview-status", driver.poll_latency)
+    print_latency("session duration", driver.session_durations)
+    print_latency("event-loop lag", monitor.samples)
+    print("\nMemory")
+    per_session = (monitor.peak_rss - baseline_rss) / min(args.sessions, args.concurrency)
+    print(f"   baseline RSS={baseline_rss / 2**20:.1f} MiB  peak RSS={monitor.peak_rss / 2**20:.1f} MiB  "
+          f"~{per_session / 1024:.1f} KiB per concurrent session")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline load test for the AI interview backend")
+    parser.add_argument("--sessions", type=int, default=100, help="total interviews to run")
+    parser.add_argument("--concurrency", type=int, default=100, help="interviews in flight at once")
+    parser.add_argument("--questions", type=int, default=5, help="questionsCount per interview")
+    parser.add_argument("--jobs", type=int, default=5, help="distinct jobIds to spread sessions over")
+    parser.add_argument("--mode", choices=["join", "start", "both"], default="both",
+                        help="create sessions via /agent/join, /start-interview, or alternate")
+    parser.add_argument("--answer-delay", type=float, default=0.05, help="seconds before the fake candidate answers")
+    parser.add_argument("--connect-delay", type=float, default=0.01, help="simulated room connect latency")
+    parser.add_argument("--poll-interval", type=float, default=0.1, help="status polling interval per session")
+    parser.add_argument("--session-timeout", type=float, default=120.0, help="give up on a session after this long")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,253 @@
+# 🧪 In-process stand-in for a LiveKit room, for offline benchmarks and tests
+# Usage: PYTHON_BACKEND_INTEGRATION.room_factory = FakeRoomFactory(...)
+
+import asyncio
+import base64
+import json
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+class FakeParticipant:
+    def __init__(self, identity: str):
+        self.identity = identity
+
+
+class FakeDataPacket:
+    """Shape of the object LiveKit passes to data_received handlers"""
+
+    def __init__(self, data: bytes, participant: FakeParticipant):
+        self.data = data
+        self.participant = participant
+
+
+class FakeLocalParticipant:
+    """Records everything the agent publishes"""
+
+    def __init__(self, room: "FakeRoom"):
+        self.room = room
+        self.identity = "ai-interviewer"
+        self.published: List[tuple] = []
+        self.microphone_enabled = False
+        self.camera_enabled = False
+
+    async def publish_data(self, payload, **kwargs):
+        payload = bytes(payload)
+        self.published.append((time.monotonic(), payload))
+        self.room.on_agent_published(payload)
+
+    async def set_microphone_enabled(self, enabled: bool):
+        self.microphone_enabled = enabled
+
+    async def set_camera_enabled(self, enabled: bool):
+        self.camera_enabled = enabled
+
+
+class FakeRoom:
+    """Minimal rtc.Room replacement: connect/disconnect, event handlers and data.
+
+    ``connect_delay`` simulates signalling latency. With a ``candidate`` the
+    room also plays a scripted candidate: it joins right after the agent
+    connects and answers every question after ``answer_delay`` seconds.
+    A ``ReplayCandidate`` plays back a recorded session instead.
+    """
+
+    def __init__(self, connect_delay: float = 0.0, candidate: Optional["FakeCandidate"] = None):
+        self.connect_delay = connect_delay
+        self.candidate = candidate
+        self.local_participant = FakeLocalParticipant(self)
+        self.remote_participants: Dict[str, FakeParticipant] = {}
+        self.handlers: Dict[str, List[Callable]] = {}
+        self.connected = False
+        self.connected_at = None
+        self.disconnected_at = None
+
+    async def connect(self, url: str, token: str, options: Any = None):
+        if self.connect_delay:
+            await asyncio.sleep(self.connect_delay)
+        self.connected = True
+        self.connected_at = time.monotonic()
+        if self.candidate is not None:
+            asyncio.get_running_loop().call_soon(self.candidate.join, self)
+
+    async def disconnect(self):
+        self.connected = False
+        self.disconnected_at = time.monotonic()
+        if self.candidate is not None:
+            self.candidate.stop()
+
+    def on(self, event: str, callback: Callable = None):
+        self.handlers.setdefault(event, []).append(callback)
+        return callback
+
+    def emit(self, event: str, *args):
+        for callback in self.handlers.get(event, []):
+            callback(*args)
+
+    def send_from_candidate(self, message: dict):
+        if self.connected and self.candidate is not None:
+            self.emit("data_received", FakeDataPacket(json.dumps(message).encode(), self.candidate.participant))
+
+    def on_agent_published(self, payload: bytes):
+        if self.candidate is not None:
+            self.candidate.on_agent_message(self, payload)
+
+
+class FakeCandidate:
+    """Scripted candidate that answers each question over the data channel"""
+
+    def __init__(self, identity: str = "candidate", answer_delay: float = 0.05,
+                 answer_text: str = "I built and scaled a distributed system using Python and PostgreSQL",
+                 decode: Callable[[bytes], List[dict]] = None):
+        self.participant = FakeParticipant(identity)
+        self.answer_delay = answer_delay
+        self.answer_text = answer_text
+        self.decode = decode or (lambda payload: [json.loads(payload.decode())])
+        self.questions_seen = 0
+        self._timers: List[asyncio.TimerHandle] = []
+
+    def join(self, room: FakeRoom):
+        room.remote_participants[self.participant.identity] = self.participant
+        room.emit("participant_connected", self.participant)
+
+    def stop(self):
+        for timer in self._timers:
+            timer.cancel()
+        self._timers.clear()
+
+    def on_agent_message(self, room: FakeRoom, payload: bytes):
+        for message in self.decode(payload):
+            if message.get("type") != "question":
+                continue
+            self.questions_seen += 1
+            # The first question message is the greeting
+            if self.questions_seen == 1:
+                continue
+            self._timers.append(asyncio.get_running_loop().call_later(
+                self.answer_delay, room.send_from_candidate, {"type": "answer", "text": self.answer_text}
+            ))
+
+
+def load_recording(path: str) -> List[dict]:
+    """Events of a session recording (SESSION_RECORD_DIR); a resumed session keeps its last run"""
+    events: List[dict] = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                event = json.loads(line)
+            except ValueError:
+                # Torn last line of a session that was still running
+                continue
+            if event.get("event") == "join":
+                events = []
+            events.append(event)
+    return events
+
+
+def recorded_payload(event: dict) -> bytes:
+    if "b64" in event:
+        return base64.b64decode(event["b64"])
+    return event["text"].encode()
+
+
+class ReplayCandidate:
+    """Plays back the candidate side of a recorded session.
+
+    Recorded candidate events are grouped by the agent question they
+    followed and re-sent with the recorded delays divided by ``speed``, so
+    the replay stays in step with the agent even when the agent runs faster
+    or slower than it did live. ``response_latency`` collects the time from
+    each replayed answer to the agent's next message.
+    """
+
+    ANSWER_TYPES = ("response", "answer", "transcript")
+
+    def __init__(self, events: List[dict], speed: float = 1.0, decode: Callable[[bytes], List[dict]] = None):
+        self.speed = speed
+        self.decode = decode or (lambda payload: [json.loads(payload.decode())])
+        self.present: List[str] = []
+        # segments[0] follows the agent's connect, segments[n] its n-th question
+        self.segments: List[List[tuple]] = [[]]
+        anchor = 0.0
+        identity = None
+        for event in events:
+            kind = event.get("event")
+            if kind == "connected":
+                anchor = event["t"]
+                self.present = list(event.get("participants") or ())
+            elif kind == "sent":
+                for message in event.get("messages", ()):
+                    if message.get("type") == "question":
+                        self.segments.append([])
+                        anchor = event["t"]
+            elif kind in ("received", "participant"):
+                self.segments[-1].append((max(0.0, event["t"] - anchor), event))
+                identity = identity or event.get("identity")
+        self.participant = FakeParticipant(identity or (self.present[0] if self.present else "candidate"))
+        self.questions_seen = 0
+        self.answered_at: Optional[float] = None
+        self.response_latency: List[float] = []
+        self._timers: List[asyncio.TimerHandle] = []
+
+    def join(self, room: FakeRoom):
+        for identity in self.present:
+            participant = self.participant if identity == self.participant.identity else FakeParticipant(identity)
+            room.remote_participants[identity] = participant
+            room.emit("participant_connected", participant)
+        self._play(room, 0)
+
+    def stop(self):
+        for timer in self._timers:
+            timer.cancel()
+        self._timers.clear()
+
+    def _play(self, room: FakeRoom, segment: int):
+        if segment >= len(self.segments):
+            return
+        loop = asyncio.get_running_loop()
+        for delay, event in self.segments[segment]:
+            self._timers.append(loop.call_later(delay / self.speed, self._emit, room, event))
+
+    def _emit(self, room: FakeRoom, event: dict):
+        if not room.connected:
+            return
+        if event["event"] == "participant":
+            participant = FakeParticipant(event["identity"])
+            room.remote_participants[participant.identity] = participant
+            room.emit("participant_connected", participant)
+            return
+        payload = recorded_payload(event)
+        try:
+            is_answer = json.loads(payload.decode()).get("type") in self.ANSWER_TYPES
+        except (ValueError, UnicodeDecodeError, AttributeError):
+            is_answer = False
+        if is_answer:
+            self.answered_at = time.monotonic()
+        room.emit("data_received", FakeDataPacket(payload, self.participant))
+
+    def on_agent_message(self, room: FakeRoom, payload: bytes):
+        if self.answered_at is not None:
+            self.response_latency.append(time.monotonic() - self.answered_at)
+            self.answered_at = None
+        for message in self.decode(payload):
+            if message.get("type") == "question":
+                self.questions_seen += 1
+                self._play(room, self.questions_seen)
+
+
+class FakeRoomFactory:
+    """room_factory that builds a FakeRoom with a scripted candidate and keeps them all"""
+
+    def __init__(self, connect_delay: float = 0.0, answer_delay: float = 0.05, decode: Callable = None):
+        self.connect_delay = connect_delay
+        self.answer_delay = answer_delay
+        self.decode = decode
+        self.rooms: List[FakeRoom] = []
+
+    def __call__(self) -> FakeRoom:
+        room = FakeRoom(self.connect_delay, FakeCandidate(answer_delay=self.answer_delay, decode=self.decode))
+        self.rooms.append(room)
+        return room
@@ -0,0 +1,63 @@
+# 🧪 Local stand-in for the Supabase REST (PostgREST) upsert endpoint
+# In-process: ResultWriter(..., transport=httpx.ASGITransport(app=FakeSupabase()))
+# Standalone: uvicorn fake_supabase:app --port 54321, then SUPABASE_URL=http://127.0.0.1:54321
+
+import json
+from typing import Dict, List, Optional
+from urllib.parse import parse_qsl
+
+
+class FakeSupabase:
+    """Minimal ASGI app accepting bulk upserts on POST /rest/v1/<table>.
+
+    Rows are merged by the ``on_conflict`` columns like a real upsert.
+    ``fail_next`` makes the next N requests answer ``fail_status`` so
+    retry paths can be exercised.
+    """
+
+    def __init__(self, fail_next: int = 0, fail_status: int = 503):
+        self.tables: Dict[str, Dict[tuple, dict]] = {}
+        self.requests: List[dict] = []
+        self.fail_next = fail_next
+        self.fail_status = fail_status
+
+    def rows(self, table: str) -> List[dict]:
+        return list(self.tables.get(table, {}).values())
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+
+        path = scope["path"]
+        query = dict(parse_qsl(scope["query_string"].decode()))
+        self.requests.append({"method": scope["method"], "path": path, "query": query, "size": len(body)})
+
+        if self.fail_next > 0:
+            self.fail_next -= 1
+            return await self._respond(send, self.fail_status, {"message": "stand-in failure"})
+        if scope["method"] != "POST" or not path.startswith("/rest/v1/"):
+            return await self._respond(send, 404, {"message": "not found"})
+
+        table = path[len("/rest/v1/"):]
+        rows = json.loads(body or b"[]")
+        conflict = query.get("on_conflict", "").split(",")
+        stored = self.tables.setdefault(table, {})
+        for row in rows if isinstance(rows, list) else [rows]:
+            key = tuple(row.get(column) for column in conflict)
+            stored[key] = {**stored.get(key, {}), **row}
+        await self._respond(send, 201, None)
+
+    async def _respond(self, send, status: int, payload: Optional[dict]):
+        body = json.dumps(payload).encode() if payload is not None else b""
+        await send({"type": "http.response.start", "status": status,
+                    "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": body})
+
+
+app = FakeSupabase()
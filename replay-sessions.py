@@ -0,0 +1,139 @@
+# Replays recorded interview sessions through AIInterviewAgent against fake rooms
+# Record with SESSION_RECORD_DIR=recordings (live backend or benchmark-backend.py), then:
+#   python replay-sessions.py recordings --speed 10 --repeat 20 --concurrency 200
+# --speed compresses the candidate's recorded think time and the agent's waits
+# for answers; agent-side work (TTS, scoring, publishing) runs at full speed.
+# interviewDuration is left as recorded: the question scheduler measures the
+# candidate's pace, so faster answers leave it ahead of schedule, not behind.
+
+import argparse
+import asyncio
+import glob
+import json
+import os
+import time
+
+from bench_utils import load_offline_backend, print_latency
+from fake_livekit_room import FakeRoom, ReplayCandidate, load_recording
+
+# Replays are measured from memory rather than recorded again
+backend = load_offline_backend(SESSION_RECORD_DIR="")
+LABEL_WIDTH = 28
+
+
+def response_latencies(events):
+    """Seconds from each candidate answer to the agent's next message"""
+    latencies = []
+    answered_at = None
+    for event in events:
+        if event["event"] == "received" and "text" in event:
+            try:
+                message = json.loads(event["text"])
+            except ValueError:
+                continue
+            if isinstance(message, dict) and message.get("type") in ReplayCandidate.ANSWER_TYPES:
+                answered_at = event["t"]
+        elif event["event"] == "sent" and answered_at is not None:
+            latencies.append(event["t"] - answered_at)
+            answered_at = None
+    return latencies
+
+
+def phase_timings(events, into):
+    for event in events:
+        if event["event"] == "phase":
+            into.setdefault(event["phase"], []).append(event["seconds"])
+
+
+class ReplayDriver:
+    def __init__(self, args):
+        self.args = args
+        self.statuses = {}
+        self.durations = []
+        self.response_latency = []
+        self.phases = {}
+
+    async def replay(self, index, events):
+        join = events[0]
+        agent_kwargs = dict(join["agent_kwargs"])
+        agent_kwargs["agent_token"] = "replay"
+        agent_kwargs["room_name"] = f"{agent_kwargs.get('room_name', 'room')}-replay-{index}"
+        connect = [e["seconds"] for e in events if e["event"] == "phase" and e["phase"] == "connect"]
+
+        candidate = ReplayCandidate(events, self.args.speed, decode=backend.decode_frame)
+        agent = backend.AIInterviewAgent.create_shell()
+        agent.room = FakeRoom(connect[0] / self.args.speed if connect else 0.0, candidate)
+        agent.assign(**agent_kwargs)
+        key = f"replay-{index}"
+        agent.attach_journal(None, key)
+        recording = agent.recorder = backend.SessionRecording()
+
+        started = time.perf_counter()
+        task = backend.supervisor.start(key, agent)
+        await asyncio.gather(task, return_exceptions=True)
+        self.durations.append(time.perf_counter() - started)
+        status = backend.task_exit_status(task)
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        self.response_latency.extend(candidate.response_latency)
+        phase_timings(recording.events, self.phases)
+
+
+async def main(args):
+    paths = sorted(glob.glob(os.path.join(args.recordings, "*.jsonl")))
+    recordings = [events for events in map(load_recording, paths)
+                  if events and events[0]["event"] == "join" and any(e["event"] == "connected" for e in events)]
+    if not recordings:
+        print(f"No replayable recordings in {args.recordings}")
+        return
+
+    backend.room_factory = FakeRoom
+    # Waits for the candidate compress with the recording
+    backend.CANDIDATE_READY_TIMEOUT /= args.speed
+    backend.QUESTION_MIN_TIMEOUT /= args.speed
+    backend.QUESTION_MAX_TIMEOUT /= args.speed
+
+    driver = ReplayDriver(args)
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def _bounded(i, events):
+        async with semaphore:
+            await driver.replay(i, events)
+
+    jobs = [(i, recordings[i % len(recordings)]) for i in range(len(recordings) * args.repeat)]
+    started = time.perf_counter()
+    await asyncio.gather(*(_bounded(i, events) for i, events in jobs))
+    elapsed = time.perf_counter() - started
+    await backend.result_writer.close()
+
+    recorded_latency = []
+    recorded_phases = {}
+    recorded_durations = []
+    for events in recordings:
+        recorded_latency.extend(response_latencies(events))
+        phase_timings(events, recorded_phases)
+        recorded_durations.append(events[-1]["t"] / args.speed)
+
+    print("=" * 72)
+    print("Session Replay")
+    print("=" * 72)
+    print(f"   recordings={len(recordings)} replays={len(jobs)} speed={args.speed}x concurrency={args.concurrency}")
+    print(f"   exits={driver.statuses} wall={elapsed:.2f}s throughput={len(jobs) / elapsed if elapsed else 0:.1f} sessions/s")
+    print("\nRecorded vs replayed")
+    print_latency("answer -> next msg (rec)", recorded_latency, LABEL_WIDTH)
+    print_latency("answer -> next msg (replay)", driver.response_latency, LABEL_WIDTH)
+    print_latency(f"session / {args.speed:g} (rec)", recorded_durations, LABEL_WIDTH)
+    print_latency("session (replay)", driver.durations, LABEL_WIDTH)
+    print("\nAgent phases")
+    for phase in sorted(set(recorded_phases) | set(driver.phases)):
+        print_latency(f"{phase} (rec)", recorded_phases.get(phase, []), LABEL_WIDTH)
+        print_latency(f"{phase} (replay)", driver.phases.get(phase, []), LABEL_WIDTH)
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay recorded interview sessions offline")
+    parser.add_argument("recordings", help="directory of session recordings (SESSION_RECORD_DIR)")
+    parser.add_argument("--speed", type=float, default=1.0, help="time compression factor (1 = real time)")
+    parser.add_argument("--repeat", type=int, default=1, help="replays of each recording")
+    parser.add_argument("--concurrency", type=int, default=100, help="replays in flight at once")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,41 @@
+-- 011_create_interview_results_tables.sql
+-- Results written by the Python interview agent (bulk upserts from its write-behind buffer).
+-- session_key is the backend's session key: the interview_sessions id when the
+-- agent joined with a sessionId, otherwise "session_<roomName>".
+
+CREATE TABLE IF NOT EXISTS public.interview_responses (
+  session_key text NOT NULL,
+  question_index integer NOT NULL,
+  session_id text NULL,
+  job_id text NULL,
+  candidate_id text NULL,
+  question text NOT NULL,
+  response text NOT NULL,
+  analysis jsonb NULL,
+  score numeric NULL,
+  answered_at timestamp with time zone NULL DEFAULT now(),
+  CONSTRAINT interview_responses_pkey PRIMARY KEY (session_key, question_index)
+) TABLESPACE pg_default;
+
+CREATE TABLE IF NOT EXISTS public.interview_results (
+  session_key text NOT NULL,
+  session_id text NULL,
+  job_id text NULL,
+  candidate_id text NULL,
+  candidate_name text NULL,
+  status text NOT NULL,
+  final_score numeric NULL,
+  total_questions integer NULL,
+  answered integer NULL,
+  report jsonb NULL,
+  finished_at timestamp with time zone NULL DEFAULT now(),
+  CONSTRAINT interview_results_pkey PRIMARY KEY (session_key)
+) TABLESPACE pg_default;
+
+CREATE INDEX IF NOT EXISTS idx_interview_responses_job_id ON public.interview_responses USING btree (job_id) TABLESPACE pg_default;
+
+CREATE INDEX IF NOT EXISTS idx_interview_results_job_id ON public.interview_results USING btree (job_id) TABLESPACE pg_default;
+
+-- Written with the service role key only
+ALTER TABLE public.interview_responses ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.interview_results ENABLE ROW LEVEL SECURITY;
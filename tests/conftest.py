@@ -0,0 +1,18 @@
+# Tests import the backend in-process with no workers and no external services
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ["AGENT_WORKERS"] = "0"
+os.environ.pop("SESSION_JOURNAL_DIR", None)
+os.environ.pop("SESSION_RECORD_DIR", None)
+
+import pytest
+
+import PYTHON_BACKEND_INTEGRATION as backend
+
+
+@pytest.fixture(autouse=True)
+def quiet_backend(monkeypatch):
+    """Silence the backend's progress prints"""
+    monkeypatch.setattr(backend, "print", lambda *a, **k: None, raising=False)
@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+
+import PYTHON_BACKEND_INTEGRATION as backend
+
+
+def test_queued_request_times_out_with_retry_after():
+    async def run():
+        admission = backend.AdmissionController(max_live=1, rate=0, queue_size=5, queue_timeout=0.05)
+        await admission.admit()
+        with pytest.raises(backend.AdmissionRejected) as rejected:
+            await admission.admit()
+        return admission, rejected.value
+
+    admission, rejected = asyncio.run(run())
+    assert rejected.status_code == 503
+    assert admission.queued == 0
+    assert admission.rejected == 1
+    error = rejected.http_exception()
+    assert error.status_code == 503
+    assert int(error.headers["Retry-After"]) >= 1
+
+
+def test_rate_limited_request_is_rejected_with_429():
+    async def run():
+        admission = backend.AdmissionController(max_live=0, rate=0.5, burst=1, queue_size=5, queue_timeout=0.05)
+        await admission.admit()
+        with pytest.raises(backend.AdmissionRejected) as rejected:
+            await admission.admit()
+        return rejected.value
+
+    rejected = asyncio.run(run())
+    assert rejected.status_code == 429
+    # The next token is about two seconds away at 0.5 joins/s
+    assert rejected.http_exception().headers["Retry-After"] == "2"
+
+
+def test_full_queue_rejects_immediately():
+    async def run():
+        admission = backend.AdmissionController(max_live=1, rate=0, queue_size=1, queue_timeout=5)
+        await admission.admit()
+        waiter = asyncio.ensure_future(admission.admit())
+        await asyncio.sleep(0)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        with pytest.raises(backend.AdmissionRejected) as rejected:
+            await admission.admit()
+        elapsed = loop.time() - started
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        return admission, rejected.value, elapsed
+
+    admission, rejected, elapsed = asyncio.run(run())
+    assert rejected.status_code == 503
+    assert elapsed < 1
+    assert admission.queued == 0
+
+
+def test_waiters_are_admitted_in_order_as_slots_settle():
+    async def run():
+        admission = backend.AdmissionController(max_live=1, rate=0, queue_size=5, queue_timeout=5)
+        await admission.admit()
+        admitted = []
+
+        async def join(name):
+            await admission.admit()
+            admitted.append(name)
+
+        waiters = [asyncio.ensure_future(join(name)) for name in ("first", "second")]
+        await asyncio.sleep(0)
+        assert admission.queued == 2
+        admission.settle()
+        await asyncio.sleep(0.01)
+        assert admitted == ["first"]
+        admission.settle()
+        await asyncio.gather(*waiters)
+        return admitted
+
+    assert asyncio.run(run()) == ["first", "second"]
@@ -0,0 +1,76 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+import PYTHON_BACKEND_INTEGRATION as backend
+from fake_livekit_room import FakeCandidate, FakeRoom
+
+
+class BrokenRoom(FakeRoom):
+    """Room whose connection and disconnection both fail"""
+
+    async def connect(self, url, token, options=None):
+        raise ConnectionError("signalling unreachable")
+
+    async def disconnect(self):
+        raise ConnectionError("already gone")
+
+
+@pytest.fixture(autouse=True)
+def fake_rooms(monkeypatch):
+    monkeypatch.setattr(backend, "room_factory", FakeRoom)
+    monkeypatch.setattr(backend, "CANDIDATE_READY_TIMEOUT", 0.05)
+
+
+def make_agent(room):
+    agent = backend.AIInterviewAgent.create_shell()
+    agent.room = room
+    agent.assign("room-1", "token", "cand-1", "job-1", "ws://fake",
+                 {"questionsCount": 2, "interviewDuration": 5, "jobTitle": "Engineer"})
+    agent.attach_journal(None, "key-1")
+    # Audio of an earlier answer is still in the ring
+    agent.response_capture.audio.write(np.ones(16000, dtype=np.int16).tobytes(), 16000)
+    return agent
+
+
+def run(agent, budget=None):
+    async def _run():
+        supervisor = backend.AgentSupervisor()
+        released = []
+        supervisor.cleanup_hooks.append(lambda key, a, status: released.append(status))
+        status = await supervisor.start("key-1", agent)
+        return status, released
+
+    return asyncio.run(_run())
+
+
+def assert_released(agent):
+    assert agent.response_capture.audio.samples is None
+    assert agent.responses == []
+    assert agent.schedule is None
+    assert not agent.is_connected
+
+
+def test_completed_interview_releases_its_state():
+    agent = make_agent(FakeRoom(candidate=FakeCandidate(answer_delay=0.01)))
+    status, released = run(agent)
+    assert status == "completed" and released == ["completed"]
+    assert agent.score_stats.count == 2
+    assert_released(agent)
+
+
+def test_interview_over_budget_is_stopped_and_released(monkeypatch):
+    monkeypatch.setattr(backend, "agent_budget", lambda agent: 0.05)
+    # Nobody answers, so the interview would run for minutes
+    agent = make_agent(FakeRoom())
+    status, released = run(agent)
+    assert status == "timed_out" and released == ["timed_out"]
+    assert_released(agent)
+
+
+def test_failed_interview_is_released_even_when_cleanup_fails():
+    agent = make_agent(BrokenRoom())
+    status, released = run(agent)
+    assert status == "failed" and released == ["failed"]
+    assert_released(agent)
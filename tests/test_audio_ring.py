@@ -0,0 +1,66 @@
+import numpy as np
+
+import PYTHON_BACKEND_INTEGRATION as backend
+
+RATE = 16000
+
+
+def tone(seconds, amplitude=2000):
+    """Loud enough to count as speech"""
+    return np.full(int(seconds * RATE), amplitude, dtype=np.int16).tobytes()
+
+
+def silence(seconds):
+    return np.zeros(int(seconds * RATE), dtype=np.int16).tobytes()
+
+
+def write_frames(ring, pcm, frame_ms=20):
+    step = RATE * frame_ms // 1000 * 2
+    for offset in range(0, len(pcm), step):
+        ring.write(pcm[offset:offset + step], RATE)
+
+
+def test_ring_grows_to_keep_answers_longer_than_its_initial_size():
+    ring = backend.AudioRingBuffer(seconds=1)
+    ring.reset(max_seconds=10)
+    # Marker at the very start of the answer
+    write_frames(ring, tone(0.5, amplitude=3000) + tone(3.5))
+    ring.analyze()
+    pcm = np.frombuffer(ring.speech_pcm(), dtype=np.int16)
+    assert len(pcm) == 4 * RATE
+    assert pcm[0] == 3000 and pcm[-1] == 2000
+    assert ring.capacity == 4 * RATE
+
+
+def test_ring_never_grows_past_the_answer_limit():
+    ring = backend.AudioRingBuffer(seconds=1)
+    ring.reset(max_seconds=2)
+    write_frames(ring, tone(3))
+    ring.analyze()
+    assert ring.capacity == 2 * RATE
+    assert len(ring.speech_pcm()) == 2 * RATE * 2
+
+
+def test_growth_after_wrapping_keeps_the_most_recent_audio():
+    ring = backend.AudioRingBuffer(seconds=1)
+    ring.reset(max_seconds=1)
+    write_frames(ring, tone(0.5, amplitude=1000) + tone(1, amplitude=3000))
+    # A longer limit arrives mid-answer
+    ring.max_seconds = 4
+    write_frames(ring, tone(1))
+    pcm = np.frombuffer(ring._span(ring.written - 2 * RATE, ring.written), dtype=np.int16)
+    assert (pcm[:RATE] == 3000).all() and (pcm[RATE:] == 2000).all()
+
+
+def test_features_and_release():
+    ring = backend.AudioRingBuffer(seconds=1)
+    ring.reset(max_seconds=5)
+    write_frames(ring, tone(1) + silence(1))
+    features = ring.analyze()
+    assert features.speech_ms == 1000
+    assert features.trailing_silence_ms == 1000
+    ring.release()
+    assert ring.samples is None and ring.capacity == 0
+    # The next answer allocates again
+    write_frames(ring, tone(0.2))
+    assert ring.capacity == RATE
@@ -0,0 +1,54 @@
+import pytest
+
+import PYTHON_BACKEND_INTEGRATION as backend
+
+PROMPT_TEXT = {"technical_questions": ["Explain {jobTitle} trade-offs"]}
+
+
+def key(version="", digest="d0", job_id="job-1", name=""):
+    return backend.QuestionPlanCache.plan_key(job_id, name, version, digest, "en", "medium", 5)
+
+
+def plan(label):
+    return backend.QuestionPlan([label], [backend.QuestionMeta.of(label, 1)], 1)
+
+
+def test_profiles_carry_a_digest_of_their_prompt_text():
+    profile = backend.JobProfile("job-1", {"prompt_text": PROMPT_TEXT})
+    assert profile.prompt_digest == backend.JobProfile("job-1", {"prompt_text": dict(PROMPT_TEXT)}).prompt_digest
+    assert profile.prompt_digest != backend.JobProfile("job-1", {"prompt_text": {}}).prompt_digest
+    with pytest.raises(AttributeError):
+        profile.prompt_digest = "edited"
+
+
+def test_a_new_template_version_replaces_older_ones():
+    cache = backend.QuestionPlanCache()
+    cache.put(key("v1", name="backend"), plan("v1"))
+    cache.put(key("v1", name="frontend"), plan("other template"))
+    cache.put(key("v2", name="backend"), plan("v2"))
+    assert cache.get(key("v1", name="backend")) is None
+    assert cache.get(key("v2", name="backend")).questions == ("v2",)
+    assert cache.get(key("v1", name="frontend")) is not None
+
+
+def test_unversioned_plans_with_different_content_do_not_evict_each_other():
+    cache = backend.QuestionPlanCache()
+    # /start-interview without promptText and /agent/join with it, for one job
+    for _ in range(3):
+        cache.put(key(digest="defaults"), plan("defaults"))
+        cache.put(key(digest="template"), plan("template"))
+    assert cache.get(key(digest="defaults")).questions == ("defaults",)
+    assert cache.get(key(digest="template")).questions == ("template",)
+    # A versioned compile leaves content-keyed plans to the LRU
+    cache.put(key("v1"), plan("v1"))
+    assert len(cache) == 3
+
+
+def test_cache_is_bounded_and_invalidated_on_demand():
+    cache = backend.QuestionPlanCache(max_entries=2)
+    for job in ("a", "b", "c"):
+        cache.put(key(job_id=job), plan(job))
+    assert cache.get(key(job_id="a")) is None
+    assert cache.invalidate(job_id="b") == 1
+    assert cache.invalidate() == 1
+    assert len(cache) == 0
@@ -0,0 +1,102 @@
+import PYTHON_BACKEND_INTEGRATION as backend
+
+PROMPT_TEXT = {
+    "technical_questions": [
+        {"question": "Technical medium", "category": "technical", "expected_duration": 60},
+        {"question": "Technical medium 2", "category": "technical", "expected_duration": 60},
+        {"question": "Technical easy", "category": "technical", "expected_duration": 60, "difficulty": "easy"},
+        {"question": "Technical hard", "category": "technical", "expected_duration": 60, "difficulty": "hard"},
+    ],
+    "default_questions": [
+        {"question": "Goals", "category": "goals", "expected_duration": 45},
+    ],
+}
+
+
+def make_scheduler(count, budget, prompt_text=PROMPT_TEXT, difficulty="medium"):
+    plan = backend.compile_question_plan(prompt_text, count, difficulty)
+    return backend.QuestionScheduler(plan.render({}), plan.meta, plan.count, budget, difficulty)
+
+
+def run_interview(schedule, answer_seconds, score, overhead=5.0):
+    """Ask questions until the scheduler stops; returns the question texts in order"""
+    now = 0.0
+    asked = []
+    schedule.start(now)
+    while (index := schedule.next(now)) is not None:
+        timeout = schedule.begin(index, now)
+        asked.append(schedule.questions[index])
+        answered = min(answer_seconds, timeout)
+        schedule.record(index, answered, answered + overhead, score)
+        now += answered + overhead
+    return asked, now
+
+
+def test_template_metadata_is_compiled_into_the_plan():
+    plan = backend.compile_question_plan(PROMPT_TEXT, 3, "medium")
+    assert plan.count == 3
+    assert len(plan.questions) == 5
+    assert plan.meta[2].difficulty == backend.DIFFICULTY_LEVELS["easy"]
+    assert plan.meta[0].priority > plan.meta[4].priority
+    assert plan.meta[4].expected_seconds == 45
+
+
+def test_plan_fits_the_budget_in_template_order():
+    schedule = make_scheduler(3, budget=1800)
+    asked, _ = run_interview(schedule, answer_seconds=30, score=6.0)
+    assert asked == ["Technical medium", "Technical medium 2", "Technical easy"]
+    assert schedule.skipped == []
+
+
+def test_running_behind_keeps_high_priority_questions_and_skips_the_rest():
+    prompt_text = {"default_questions": [
+        {"question": "Goals", "category": "goals", "expected_duration": 60},
+        {"question": "Technical", "category": "technical", "expected_duration": 60},
+        {"question": "Experience", "category": "experience", "expected_duration": 60},
+    ]}
+    schedule = make_scheduler(3, budget=150, prompt_text=prompt_text)
+    asked, elapsed = run_interview(schedule, answer_seconds=60, score=6.0)
+    assert asked == ["Technical", "Experience"]
+    assert [schedule.questions[i] for i in schedule.skipped] == ["Goals"]
+    assert elapsed <= 150
+    assert schedule.progress() == 100.0
+
+
+def test_strong_answers_swap_in_a_harder_follow_up():
+    schedule = make_scheduler(3, budget=1800)
+    asked, _ = run_interview(schedule, answer_seconds=30, score=9.5)
+    assert asked[-1] == "Technical hard"
+    assert schedule.swapped == 1
+
+
+def test_weak_answers_swap_in_an_easier_follow_up():
+    prompt_text = {"technical_questions": [
+        {"question": "Medium 1", "category": "technical"},
+        {"question": "Medium 2", "category": "technical"},
+        {"question": "Medium 3", "category": "technical"},
+        {"question": "Easy", "category": "technical", "difficulty": "easy"},
+    ]}
+    schedule = make_scheduler(3, budget=1800, prompt_text=prompt_text)
+    asked, _ = run_interview(schedule, answer_seconds=30, score=2.0)
+    assert asked == ["Medium 1", "Medium 2", "Easy"]
+
+
+def test_answer_timeout_follows_candidate_pace_within_bounds():
+    schedule = make_scheduler(2, budget=1800)
+    schedule.start(0.0)
+    first = schedule.next(0.0)
+    assert schedule.begin(first, 0.0) == 60 * backend.QUESTION_TIMEOUT_SLACK
+    schedule.record(first, 6.0, 10.0)
+    second = schedule.next(10.0)
+    timeout = schedule.begin(second, 10.0)
+    assert backend.QUESTION_MIN_TIMEOUT <= timeout < 60 * backend.QUESTION_TIMEOUT_SLACK
+
+
+def test_start_skips_questions_done_before_a_restart():
+    schedule = make_scheduler(3, budget=1800)
+    # Question 1 was asked twice across earlier restarts
+    schedule.start(0.0, done=[1, 1, 0])
+    assert schedule.asked == [1, 0]
+    assert schedule.queue == [2]
+    assert schedule.deadline == 600.0
+    assert schedule.next(0.0) == 2
@@ -0,0 +1,118 @@
+import asyncio
+import json
+
+import PYTHON_BACKEND_INTEGRATION as backend
+
+
+def packet(message):
+    return json.dumps(message).encode()
+
+
+def make_pipeline(handled, max_queue=256):
+    async def record(message):
+        handled.append(message)
+
+    async def broken(message):
+        raise RuntimeError("handler bug")
+
+    return backend.ReceivePipeline({
+        "answer": record,
+        "typing": record,
+        "heartbeat": record,
+        "explode": broken
+    }, max_queue=max_queue)
+
+
+def test_messages_are_dispatched_by_type_in_order():
+    handled = []
+
+    async def run():
+        pipeline = make_pipeline(handled)
+        pipeline.start()
+        pipeline.submit(packet({"type": "answer", "text": "one"}))
+        pipeline.submit(packet({"type": "answer", "text": "two"}))
+        await asyncio.sleep(0.01)
+        await pipeline.stop()
+        return pipeline
+
+    pipeline = asyncio.run(run())
+    assert [m["text"] for m in handled] == ["one", "two"]
+    assert pipeline.counters["received"] == 2
+
+
+def test_bad_input_is_counted_and_dropped():
+    handled = []
+
+    async def run():
+        pipeline = make_pipeline(handled)
+        pipeline.start()
+        pipeline.submit(b"{not json")
+        pipeline.submit(packet(["no", "type"]))
+        pipeline.submit(packet({"type": "unknown"}))
+        pipeline.submit(b" " * (backend.RECEIVE_MAX_PACKET_BYTES + 1))
+        pipeline.submit(packet({"type": "explode"}))
+        # The consumer keeps going after a handler error
+        pipeline.submit(packet({"type": "answer", "text": "still here"}))
+        await asyncio.sleep(0.01)
+        await pipeline.stop()
+        return pipeline.counters
+
+    counters = asyncio.run(run())
+    assert counters["malformed"] == 2
+    assert counters["unhandled"] == 1
+    assert counters["oversized"] == 1
+    assert counters["handler_errors"] == 1
+    assert handled == [{"type": "answer", "text": "still here"}]
+
+
+def test_high_rate_types_keep_only_their_latest_message():
+    handled = []
+
+    async def run():
+        pipeline = make_pipeline(handled)
+        for n in range(50):
+            pipeline.submit(packet({"type": "typing", "n": n}))
+        pipeline.submit(packet({"type": "answer", "text": "done"}))
+        pipeline.start()
+        await asyncio.sleep(0.01)
+        await pipeline.stop()
+        return pipeline.counters
+
+    counters = asyncio.run(run())
+    assert handled == [{"type": "typing", "n": 49}, {"type": "answer", "text": "done"}]
+    assert counters["coalesced"] == 49
+
+
+def test_a_full_queue_drops_instead_of_blocking():
+    handled = []
+
+    async def run():
+        pipeline = make_pipeline(handled, max_queue=2)
+        for n in range(5):
+            pipeline.submit(packet({"type": "answer", "n": n}))
+        pipeline.start()
+        await asyncio.sleep(0.01)
+        await pipeline.stop()
+        return pipeline.counters
+
+    counters = asyncio.run(run())
+    assert [m["n"] for m in handled] == [0, 1]
+    assert counters["dropped"] == 3
+
+
+def test_binary_frames_are_unpacked_into_their_messages():
+    handled = []
+    frame = backend.encode_packets([
+        {"type": "answer", "text": "a", "timestamp": 1.0},
+        {"type": "answer", "text": "b", "timestamp": 1.5}
+    ])[0]
+
+    async def run():
+        pipeline = make_pipeline(handled)
+        pipeline.start()
+        pipeline.submit(frame)
+        await asyncio.sleep(0.01)
+        await pipeline.stop()
+
+    asyncio.run(run())
+    assert [m["text"] for m in handled] == ["a", "b"]
@@ -0,0 +1,67 @@
+import PYTHON_BACKEND_INTEGRATION as backend
+
+JOB = {
+    "jobTitle": "Backend Python Engineer",
+    "jobDepartment": "Platform",
+    "jobDescription": "Build Python services with FastAPI and PostgreSQL, design REST APIs, "
+                      "tune database queries and run deployments on Kubernetes.",
+    "promptText": {"technical_questions": [{"question": "How do you scale a FastAPI service?"}]},
+}
+QUESTION = "How would you design a REST API backed by PostgreSQL?"
+ON_TOPIC = ("I would build the REST API in Python with FastAPI, model the PostgreSQL schema first, "
+            "index the database queries the endpoints need and deploy the services on Kubernetes.")
+OFF_TOPIC = "My weekends are for hiking with friends, baking bread and watching old movies."
+
+
+def score(scorer, question, response, job=None, candidate=""):
+    context = {"job": job, "candidate": candidate}
+    return scorer.score_batch([backend.ScoringItem(question, response, context)])[0]
+
+
+def test_on_topic_answers_score_higher_and_report_job_keywords():
+    scorer = backend.RelevanceScorer()
+    job = backend.JobProfileRegistry().intern("job-1", JOB)
+    on_topic, off_topic = scorer.score_batch([
+        backend.ScoringItem(QUESTION, ON_TOPIC, {"job": job}),
+        backend.ScoringItem(QUESTION, OFF_TOPIC, {"job": job}),
+    ])
+    assert on_topic["score"] >= 7 and on_topic["sentiment"] == "positive"
+    assert off_topic["score"] < 4 and off_topic["sentiment"] == "negative"
+    assert off_topic["keywords"] == []
+    assert {"fastapi", "postgresql", "kubernetes"} <= set(on_topic["keywords"])
+    assert len(on_topic["keywords"]) <= 5
+    assert 0 <= off_topic["score"] < on_topic["score"] <= 10
+
+
+def test_batched_and_single_scores_agree():
+    scorer = backend.RelevanceScorer()
+    job = backend.JobProfileRegistry().intern("job-1", JOB)
+    batch = scorer.score_batch([backend.ScoringItem(QUESTION, text, {"job": job}) for text in (ON_TOPIC, OFF_TOPIC)])
+    assert batch == [score(scorer, QUESTION, text, job) for text in (ON_TOPIC, OFF_TOPIC)]
+
+
+def test_job_vectors_are_built_once_per_shared_profile():
+    scorer = backend.RelevanceScorer()
+    profiles = backend.JobProfileRegistry()
+    job = profiles.intern("job-1", JOB)
+    assert scorer.job_vectors(job) is scorer.job_vectors(profiles.intern("job-1", dict(JOB)))
+    assert len(scorer._jobs) == 1
+    del job
+    assert len(scorer._jobs) == 0
+
+
+def test_question_cache_is_bounded():
+    scorer = backend.RelevanceScorer(cache_size=2)
+    for n in range(3):
+        scorer.question_vector(f"Question number {n} about databases")
+    assert list(scorer._questions) == ["Question number 1 about databases", "Question number 2 about databases"]
+
+
+def test_signals_without_enough_text_are_left_out():
+    scorer = backend.RelevanceScorer()
+    # No job, a one-word question and no candidate profile: only completeness counts
+    short = score(scorer, "Why?", "Because")
+    assert short["score"] == round(10 * short["completeness"], 1)
+    assert short["keywords"] == []
+    full = score(scorer, "Why?", " ".join(f"word{n}" for n in range(backend.RELEVANCE_FULL_TERMS)))
+    assert full["score"] == 10.0
@@ -0,0 +1,118 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+import PYTHON_BACKEND_INTEGRATION as backend
+
+RATE = 16000
+
+
+class RecordingSTT(backend.SpeechToText):
+    def __init__(self):
+        self.calls = []
+
+    async def transcribe(self, pcm, sample_rate, num_channels=1):
+        self.calls.append(len(pcm) // 2 / sample_rate)
+        return "spoken answer"
+
+
+def push_pcm(capture, seconds, amplitude):
+    frame = np.full(RATE // 50, amplitude, dtype=np.int16).tobytes()
+    for _ in range(int(seconds * 50)):
+        capture.push_audio(frame, RATE)
+
+
+def test_final_text_ends_the_answer_with_earlier_partials():
+    async def run():
+        capture = backend.ResponseCapture()
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.01, capture.push_text, "I used", False)
+        loop.call_later(0.02, capture.push_text, "Postgres")
+        return await capture.capture(timeout=5)
+
+    assert asyncio.run(run()) == "I used Postgres"
+
+
+def test_speech_followed_by_silence_is_endpointed_and_transcribed():
+    stt = RecordingSTT()
+
+    async def run():
+        capture = backend.ResponseCapture(stt=stt)
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.01, push_pcm, capture, 1.0, 2000)
+        loop.call_later(0.02, push_pcm, capture, 1.0, 0)
+        answer = await capture.capture(timeout=5)
+        return answer, capture.last_features
+
+    answer, features = asyncio.run(run())
+    assert answer == "spoken answer"
+    assert features.speech_ms == 1000
+    # Only speech onwards is sent to STT
+    assert stt.calls == [2.0]
+
+
+def test_answers_given_while_the_question_is_read_are_kept():
+    async def run():
+        capture = backend.ResponseCapture()
+        capture.push_text("before the question")
+        capture.open(timeout=5)
+        # The question is still playing when the candidate answers
+        capture.push_text("an early answer")
+        await asyncio.sleep(0.01)
+        return await capture.capture(timeout=5)
+
+    assert asyncio.run(run()) == "an early answer"
+
+
+def test_speech_during_the_question_is_kept_past_the_answer_timeout():
+    stt = RecordingSTT()
+
+    async def run():
+        capture = backend.ResponseCapture(stt=stt, end_silence_ms=100)
+        capture.open(timeout=0.2)
+        # 0.3 s of speech arrives in real time while the question is read
+        for _ in range(15):
+            push_pcm(capture, 0.02, 2000)
+            await asyncio.sleep(0.02)
+        asyncio.get_running_loop().call_later(0.01, push_pcm, capture, 0.1, 0)
+        return await capture.capture(timeout=0.2)
+
+    assert asyncio.run(run()) == "spoken answer"
+    # Longer than the 0.2 s timeout, yet none of the speech was overwritten
+    assert stt.calls == [pytest.approx(0.4)]
+
+
+def test_no_answer_times_out():
+    async def run():
+        capture = backend.ResponseCapture()
+        answer = await capture.capture(timeout=0.02)
+        # The window is closed again afterwards
+        capture.push_text("too late")
+        return answer, capture.listening, len(capture._texts)
+
+    assert asyncio.run(run()) == (None, False, 0)
+
+
+def test_agent_keeps_answers_sent_before_the_question_finishes_playing(monkeypatch):
+    from fake_livekit_room import FakeCandidate, FakeRoom
+
+    async def slow_speech(self, question, audio=None):
+        await asyncio.sleep(0.05)
+
+    monkeypatch.setattr(backend, "room_factory", FakeRoom)
+    monkeypatch.setattr(backend, "CANDIDATE_READY_TIMEOUT", 0.05)
+    monkeypatch.setattr(backend.AIInterviewAgent, "speak_question", slow_speech)
+
+    async def run():
+        agent = backend.AIInterviewAgent.create_shell()
+        # Every answer arrives while its question is still being spoken
+        agent.room = FakeRoom(candidate=FakeCandidate(answer_delay=0.01))
+        agent.assign("room-1", "token", "cand-1", "job-1", "ws://fake", {"questionsCount": 2})
+        agent.attach_journal(None, "key-1")
+        # Without the early window each question would wait out its full timeout
+        await asyncio.wait_for(agent.start_interview(), 5)
+        return agent
+
+    agent = asyncio.run(run())
+    assert agent.score_stats.count == 2
@@ -0,0 +1,113 @@
+import asyncio
+
+import httpx
+
+import PYTHON_BACKEND_INTEGRATION as backend
+from fake_supabase import FakeSupabase
+
+
+def make_writer(supabase, **kwargs):
+    kwargs.setdefault("flush_interval", 60)
+    return backend.ResultWriter("http://supabase.test", "service-key",
+                                transport=httpx.ASGITransport(app=supabase), **kwargs)
+
+
+def response_row(session_key, index, score=5.0):
+    return {"session_key": session_key, "question_index": index, "score": score}
+
+
+def test_rows_with_the_same_key_are_written_once():
+    supabase = FakeSupabase()
+
+    async def run():
+        writer = make_writer(supabase)
+        writer.add("interview_responses", response_row("s1", 0, 4.0))
+        writer.add("interview_responses", response_row("s1", 0, 9.0))
+        writer.add("interview_responses", response_row("s1", 1))
+        await writer.close()
+        return writer
+
+    writer = asyncio.run(run())
+    assert writer.rows_written == 2
+    assert len(supabase.requests) == 1
+    assert supabase.requests[0]["query"]["on_conflict"] == "session_key,question_index"
+    scores = {row["question_index"]: row["score"] for row in supabase.rows("interview_responses")}
+    assert scores == {0: 9.0, 1: 5.0}
+
+
+def test_transient_failures_are_retried():
+    supabase = FakeSupabase(fail_next=1)
+
+    async def run():
+        writer = make_writer(supabase, max_retries=2)
+        writer.add("interview_results", {"session_key": "s1", "status": "completed"})
+        await writer.flush()
+        return writer
+
+    writer = asyncio.run(run())
+    assert len(supabase.requests) == 2
+    assert writer.rows_written == 1
+    assert writer.failed_batches == 0
+    assert supabase.rows("interview_results") == [{"session_key": "s1", "status": "completed"}]
+
+
+def test_failed_batches_stay_buffered_for_the_next_flush():
+    supabase = FakeSupabase(fail_next=100)
+
+    async def run():
+        writer = make_writer(supabase, max_retries=1)
+        for index in range(3):
+            writer.add("interview_responses", response_row("s1", index))
+        await writer.flush()
+        assert writer.failed_batches == 1
+        assert writer.buffered == 3
+        assert supabase.rows("interview_responses") == []
+
+        supabase.fail_next = 0
+        await writer.flush()
+        return writer
+
+    writer = asyncio.run(run())
+    assert writer.buffered == 0
+    assert writer.rows_written == 3
+    assert [row["question_index"] for row in supabase.rows("interview_responses")] == [0, 1, 2]
+
+
+def test_rejected_rows_are_dropped_without_retrying():
+    supabase = FakeSupabase(fail_next=1, fail_status=400)
+
+    async def run():
+        writer = make_writer(supabase, max_retries=3)
+        writer.add("interview_results", {"session_key": "s1"})
+        await writer.flush()
+        return writer
+
+    writer = asyncio.run(run())
+    assert len(supabase.requests) == 1
+    assert writer.rows_dropped == 1
+    assert writer.buffered == 0
+
+
+def test_buffer_drops_oldest_rows_past_max_buffer():
+    supabase = FakeSupabase()
+
+    async def run():
+        writer = make_writer(supabase, max_buffer=3)
+        for index in range(5):
+            writer.add("interview_responses", response_row("s1", index))
+        assert writer.buffered == 3
+        await writer.close()
+        return writer
+
+    writer = asyncio.run(run())
+    assert writer.rows_dropped == 2
+    assert [row["question_index"] for row in supabase.rows("interview_responses")] == [2, 3, 4]
+
+
+def test_unconfigured_writer_ignores_rows():
+    async def run():
+        writer = backend.ResultWriter("", "")
+        writer.add("interview_results", {"session_key": "s1"})
+        return writer
+
+    assert asyncio.run(run()).buffered == 0
@@ -0,0 +1,93 @@
+import asyncio
+
+import httpx
+import numpy as np
+import pytest
+
+import PYTHON_BACKEND_INTEGRATION as backend
+
+
+def session_stats(*scores):
+    stats = backend.RunningStats()
+    for score in scores:
+        stats.add(score)
+    return stats
+
+
+def test_running_stats_match_a_full_recompute():
+    scores = [7.5, 3.0, 9.1, 6.4, 5.0]
+    stats = session_stats(*scores).to_dict()
+    assert stats["count"] == 5
+    assert stats["mean"] == pytest.approx(np.mean(scores), abs=1e-4)
+    assert stats["variance"] == pytest.approx(np.var(scores), abs=1e-4)
+    assert (stats["min"], stats["max"]) == (3.0, 9.1)
+    assert backend.RunningStats().to_dict()["mean"] is None
+
+
+def test_sketch_percentiles_are_within_one_bin():
+    sketch = backend.ScoreSketch()
+    for score in np.linspace(0, 10, 101):
+        sketch.add(float(score))
+    assert sketch.quantile(0.5) == pytest.approx(5.0, abs=0.1)
+    assert sketch.quantile(0.9) == pytest.approx(9.0, abs=0.1)
+    assert backend.ScoreSketch().quantile(0.5) is None
+
+
+def test_ranking_moves_sessions_and_keeps_the_top_k():
+    job = backend.JobScores()
+    for key, score in (("a", 5.0), ("b", 8.0), ("c", 6.0)):
+        job.rank(key, score, {"sessionKey": key}, limit=2)
+    assert [e["sessionKey"] for e in job.leaderboard(10)] == ["b", "c"]
+    # "a" improves past "c"; the ranking never holds more than the limit
+    job.rank("a", 7.0, {"sessionKey": "a"}, limit=2)
+    assert [(e["rank"], e["sessionKey"]) for e in job.leaderboard(10)] == [(1, "b"), (2, "a")]
+    # Ties keep the earlier session ahead
+    job.rank("d", 8.0, {"sessionKey": "d"}, limit=2)
+    assert [e["sessionKey"] for e in job.leaderboard(10)] == ["b", "d"]
+
+
+def test_aggregator_folds_answers_and_completions_per_job():
+    aggregator = backend.ScoreAggregator()
+    first = session_stats(8.0)
+    aggregator.record_answer("job-1", "s1", "c1", "Ada", 8.0, first)
+    second = session_stats(4.0, 6.0)
+    aggregator.record_answer("job-1", "s2", "c2", "Grace", 6.0, second)
+    aggregator.record_complete("job-1", "s2", "c2", "Grace", second)
+    # Interviews with no answers are not ranked
+    aggregator.record_complete("job-1", "s3", "c3", "Linus", backend.RunningStats())
+
+    board = aggregator.leaderboard("job-1")
+    assert [(e["candidateName"], e["score"], e["completed"]) for e in board] == [("Ada", 8.0, False), ("Grace", 5.0, True)]
+    stats = aggregator.job_stats("job-1")
+    assert stats["answers"]["count"] == 2
+    assert stats["interviews"]["count"] == 1
+    assert aggregator.leaderboard("other") == [] and aggregator.job_stats("other") is None
+
+
+def test_worker_aggregators_forward_events_instead_of_applying_them():
+    events = []
+    aggregator = backend.ScoreAggregator()
+    aggregator.forward = events.append
+    aggregator.record_answer("job-1", "s1", "c1", "Ada", 8.0, session_stats(8.0))
+    assert aggregator.jobs == {}
+
+    api_side = backend.ScoreAggregator()
+    for event in events:
+        api_side.apply(event)
+    assert api_side.leaderboard("job-1")[0]["sessionKey"] == "s1"
+
+
+def test_leaderboard_endpoint(monkeypatch):
+    aggregator = backend.ScoreAggregator()
+    aggregator.record_answer("job-1", "s1", "c1", "Ada", 8.0, session_stats(8.0))
+    monkeypatch.setattr(backend, "score_aggregator", aggregator)
+
+    async def run():
+        transport = httpx.ASGITransport(app=backend.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return (await client.get("/jobs/job-1/leaderboard", params={"limit": 1000})).json()
+
+    body = asyncio.run(run())
+    assert body["jobId"] == "job-1"
+    assert [e["candidateId"] for e in body["candidates"]] == ["c1"]
+    assert body["stats"]["answers"]["mean"] == 8.0
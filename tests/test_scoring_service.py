@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+import PYTHON_BACKEND_INTEGRATION as backend
+
+
+def echo_scorer(batches):
+    def score(items):
+        batches.append([item.response for item in items])
+        return [{"score": float(len(item.response))} for item in items]
+    return score
+
+
+def test_concurrent_answers_are_scored_in_one_batch():
+    batches = []
+
+    async def run():
+        service = backend.ScoringService(echo_scorer(batches), max_batch=32, max_delay=0.01)
+        return await asyncio.gather(*(service.score("Q", "a" * n) for n in range(1, 4)))
+
+    results = asyncio.run(run())
+    assert [r["score"] for r in results] == [1.0, 2.0, 3.0]
+    assert batches == [["a", "aa", "aaa"]]
+
+
+def test_full_batches_are_scored_without_waiting_for_the_delay():
+    batches = []
+
+    async def run():
+        service = backend.ScoringService(echo_scorer(batches), max_batch=2, max_delay=60, offload=False)
+        return await asyncio.wait_for(asyncio.gather(service.score("Q", "a"), service.score("Q", "b")), 1)
+
+    asyncio.run(run())
+    assert batches == [["a", "b"]]
+
+
+def test_scorer_errors_reach_every_caller():
+    def broken(items):
+        raise RuntimeError("model unavailable")
+
+    async def run():
+        service = backend.ScoringService(broken, max_delay=0.001)
+        return await asyncio.gather(service.score("Q", "a"), service.score("Q", "b"), return_exceptions=True)
+
+    assert [str(e) for e in asyncio.run(run())] == ["model unavailable"] * 2
+
+
+def test_short_result_lists_fail_every_caller_instead_of_hanging():
+    async def run():
+        service = backend.ScoringService(lambda items: [{"score": 5.0}], max_delay=0.001)
+        return await asyncio.wait_for(
+            asyncio.gather(service.score("Q", "a"), service.score("Q", "b"), return_exceptions=True), 1)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, ValueError) for result in results)
+    with pytest.raises(ValueError, match="1 results for 2 items"):
+        raise results[0]
@@ -0,0 +1,81 @@
+import asyncio
+
+import httpx
+import pytest
+
+import PYTHON_BACKEND_INTEGRATION as backend
+
+
+@pytest.fixture
+def launches(monkeypatch):
+    """Registers sessions without running agents; records each launch's room"""
+    launched = []
+
+    def launch_agent(agent_kwargs, candidate_id, room_name, session_id=None, job_id="", restore_state=None):
+        launched.append(room_name)
+        return backend.active_interviews.register(None, candidate_id, room_name, session_id, job_id)
+
+    monkeypatch.setattr(backend, "launch_agent", launch_agent)
+    monkeypatch.setattr(backend, "active_interviews", backend.SessionRegistry())
+    monkeypatch.setattr(backend, "session_creations", backend.SingleFlight())
+    monkeypatch.setattr(backend, "admission", backend.AdmissionController(max_live=1, rate=0, queue_timeout=5))
+    return launched
+
+
+def client():
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=backend.app), base_url="http://test")
+
+
+def join(http, room, candidate):
+    return http.post("/agent/join", json={"roomName": room, "candidateId": candidate, "jobId": "job-1"})
+
+
+def test_concurrent_duplicates_share_one_agent_and_one_slot(launches):
+    async def run():
+        async with client() as http:
+            return await asyncio.gather(*(join(http, "room-1", f"cand-{n}") for n in range(5)))
+
+    bodies = [response.json() for response in asyncio.run(run())]
+    assert launches == ["room-1"]
+    assert {body["sessionKey"] for body in bodies} == {"session_room-1"}
+    # Duplicates report the session that won, not their own candidate
+    assert {body["candidateId"] for body in bodies} == {"cand-0"}
+    assert {body["agentStatus"] for body in bodies} == {"connecting"}
+    assert backend.active_interviews.active_count == 1
+    assert backend.admission._reserved == 0
+
+
+def test_duplicates_queued_at_the_cap_wait_as_one_request(launches):
+    async def run():
+        async with client() as http:
+            await join(http, "room-1", "cand-1")
+            waiting = [asyncio.ensure_future(join(http, "room-2", "cand-2")) for _ in range(3)]
+            await asyncio.sleep(0.05)
+            queued = backend.admission.queued
+            # The first interview ends and frees its slot
+            backend.active_interviews.remove("session_room-1")
+            backend.admission.wake()
+            return queued, await asyncio.gather(*waiting)
+
+    queued, responses = asyncio.run(run())
+    assert queued == 1
+    assert launches == ["room-1", "room-2"]
+    assert [response.json()["sessionKey"] for response in responses] == ["session_room-2"] * 3
+    assert len(backend.session_creations) == 0
+
+
+def test_completed_rooms_are_reused_and_failed_ones_relaunched(launches):
+    async def run():
+        async with client() as http:
+            start = {"roomName": "room-1", "candidateId": "cand-1", "jobId": "job-1"}
+            await http.post("/start-interview", json=start)
+            backend.active_interviews.mark_finished("session_room-1", "completed")
+            completed = (await http.post("/start-interview", json=start)).json()
+            backend.active_interviews.get("session_room-1").status = "failed"
+            relaunched = (await http.post("/start-interview", json=start)).json()
+            return completed, relaunched
+
+    completed, relaunched = asyncio.run(run())
+    assert completed["agentStatus"] == "completed"
+    assert relaunched["agentStatus"] == "connecting"
+    assert launches == ["room-1", "room-1"]
@@ -0,0 +1,99 @@
+import os
+
+import PYTHON_BACKEND_INTEGRATION as backend
+from fake_livekit_room import FakeRoom
+
+
+def start_event(key, agent_token="lk-token"):
+    agent_kwargs = {"room_name": f"room-{key}", "agent_token": agent_token, "interview_duration": 30}
+    return backend.journal_start_event(key, agent_kwargs, f"cand-{key}", f"room-{key}", None, "job-1")
+
+
+def response_event(key, index, score=6.0):
+    return {"event": "response", "key": key, "index": index,
+            "record": {"question_index": index, "analysis": {"score": score}}}
+
+
+def test_recovered_state_matches_the_journaled_events(tmp_path):
+    journal = backend.SessionJournal(str(tmp_path))
+    journal.open()
+    journal.record(start_event("a"))
+    journal.record({"event": "question", "key": "a", "index": 0})
+    journal.record(response_event("a", 0))
+    journal.record({"event": "question", "key": "a", "index": 1})
+    journal.record(start_event("b"))
+    journal.record({"event": "finished", "key": "b"})
+    journal.close()
+
+    live = backend.SessionJournal(str(tmp_path)).open()
+    assert list(live) == ["a"]
+    state = live["a"]
+    assert state["asked"] == [0, 1]
+    assert state["in_flight"] == 1
+    assert [r["question_index"] for r in state["responses"]] == [0]
+    # Credentials are never written to disk
+    assert state["agent_kwargs"]["agent_token"] == ""
+    assert state["agent_kwargs"]["room_name"] == "room-a"
+
+
+def test_torn_tail_is_ignored_on_reopen(tmp_path):
+    journal = backend.SessionJournal(str(tmp_path))
+    journal.open()
+    journal.record(start_event("a"))
+    journal.record({"event": "question", "key": "a", "index": 0})
+    journal.close()
+    # A crash mid-write leaves a partial record behind
+    torn = backend.SessionJournal._frame(response_event("a", 0))
+    with open(journal.log_path, "ab") as f:
+        f.write(torn[:len(torn) - 5])
+
+    recovered = backend.SessionJournal(str(tmp_path))
+    live = recovered.open()
+    assert live["a"]["responses"] == []
+    assert live["a"]["in_flight"] == 0
+
+    # The reopened journal keeps appending after the intact records
+    recovered.record(response_event("a", 0))
+    recovered.close()
+    live = backend.SessionJournal(str(tmp_path)).open()
+    assert len(live["a"]["responses"]) == 1
+    assert live["a"]["in_flight"] is None
+
+
+def test_snapshot_and_tail_are_replayed_together(tmp_path):
+    journal = backend.SessionJournal(str(tmp_path), compact_every=3)
+    journal.open()
+    journal.record(start_event("a"))
+    journal.record({"event": "question", "key": "a", "index": 0})
+    journal.record(response_event("a", 0))
+    # Compacted: everything so far is in the snapshot and the log is empty
+    assert os.path.getsize(journal.log_path) == 0
+    journal.record({"event": "question", "key": "a", "index": 1})
+    journal.record(start_event("b"))
+    journal.close()
+
+    live = backend.SessionJournal(str(tmp_path), compact_every=3).open()
+    assert sorted(live) == ["a", "b"]
+    assert live["a"]["asked"] == [0, 1]
+    assert live["a"]["in_flight"] == 1
+    assert len(live["a"]["responses"]) == 1
+
+
+def test_resume_asks_the_in_flight_question_again(tmp_path, monkeypatch):
+    monkeypatch.setattr(backend, "room_factory", FakeRoom)
+    journal = backend.SessionJournal(str(tmp_path))
+    journal.open()
+    journal.record(start_event("a"))
+    # The scheduler reordered the plan: 2 and 1 were answered, 0 was in flight
+    for index in (2, 1, 0):
+        journal.record({"event": "question", "key": "a", "index": index})
+        if index != 0:
+            journal.record(response_event("a", index))
+    journal.close()
+
+    state = backend.SessionJournal(str(tmp_path)).open()["a"]
+    agent = backend.AIInterviewAgent.create_shell()
+    agent.attach_journal(None, "a", state)
+    assert agent.resume_done == [2, 1]
+    assert agent.resumed
+    assert len(agent.responses) == 2
@@ -0,0 +1,83 @@
+import time
+
+import PYTHON_BACKEND_INTEGRATION as backend
+
+
+class StubAgent:
+    def status_snapshot(self):
+        return {"agentConnected": False, "currentQuestion": "Last question", "interviewProgress": 80}
+
+
+def register(registry, n, job_id="job-1", agent=None):
+    return registry.register(agent, f"cand-{n}", f"room-{n}", f"sess-{n}", job_id)
+
+
+def test_lookup_by_any_identifier():
+    registry = backend.SessionRegistry()
+    entry = register(registry, 1)
+    assert registry.lookup("cand-1") is entry
+    assert registry.lookup("sess-1") is entry
+    assert registry.lookup("room-1") is entry
+    assert registry.by_job("job-1") == [entry]
+    assert registry.lookup("missing") is None
+
+
+def test_replacing_a_session_keeps_indexes_consistent():
+    registry = backend.SessionRegistry()
+    register(registry, 1)
+    # Same session key, new candidate
+    replacement = registry.register(None, "cand-2", "room-1", "sess-1", "job-1")
+    assert len(registry) == 1
+    assert registry.active_count == 1
+    assert registry.lookup("cand-1") is None
+    assert registry.lookup("cand-2") is replacement
+
+
+def test_finished_sessions_expire_after_their_ttl():
+    registry = backend.SessionRegistry(finished_ttl=60)
+    register(registry, 1)
+    register(registry, 2)
+    registry.mark_finished("sess-1")
+    assert registry.active_count == 1 and registry.finished_count == 1
+
+    registry.get("sess-1").last_access = time.monotonic() - 61
+    assert registry.evict_expired() == 1
+    assert registry.lookup("cand-1") is None
+    assert registry.by_job("job-1") == [registry.get("sess-2")]
+    # Live sessions are never evicted, however old
+    registry.get("sess-2").last_access = time.monotonic() - 1000
+    assert registry.evict_expired() == 0
+
+
+def test_least_recently_used_finished_sessions_go_first():
+    registry = backend.SessionRegistry(max_finished=2)
+    for n in range(3):
+        register(registry, n)
+        registry.mark_finished(f"sess-{n}")
+    # Over the cap: the oldest finished session went
+    assert registry.lookup("sess-0") is None
+    # A lookup refreshes sess-1, so sess-2 is evicted next
+    registry.lookup("cand-1")
+    register(registry, 3)
+    registry.mark_finished("sess-3")
+    assert registry.lookup("sess-1") is not None
+    assert registry.lookup("sess-2") is None
+    assert registry.finished_count == 2
+
+
+def test_finished_sessions_keep_a_snapshot_instead_of_the_agent():
+    registry = backend.SessionRegistry()
+    entry = register(registry, 1, agent=StubAgent())
+    registry.mark_finished("sess-1", "completed")
+    assert entry.agent is None
+    assert entry.status == "completed"
+    assert entry.snapshot["currentQuestion"] == "Last question"
+    assert backend.local_snapshot(entry) == StubAgent().status_snapshot()
+
+    # Worker-hosted sessions report their final snapshot with the exit
+    remote = register(registry, 2)
+    remote.worker_id = 0
+    assert backend.on_worker(remote)
+    registry.mark_finished("sess-2", "failed", {"agentConnected": False})
+    assert not backend.on_worker(remote)
+    assert backend.local_snapshot(remote) == {"agentConnected": False}
@@ -0,0 +1,103 @@
+import asyncio
+import json
+
+import httpx
+
+import PYTHON_BACKEND_INTEGRATION as backend
+
+
+class StubAgent:
+    def status_snapshot(self):
+        return {"agentConnected": True, "currentQuestion": "Q1", "interviewProgress": 20}
+
+
+def make_registry(monkeypatch):
+    registry = backend.SessionRegistry()
+    registry.register(StubAgent(), "cand-1", "room-1", "sess-1", "job-1")
+    registry.register(StubAgent(), "cand-2", "room-2", "sess-2", "job-1")
+    registry.register(StubAgent(), "cand-3", "room-3", "sess-3", "job-2")
+    monkeypatch.setattr(backend, "active_interviews", registry)
+    return registry
+
+
+def test_subscribers_filter_by_any_identifier_or_job():
+    entry = backend.SessionEntry("sess-1", None, "cand-1", "sess-1", "room-1", "job-1")
+    assert backend.StatusSubscriber().wants(entry, entry.key)
+    assert backend.StatusSubscriber({"room-1"}).wants(entry, entry.key)
+    assert backend.StatusSubscriber(job_id="job-1").wants(entry, entry.key)
+    assert not backend.StatusSubscriber({"cand-9"}, "job-2").wants(entry, entry.key)
+    # A removed session is matched on the ids its last change carries
+    final = {"status": "ended", "jobId": "job-1", "candidateId": "cand-1"}
+    assert backend.StatusSubscriber({"cand-1"}).wants(None, "sess-1", final)
+    assert backend.StatusSubscriber(job_id="job-1").wants(None, "sess-1", final)
+    assert not backend.StatusSubscriber({"cand-2"}).wants(None, "sess-1", final)
+
+
+def test_feed_coalesces_changes_into_one_delivery_per_tick(monkeypatch):
+    make_registry(monkeypatch)
+
+    async def run():
+        feed = backend.StatusFeed(interval=0.01)
+        everyone, job_two = backend.StatusSubscriber(), backend.StatusSubscriber(job_id="job-2")
+        feed.subscribe(everyone)
+        feed.subscribe(job_two)
+        feed.publish("sess-1", {"currentQuestion": "Q2"})
+        feed.publish("sess-1", {"currentQuestion": "Q3", "interviewProgress": 60})
+        feed.publish("sess-3", {"status": "completed"})
+        assert not everyone.ready.is_set()
+        await asyncio.wait_for(everyone.ready.wait(), 1)
+        return everyone.take(), job_two.take()
+
+    everyone, job_two = asyncio.run(run())
+    assert everyone == {"sess-1": {"currentQuestion": "Q3", "interviewProgress": 60},
+                        "sess-3": {"status": "completed"}}
+    assert job_two == {"sess-3": {"status": "completed"}}
+
+
+def test_feed_without_subscribers_buffers_nothing():
+    feed = backend.StatusFeed()
+    feed.publish("sess-1", {"status": "active"})
+    assert feed._pending == {} and feed._timer is None
+
+
+def test_batch_status_by_ids_and_job(monkeypatch):
+    make_registry(monkeypatch)
+
+    async def post(payload):
+        transport = httpx.ASGITransport(app=backend.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post("/interview-status/batch", json=payload)
+
+    body = asyncio.run(post({"ids": ["room-3", "cand-1", "missing"], "jobId": "job-1"})).json()
+    assert sorted(s["candidateId"] for s in body["sessions"]) == ["cand-1", "cand-2", "cand-3"]
+    assert body["notFound"] == ["missing"]
+    assert body["sessions"][0]["currentQuestion"] == "Q1"
+
+    too_many = asyncio.run(post({"ids": ["x"] * (backend.MAX_STATUS_BATCH + 1)}))
+    assert too_many.status_code == 400
+
+
+def test_event_stream_sends_a_snapshot_then_matching_changes(monkeypatch):
+    make_registry(monkeypatch)
+    monkeypatch.setattr(backend, "status_feed", backend.StatusFeed(interval=0.01))
+
+    def parse(message):
+        event, data = message.strip().split("\n")
+        return event.removeprefix("event: "), json.loads(data.removeprefix("data: "))
+
+    async def run():
+        response = await backend.stream_interview_events(ids="cand-1", jobId="job-2")
+        events = response.body_iterator
+        snapshot = parse(await anext(events))
+        backend.status_feed.publish("sess-2", {"interviewProgress": 40})
+        backend.status_feed.publish("sess-1", {"interviewProgress": 40})
+        backend.status_feed.publish("sess-3", {"status": "completed"})
+        change = parse(await asyncio.wait_for(anext(events), 1))
+        await events.aclose()
+        return snapshot, change
+
+    snapshot, change = asyncio.run(run())
+    assert snapshot[0] == "snapshot"
+    assert sorted(snapshot[1]) == ["sess-1", "sess-3"]
+    assert change == ("status", {"sess-1": {"interviewProgress": 40}, "sess-3": {"status": "completed"}})
+    assert backend.status_feed.subscribers == []
@@ -0,0 +1,82 @@
+import asyncio
+import json
+
+import PYTHON_BACKEND_INTEGRATION as backend
+
+QUESTION = {"type": "question", "question": "Tell me about caching", "agent": "ai-interviewer", "timestamp": 1700000000.0}
+FEEDBACK = {"type": "feedback", "message": "Good answer", "score": 7.5, "timestamp": 1700000000.25}
+COMPLETE = {"type": "interview_complete", "final_score": 6.25, "total_questions": 5, "timestamp": 1700000001.0}
+
+
+def decode_all(packets):
+    return [message for packet in packets for message in backend.decode_frame(packet)]
+
+
+def test_schema_messages_round_trip_in_one_frame():
+    packets = backend.encode_packets([FEEDBACK, QUESTION, COMPLETE])
+    assert len(packets) == 1
+    assert packets[0][0] == backend.WIRE_MAGIC
+    assert decode_all(packets) == [FEEDBACK, QUESTION, COMPLETE]
+
+
+def test_other_messages_round_trip_as_json_records():
+    custom = {"type": "question", "question": "Q", "agent": "someone-else", "timestamp": 1700000000.0}
+    extra = {"type": "hint", "text": "Take your time", "level": 2, "timestamp": 1700000000.5}
+    packets = backend.encode_packets([custom, extra])
+    assert len(packets) == 1
+    assert decode_all(packets) == [custom, extra]
+
+
+def test_text_too_long_for_a_record_goes_as_json_in_order():
+    long_question = dict(QUESTION, question="x" * (backend.WIRE_MAX_STR_BYTES + 1))
+    packets = backend.encode_packets([FEEDBACK, long_question, COMPLETE])
+    assert len(packets) == 3
+    assert json.loads(packets[1]) == long_question
+    assert decode_all(packets) == [FEEDBACK, long_question, COMPLETE]
+
+
+def test_plain_json_packets_still_decode():
+    assert backend.decode_frame(json.dumps({"type": "ping"}).encode()) == [{"type": "ping"}]
+
+
+def collect_sender(wire_format):
+    sent = []
+
+    async def publish(payload):
+        sent.append(payload)
+
+    return backend.DataSender(publish, wire_format, window=0.01), sent
+
+
+def test_binary_sender_coalesces_feedback_with_the_next_question():
+    async def run():
+        sender, sent = collect_sender("binary")
+        await sender.send(FEEDBACK, wait=False)
+        await sender.send(QUESTION)
+        return sender, sent
+
+    sender, sent = asyncio.run(run())
+    assert sender.packets == 1
+    assert decode_all(sent) == [FEEDBACK, QUESTION]
+
+
+def test_binary_sender_survives_oversized_feedback():
+    huge = dict(FEEDBACK, message="y" * 70000)
+
+    async def run():
+        sender, sent = collect_sender("binary")
+        await sender.send(huge, wait=False)
+        await sender.send(QUESTION)
+        return sent
+
+    assert decode_all(asyncio.run(run())) == [huge, QUESTION]
+
+
+def test_json_sender_sends_one_packet_per_message():
+    async def run():
+        sender, sent = collect_sender("json")
+        await sender.send(FEEDBACK)
+        await sender.send(QUESTION)
+        return sent
+
+    assert [json.loads(packet) for packet in asyncio.run(run())] == [FEEDBACK, QUESTION]